@@ -15,12 +15,15 @@ import {
   ReferenceLine 
 } from 'recharts';
 
+// `?servidor=ws://127.0.0.1:8765` renders the Python simulation (core/servidor.py)
+const STREAM_URL = new URLSearchParams(window.location.search).get('servidor') ?? undefined;
+
 function App() {
   const [config, setConfig] = useState<SimulationConfig>(DEFAULT_CONFIG);
   const [isRunning, setIsRunning] = useState(true);
   const [jamSignal, setJamSignal] = useState(0);
   const [jamActive, setJamActive] = useState(false);
-  const [stats, setStats] = useState({ avgSpeed: 0, brakingCount: 0 });
+  const [stats, setStats] = useState<{ avgSpeed: number; brakingCount: number; efficiency?: number }>({ avgSpeed: 0, brakingCount: 0 });
   const [speedHistory, setSpeedHistory] = useState<{time: number, value: number}[]>([]);
   const [resetKey, setResetKey] = useState(0); // Key to force re-mount of simulation
 
@@ -30,7 +33,8 @@ function App() {
     
     setSpeedHistory(prev => {
         // Normalize speed to percentage (0-100 based on maxSpeed)
-        const percentage = Math.min(100, (stats.avgSpeed / (config.maxSpeed * 100)) * 100);
+        // (the server reports it directly, relative to the model's normal speed)
+        const percentage = Math.min(100, stats.efficiency ?? (stats.avgSpeed / (config.maxSpeed * 100)) * 100);
         
         const newHistory = [...prev, { time: Date.now(), value: percentage }];
         if(newHistory.length > 60) newHistory.shift();
@@ -84,6 +88,8 @@ function App() {
             triggerJamSignal={jamSignal}
             onJamComplete={() => setJamActive(false)}
             setStats={setStats}
+            streamUrl={STREAM_URL}
+            restartOnConnect={resetKey > 0}
           />
           
           {/* Overlay Stats */}
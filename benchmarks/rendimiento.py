@@ -0,0 +1,295 @@
+"""
+Suite de rendimiento del núcleo de la simulación y del Monte Carlo.
+
+Uso (desde la raíz del proyecto):
+
+    python -m benchmarks.rendimiento run --salida linea_base.json
+    python -m benchmarks.rendimiento run --salida nuevo.json
+    python -m benchmarks.rendimiento compare linea_base.json nuevo.json --umbral 0.10
+
+`run` mide todos los escenarios y guarda un JSON; `compare` contrasta dos
+JSON y termina con código 1 si algún escenario empeoró más que `--umbral`
+(fracción relativa). Los valores dependen de la máquina, así que la línea
+base se mide en el mismo equipo (no hay una versionada). `compare` se niega
+a contrastar una corrida `--rapido` con una completa e informa los
+escenarios de la base que faltan en la nueva.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from core.simulacion import Simulacion
+from core.montecarlo import MonteCarlo
+from core.simetria import SIMETRIA_NINGUNA
+from core.exportacion import importar_opcional
+from models.redondel import Redondel
+from models.redondel_vectorizado import RedondelVectorizado
+from utils.constantes import (
+    DT, DISTANCIA_SEGURIDAD, NUMERO_VEHICULOS, RADIO_REDONDEL,
+    MOTOR_OBJETOS, MOTOR_VECTORIZADO, REGISTRO_COMPLETO, REGISTRO_NINGUNO,
+    INTEGRADOR_ADAPTATIVO
+)
+
+VEHICULOS = (10, 100, 1000, 10000, 100000)
+VEHICULOS_RAPIDO = (10, 100, 1000)
+
+# Tiempo mínimo de medición por escenario (segundos)
+TIEMPO_MINIMO = 0.5
+TIEMPO_MINIMO_RAPIDO = 0.1
+
+
+def _medir(funcion, tiempo_minimo, repeticiones=3):
+    """
+    Ejecuta `funcion` repetidamente durante al menos `tiempo_minimo` y
+    devuelve el mejor tiempo por llamada de `repeticiones` mediciones
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        llamadas = 0
+        inicio = time.perf_counter()
+        while True:
+            funcion()
+            llamadas += 1
+            transcurrido = time.perf_counter() - inicio
+            if transcurrido >= tiempo_minimo:
+                break
+        mejor = min(mejor, transcurrido / llamadas)
+    return mejor
+
+
+def _resultado(valor, unidad, mayor_es_mejor=True):
+    return {'valor': valor, 'unidad': unidad, 'mayor_es_mejor': mayor_es_mejor}
+
+
+def medir_pasos(vehiculos, tiempo_minimo):
+    """Pasos/s de `actualizar` para cada motor y número de vehículos"""
+    resultados = {}
+    for motor, clase in ((MOTOR_OBJETOS, Redondel), (MOTOR_VECTORIZADO, RedondelVectorizado)):
+        for n in vehiculos:
+            # Mantener la separación entre vehículos del escenario por defecto
+            radio = RADIO_REDONDEL * n / NUMERO_VEHICULOS
+            redondel = clase(radio, n)
+            redondel.obtener_vehiculo_por_id(0).marcar_como_problema()
+            redondel.obtener_vehiculo_por_id(0).iniciar_frenado()
+            segundos = _medir(lambda: redondel.actualizar(DT, DISTANCIA_SEGURIDAD),
+                              tiempo_minimo, repeticiones=1 if n >= 10000 else 3)
+            resultados[f'pasos/{motor}/{n}'] = _resultado(1 / segundos, 'pasos/s')
+    return resultados
+
+
+def medir_estados(vehiculos, tiempo_minimo):
+    """Llamadas/s a `obtener_estados` y a `instantanea` por motor y número de vehículos"""
+    resultados = {}
+    for motor, clase in ((MOTOR_OBJETOS, Redondel), (MOTOR_VECTORIZADO, RedondelVectorizado)):
+        for n in vehiculos:
+            radio = RADIO_REDONDEL * n / NUMERO_VEHICULOS
+            redondel = clase(radio, n)
+            repeticiones = 1 if n >= 10000 else 3
+            segundos = _medir(redondel.obtener_estados, tiempo_minimo, repeticiones)
+            resultados[f'estados/{motor}/{n}'] = _resultado(1 / segundos, 'llamadas/s')
+            # Lo que pide un consumidor típico: velocidades y posiciones
+            segundos = _medir(lambda: redondel.instantanea().x, tiempo_minimo, repeticiones)
+            resultados[f'instantanea/{motor}/{n}'] = _resultado(1 / segundos, 'llamadas/s')
+    return resultados
+
+
+def medir_corridas(num_runs, tiempo_minimo):
+    """Corridas/s de `MonteCarlo` por motor y de `run_batched`"""
+    resultados = {}
+    for motor in (MOTOR_OBJETOS, MOTOR_VECTORIZADO):
+        # Sin deduplicación: se mide el costo de simular cada corrida
+        mc = MonteCarlo(num_runs=num_runs, motor=motor, simetria=SIMETRIA_NINGUNA)
+        segundos = _medir(mc.run, tiempo_minimo)
+        resultados[f'montecarlo/{motor}'] = _resultado(num_runs / segundos, 'corridas/s')
+    mc = MonteCarlo(num_runs=num_runs, simetria=SIMETRIA_NINGUNA, integrador=INTEGRADOR_ADAPTATIVO)
+    segundos = _medir(mc.run, tiempo_minimo)
+    resultados['montecarlo/adaptativo'] = _resultado(num_runs / segundos, 'corridas/s')
+    # Una instancia nueva por repetición: los representantes no se reutilizan
+    segundos = _medir(lambda: MonteCarlo(num_runs=num_runs).run(), tiempo_minimo)
+    resultados['montecarlo/simetria'] = _resultado(num_runs / segundos, 'corridas/s')
+    mc = MonteCarlo(num_runs=num_runs * 10)
+    segundos = _medir(mc.run_batched, tiempo_minimo)
+    resultados['montecarlo/lotes'] = _resultado(num_runs * 10 / segundos, 'corridas/s')
+    return resultados
+
+
+def medir_memoria(vehiculos):
+    """Memoria pico (bytes) de una corrida con y sin historial"""
+    resultados = {}
+    for n in vehiculos:
+        radio = RADIO_REDONDEL * n / NUMERO_VEHICULOS
+        for registro in (REGISTRO_COMPLETO, REGISTRO_NINGUNO):
+            sim = Simulacion(num_vehiculos=n, radio=radio, registro=registro)
+            tracemalloc.start()
+            sim.ejecutar_completa(duracion=10.0, tiempo_inicio_frenado=5.0, seed=42)
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            resultados[f'memoria/{registro}/{n}'] = _resultado(pico, 'bytes', mayor_es_mejor=False)
+    return resultados
+
+
+def medir_exportacion(num_filas, tiempo_minimo):
+    """
+    Filas/s de `MonteCarlo.save` en CSV y Excel. Sin `pandas` (o sin su
+    motor de Excel) `save` escribe CSV, así que Excel no se mide
+    """
+    resultados = {}
+    mc = MonteCarlo(num_runs=num_filas)
+    mc._runs = [
+        {'seed': i, 'vehiculo_problema_id': i % 10, 'hubo_colisiones': bool(i % 2),
+         'vehiculos_afectados': i % 7, 'total_vehiculos': 10,
+         'distancia_seguridad': 5.0, 'duracion': 30.0}
+        for i in range(num_filas)
+    ]
+    directorio = tempfile.mkdtemp()
+    try:
+        for extension in ('csv', 'xlsx'):
+            ruta = os.path.join(directorio, f'resultados.{extension}')
+            if extension == 'xlsx' and (importar_opcional('pandas') is None
+                                        or mc.save(ruta) != ruta):
+                print('Excel no disponible: no se mide exportacion/xlsx', file=sys.stderr)
+                continue
+            segundos = _medir(lambda: mc.save(ruta), tiempo_minimo, repeticiones=1)
+            resultados[f'exportacion/{extension}'] = _resultado(num_filas / segundos, 'filas/s')
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    return resultados
+
+
+def ejecutar_suite(rapido=False):
+    """
+    Ejecuta todos los escenarios
+
+    Args:
+        rapido (bool): Escenarios reducidos (hasta 1000 vehículos, mediciones cortas)
+
+    Returns:
+        dict: `metadatos` del entorno y `resultados` por escenario
+    """
+    vehiculos = VEHICULOS_RAPIDO if rapido else VEHICULOS
+    tiempo_minimo = TIEMPO_MINIMO_RAPIDO if rapido else TIEMPO_MINIMO
+
+    resultados = {}
+    for nombre, medicion in (
+            ('pasos', lambda: medir_pasos(vehiculos, tiempo_minimo)),
+            ('estados', lambda: medir_estados(vehiculos, tiempo_minimo)),
+            ('montecarlo', lambda: medir_corridas(20 if rapido else 100, tiempo_minimo)),
+            ('memoria', lambda: medir_memoria(vehiculos[:3])),
+            ('exportacion', lambda: medir_exportacion(1000 if rapido else 10000, tiempo_minimo))):
+        print(f'Midiendo {nombre}...', file=sys.stderr)
+        resultados.update(medicion())
+
+    return {
+        'metadatos': {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': getattr(importar_opcional('pandas'), '__version__', None),
+            'plataforma': platform.platform(),
+            'procesador': platform.processor(),
+            'rapido': rapido,
+        },
+        'resultados': resultados,
+    }
+
+
+def comparar(base, nuevo, umbral=0.10):
+    """
+    Compara dos ejecuciones de la suite
+
+    Args:
+        base (dict): Resultados de referencia
+        nuevo (dict): Resultados a evaluar
+        umbral (float): Empeoramiento relativo tolerado
+
+    Returns:
+        tuple: (filas, faltantes). Una fila (nombre, base, nuevo, cambio,
+        regresion) por escenario común, donde `cambio` es la mejora relativa
+        (negativa si empeoró), y los escenarios de `base` que `nuevo` no midió
+
+    Raises:
+        ValueError: Si una ejecución es `--rapido` y la otra no (miden
+        escenarios distintos)
+    """
+    rapido_base = base.get('metadatos', {}).get('rapido')
+    rapido_nuevo = nuevo.get('metadatos', {}).get('rapido')
+    if rapido_base != rapido_nuevo:
+        raise ValueError(f'No se puede comparar una ejecución rápida con una completa '
+                         f'(base rapido={rapido_base}, nuevo rapido={rapido_nuevo}).')
+    filas = []
+    faltantes = []
+    for nombre, referencia in base['resultados'].items():
+        actual = nuevo['resultados'].get(nombre)
+        if actual is None:
+            faltantes.append(nombre)
+            continue
+        if not referencia['valor']:
+            continue
+        cambio = actual['valor'] / referencia['valor'] - 1
+        if not referencia.get('mayor_es_mejor', True):
+            cambio = -cambio
+        filas.append((nombre, referencia['valor'], actual['valor'], cambio, cambio < -umbral))
+    return filas, faltantes
+
+
+def _cargar(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Suite de rendimiento de la simulación')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    correr = subparsers.add_parser('run', help='Ejecutar la suite y guardar los resultados')
+    correr.add_argument('--salida', default='benchmarks/resultados.json')
+    correr.add_argument('--rapido', action='store_true', help='Escenarios reducidos')
+
+    contrastar = subparsers.add_parser('compare', help='Comparar dos resultados')
+    contrastar.add_argument('base')
+    contrastar.add_argument('nuevo')
+    contrastar.add_argument('--umbral', type=float, default=0.10,
+                            help='Empeoramiento relativo tolerado (0.10 = 10%%)')
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'run':
+        datos = ejecutar_suite(args.rapido)
+        directorio = os.path.dirname(args.salida)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2)
+        for nombre, resultado in datos['resultados'].items():
+            print(f"{nombre:<40} {resultado['valor']:>14.1f} {resultado['unidad']}")
+        print(f'Resultados guardados en: {args.salida}')
+        return 0
+
+    try:
+        filas, faltantes = comparar(_cargar(args.base), _cargar(args.nuevo), args.umbral)
+    except ValueError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+    regresiones = 0
+    for nombre, referencia, actual, cambio, regresion in filas:
+        marca = 'REGRESIÓN' if regresion else ''
+        print(f'{nombre:<40} {referencia:>14.1f} {actual:>14.1f} {cambio:>+8.1%} {marca}')
+        regresiones += regresion
+    for nombre in faltantes:
+        print(f'{nombre:<40} sin medir en {args.nuevo}')
+    print(f'{regresiones} regresiones sobre {len(filas)} escenarios (umbral {args.umbral:.0%})'
+          + (f', {len(faltantes)} sin medir' if faltantes else ''))
+    return 1 if regresiones else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,21 @@
 ﻿
 import React, { useRef, useEffect, useCallback } from 'react';
-import { Car, SimulationConfig } from '../types';
-import { TRACK_RADIUS, CAR_SIZE, CAR_WIDTH, CAR_LENGTH, CAR_PALETTE } from '../constants';
+import { Car, SimulationConfig, StreamFrame } from '../types';
+import {
+  TRACK_RADIUS, CAR_SIZE, CAR_WIDTH, CAR_LENGTH, CAR_PALETTE,
+  FLAG_BRAKING, FLAG_PROBLEM, FLAG_COLLIDED, FLAG_DECELERATING, DETAILED_CAR_LIMIT,
+} from '../constants';
+import { SimulationStream } from '../stream';
 
 interface SimulationCanvasProps {
   config: SimulationConfig;
   isRunning: boolean;
   triggerJamSignal: number; // Increment this to trigger a jam
   onJamComplete: () => void;
-  setStats: (stats: { avgSpeed: number; brakingCount: number }) => void;
+  setStats: (stats: { avgSpeed: number; brakingCount: number; efficiency?: number }) => void;
+  // When set, render frames streamed by the Python server instead of the local physics
+  streamUrl?: string;
+  restartOnConnect?: boolean;
 }
 
 export const SimulationCanvas: React.FC<SimulationCanvasProps> = ({
@@ -17,11 +24,46 @@ export const SimulationCanvas: React.FC<SimulationCanvasProps> = ({
   triggerJamSignal,
   onJamComplete,
   setStats,
+  streamUrl,
+  restartOnConnect = false,
 }) => {
   const canvasRef = useRef<HTMLCanvasElement>(null);
   const carsRef = useRef<Car[]>([]);
   const animationFrameId = useRef<number>(0);
   const lastUpdateRef = useRef<number>(0);
+  const streamRef = useRef<SimulationStream | null>(null);
+  const isRunningRef = useRef(isRunning);
+  const jamStateRef = useRef<'idle' | 'requested' | 'braking'>('idle');
+  const jamSignalRef = useRef(0);
+  isRunningRef.current = isRunning;
+
+  // Connect to the simulation server (streaming mode only)
+  useEffect(() => {
+    if (!streamUrl) return;
+    let restartPending = restartOnConnect;
+    const stream = new SimulationStream(streamUrl, {
+      onOpen: () => {
+        if (restartPending) {
+          stream.send('reiniciar');
+          restartPending = false;
+        }
+        stream.send(isRunningRef.current ? 'continuar' : 'pausar');
+      },
+      onFrame: (frame) => {
+        updateStreamStats(frame, stream);
+        trackJam(frame);
+      },
+    });
+    streamRef.current = stream;
+    return () => {
+      stream.close();
+      streamRef.current = null;
+    };
+  }, [streamUrl, restartOnConnect]);
+
+  useEffect(() => {
+    streamRef.current?.send(isRunning ? 'continuar' : 'pausar');
+  }, [isRunning]);
 
   // Initialize Cars
   const initCars = useCallback(() => {
@@ -50,6 +92,14 @@ export const SimulationCanvas: React.FC<SimulationCanvasProps> = ({
   // Handle Jam Trigger
   useEffect(() => {
     if (triggerJamSignal === 0) return;
+    if (streamUrl) {
+      // The server brakes its problem car; the jam ends when that car releases the brake
+      if (jamSignalRef.current === triggerJamSignal) return;
+      jamSignalRef.current = triggerJamSignal;
+      jamStateRef.current = 'requested';
+      streamRef.current?.send('frenar');
+      return;
+    }
     if (carsRef.current.length === 0) return;
 
     // Pick a random car
@@ -65,7 +115,42 @@ export const SimulationCanvas: React.FC<SimulationCanvasProps> = ({
       }
     }, 2000);
 
-  }, [triggerJamSignal, onJamComplete]);
+  }, [triggerJamSignal, onJamComplete, streamUrl]);
+
+  const trackJam = (frame: StreamFrame) => {
+    if (jamStateRef.current === 'idle') return;
+    let braking = false;
+    for (let i = 0; i < frame.flags.length; i++) {
+      if (frame.flags[i] & FLAG_PROBLEM) {
+        braking = (frame.flags[i] & FLAG_BRAKING) !== 0;
+        break;
+      }
+    }
+    if (braking) {
+      jamStateRef.current = 'braking';
+    } else if (jamStateRef.current === 'braking') {
+      jamStateRef.current = 'idle';
+      onJamComplete();
+    }
+  };
+
+  const updateStreamStats = (frame: StreamFrame, stream: SimulationStream) => {
+    if (Date.now() - lastUpdateRef.current <= 200 || !stream.config) return;
+    const numCars = frame.speeds.length;
+    let totalSpeed = 0;
+    let brakingCount = 0;
+    for (let i = 0; i < numCars; i++) {
+      totalSpeed += frame.speeds[i];
+      if (frame.flags[i] & (FLAG_BRAKING | FLAG_DECELERATING)) brakingCount++;
+    }
+    const meanSpeed = numCars ? totalSpeed / numCars : 0;
+    setStats({
+      avgSpeed: meanSpeed / stream.config.radio, // rad/s
+      brakingCount,
+      efficiency: (meanSpeed / stream.config.velocidad_normal) * 100,
+    });
+    lastUpdateRef.current = Date.now();
+  };
 
   // Physics Loop
   const updatePhysics = () => {
@@ -307,6 +392,11 @@ export const SimulationCanvas: React.FC<SimulationCanvasProps> = ({
     ctx.stroke();
     ctx.setLineDash([]); // Reset dash
 
+    if (streamUrl) {
+      drawStream(ctx, centerX, centerY);
+      return;
+    }
+
     // Draw Cars
     carsRef.current.forEach(car => {
       const x = centerX + Math.cos(car.angle) * TRACK_RADIUS;
@@ -315,13 +405,84 @@ export const SimulationCanvas: React.FC<SimulationCanvasProps> = ({
     });
   };
 
+  const drawStream = (ctx: CanvasRenderingContext2D, centerX: number, centerY: number) => {
+    const stream = streamRef.current;
+    const frame = stream?.frame;
+    if (!stream || !frame || !stream.config) {
+      ctx.fillStyle = '#94a3b8';
+      ctx.font = '16px sans-serif';
+      ctx.textAlign = 'center';
+      ctx.fillText('Esperando al servidor de simulación…', centerX, centerY);
+      return;
+    }
+
+    const numCars = frame.angles.length;
+    if (numCars <= DETAILED_CAR_LIMIT) {
+      for (let i = 0; i < numCars; i++) {
+        const angle = frame.angles[i];
+        const flags = frame.flags[i];
+        const forced = (flags & FLAG_PROBLEM) !== 0 && (flags & FLAG_BRAKING) !== 0;
+        const car: Car = {
+          id: i,
+          angle,
+          speed: frame.speeds[i],
+          radius: TRACK_RADIUS,
+          baseColor: CAR_PALETTE[i % CAR_PALETTE.length],
+          isForcedStopped: forced,
+          state: frame.speeds[i] === 0 ? 'stopped'
+            : forced || flags & FLAG_DECELERATING ? 'braking' : 'cruising',
+        };
+        drawCar(ctx, centerX + Math.cos(angle) * TRACK_RADIUS,
+          centerY + Math.sin(angle) * TRACK_RADIUS, angle, car);
+      }
+      return;
+    }
+
+    // Large rings: one dot per car, batched by colour. The radial offset shows
+    // speed (stopped cars on the inner edge), so jam waves stay visible when
+    // thousands of cars overlap.
+    const normalSpeed = stream.config.velocidad_normal;
+    const size = numCars > 2000 ? 2 : 3;
+    const cruising = new Path2D();
+    const braking = new Path2D();
+    const collided = new Path2D();
+    let problem = -1;
+    for (let i = 0; i < numCars; i++) {
+      const flags = frame.flags[i];
+      if (flags & FLAG_PROBLEM) problem = i;
+      const ratio = Math.min(1.2, frame.speeds[i] / normalSpeed);
+      const r = TRACK_RADIUS - 20 + ratio * 35;
+      const path = flags & FLAG_COLLIDED ? collided
+        : flags & (FLAG_BRAKING | FLAG_DECELERATING) ? braking : cruising;
+      path.rect(centerX + Math.cos(frame.angles[i]) * r - size / 2,
+        centerY + Math.sin(frame.angles[i]) * r - size / 2, size, size);
+    }
+    ctx.fillStyle = '#22d3ee';
+    ctx.fill(cruising);
+    ctx.fillStyle = '#ef4444';
+    ctx.fill(braking);
+    ctx.fillStyle = '#f59e0b';
+    ctx.fill(collided);
+
+    if (problem >= 0) {
+      const ratio = Math.min(1.2, frame.speeds[problem] / normalSpeed);
+      const r = TRACK_RADIUS - 20 + ratio * 35;
+      ctx.beginPath();
+      ctx.arc(centerX + Math.cos(frame.angles[problem]) * r,
+        centerY + Math.sin(frame.angles[problem]) * r, 6, 0, 2 * Math.PI);
+      ctx.strokeStyle = '#fbbf24';
+      ctx.lineWidth = 2;
+      ctx.stroke();
+    }
+  };
+
   const loop = useCallback(() => {
-    if (isRunning) {
+    if (isRunning && !streamUrl) {
       updatePhysics();
     }
     draw();
     animationFrameId.current = requestAnimationFrame(loop);
-  }, [isRunning, config]);
+  }, [isRunning, config, streamUrl]);
 
   useEffect(() => {
     animationFrameId.current = requestAnimationFrame(loop);
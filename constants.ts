@@ -38,3 +38,16 @@ export const CAR_PALETTE = [
   '#e2e8f0', // Slate (White-ish)
   '#94a3b8', // Gray
 ];
+
+// Binary frames from the Python server (must match core/servidor.py)
+export const STREAM_FRAME_VERSION = 1;
+export const STREAM_HEADER_BYTES = 24;
+export const STREAM_KEYFRAME = 0;
+export const STREAM_DELTA = 1;
+export const FLAG_BRAKING = 1;       // Problem car braking on purpose
+export const FLAG_PROBLEM = 2;
+export const FLAG_HAD_TO_BRAKE = 4;
+export const FLAG_COLLIDED = 8;
+export const FLAG_DECELERATING = 16; // Speed dropped since the previous frame
+export const STREAM_RECONNECT_MS = 1000;
+export const DETAILED_CAR_LIMIT = 60; // Above this many cars, draw them as dots
@@ -0,0 +1,294 @@
+import json
+import itertools
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from core.exportacion import importar_opcional, particion_de
+from core.montecarlo import MonteCarlo, guardar_filas, resumir_corridas
+from core.muestreo import tamano_efectivo, varianza_muestral
+from core.simetria import (
+    SIMETRIA_NINGUNA, SIMETRIA_EXACTA, SIMETRIA_ROTACION, MODOS_SIMETRIA,
+    agrupar_semillas, expandir
+)
+from models.conductores import PoblacionConductores
+from utils.constantes import (
+    DISTANCIA_SEGURIDAD, RADIO_REDONDEL, NUMERO_VEHICULOS, DT, MOTOR_OBJETOS,
+    INTEGRADOR_FIJO
+)
+
+# Parámetros que forman la grilla, en el orden de las columnas de salida
+PARAMETROS_GRILLA = ('distancia_seguridad', 'num_vehiculos', 'radio', 'dt',
+                     'tiempo_inicio_frenado')
+
+
+def _como_lista(valor) -> list:
+    """Acepta un escalar o un iterable de valores para un eje de la grilla"""
+    if isinstance(valor, (str, bytes)) or not isinstance(valor, Iterable):
+        return [valor]
+    return list(valor)
+
+
+# `MonteCarlo` de los últimos puntos de cada proceso, para reutilizar su
+# prefijo común. Los trabajos de un punto llegan juntos, así que bastan unos
+# pocos; los más viejos se descartan (cada uno guarda un prefijo y sus clases)
+_montecarlos = {}
+MAX_MONTECARLOS = 4
+
+
+def _ejecutar_trabajo(trabajo):
+    """
+    Ejecuta una corrida (punto de la grilla, semilla). Función de módulo para
+    poder enviarla a otros procesos.
+
+    Returns:
+        tuple: (índice del punto, resumen de la corrida)
+    """
+    indice, parametros, seed = trabajo
+    clave = json.dumps(parametros, sort_keys=True)
+    mc = _montecarlos.pop(clave, None)
+    if mc is None:
+        mc = MonteCarlo(num_runs=0, **parametros)
+        while len(_montecarlos) >= MAX_MONTECARLOS:
+            del _montecarlos[next(iter(_montecarlos))]
+    # El último usado queda al final: se descarta el usado hace más tiempo
+    _montecarlos[clave] = mc
+    return indice, mc._run_single(seed)
+
+
+class Barrido:
+    """
+    Barrido de parámetros sobre el producto cartesiano de `distancia_seguridad`,
+    `num_vehiculos`, `radio`, `dt`, `tiempo_inicio_frenado` y semillas.
+
+    Cada par (punto, semilla) es un trabajo independiente; con `workers` se
+    reparten en un pool de procesos empezando por los más costosos (más
+    vehículos y pasos), para que los procesos terminen a la par. El
+    resultado es una tabla con una fila por punto de la grilla y las mismas
+    estadísticas que `MonteCarlo.summary_statistics`.
+    """
+
+    def __init__(self,
+                distancia_seguridad=DISTANCIA_SEGURIDAD,
+                num_vehiculos=NUMERO_VEHICULOS,
+                radio=RADIO_REDONDEL,
+                dt=DT,
+                tiempo_inicio_frenado=5.0,
+                seeds: Iterable[int] = range(10),
+                duracion: float = 30.0,
+                motor: str = MOTOR_OBJETOS,
+                simetria: str = SIMETRIA_EXACTA,
+                poblacion=None,
+                integrador: str = INTEGRADOR_FIJO,
+                cache=None):
+        """
+        Cada parámetro de la grilla acepta un valor o un iterable de valores.
+        Con `cache` (un `CacheResultados`) solo se simulan las corridas que no
+        estén guardadas. `simetria` es el modo de deduplicación de
+        `MonteCarlo` (ver core/simetria.py), `poblacion` la distribución
+        de los conductores (ver models/conductores.py) e `integrador` el de
+        `Simulacion`; con el adaptativo, `dt` es el paso cerca de los eventos.
+        Las semillas no pueden repetirse: cada una es una corrida de cada punto.
+        """
+        if simetria not in MODOS_SIMETRIA:
+            raise ValueError(f"Modo de simetría desconocido: {simetria!r}")
+        seeds = [int(s) for s in seeds]
+        repetidas = sorted(s for s, n in Counter(seeds).items() if n > 1)
+        if repetidas:
+            raise ValueError(f"Semillas repetidas: {', '.join(map(str, repetidas))}")
+        self.ejes = {
+            'distancia_seguridad': _como_lista(distancia_seguridad),
+            'num_vehiculos': _como_lista(num_vehiculos),
+            'radio': _como_lista(radio),
+            'dt': _como_lista(dt),
+            'tiempo_inicio_frenado': _como_lista(tiempo_inicio_frenado),
+        }
+        self.seeds = seeds
+        self.duracion = duracion
+        self.motor = motor
+        self.simetria = simetria
+        self.poblacion = PoblacionConductores.desde_dict(poblacion)
+        self.integrador = integrador
+        self.cache = cache
+
+        self._filas = []  # una fila agregada por punto de la grilla
+        self._runs = []  # resultados por corrida, en orden (punto, semilla)
+        self._grupos = {}
+
+    def puntos(self) -> List[dict]:
+        """Puntos de la grilla, como diccionarios de parámetros"""
+        return [dict(zip(PARAMETROS_GRILLA, valores))
+                for valores in itertools.product(*(self.ejes[p] for p in PARAMETROS_GRILLA))]
+
+    def _parametros_corrida(self, punto: dict) -> dict:
+        parametros = dict(punto, duracion=self.duracion, motor=self.motor)
+        if self.poblacion is not None:
+            parametros['poblacion'] = self.poblacion.describir()
+        if self.integrador != INTEGRADOR_FIJO:
+            parametros['integrador'] = self.integrador
+        return parametros
+
+    @staticmethod
+    def _costo(punto: dict) -> float:
+        """Costo estimado de una corrida: vehículos x pasos"""
+        return punto['num_vehiculos'] / punto['dt']
+
+    def run(self, workers: Optional[int] = None, chunksize: int = 1, sumidero=None):
+        """
+        Ejecuta todas las corridas del barrido.
+
+        Args:
+            workers: número de procesos; None o 1 ejecuta en serie.
+            chunksize: trabajos por tarea enviada a cada proceso. Valores
+                pequeños reparten mejor la carga.
+            sumidero: `SumideroCorridas` opcional que recibe cada corrida en
+                cuanto termina, particionada por punto de la grilla.
+
+        Returns:
+            list: una fila (dict) por punto con sus parámetros y estadísticas.
+        """
+        puntos = self.puntos()
+        trabajos = [(i, self._parametros_corrida(p), s)
+                    for i, p in enumerate(puntos) for s in self.seeds]
+
+        # Parámetros normalizados de cada punto: clave de caché y partición de salida
+        claves = [MonteCarlo(num_runs=0, **self._parametros_corrida(p)).parametros_corrida()
+                  for p in puntos]
+
+        guardados = []
+        if self.cache is not None:
+            pendientes = []
+            for trabajo in trabajos:
+                resumen = self.cache.obtener(claves[trabajo[0]], trabajo[2])
+                if resumen is None:
+                    pendientes.append(trabajo)
+                else:
+                    guardados.append((trabajo[0], resumen))
+            trabajos = pendientes
+
+        # Un trabajo por clase de corridas equivalentes en cada punto
+        self._grupos = {}  # (índice, semilla representante) -> semillas de su clase
+        simetria = self.simetria
+        if self.poblacion is not None and not self.poblacion.homogenea:
+            simetria = SIMETRIA_NINGUNA
+        representantes = []
+        for indice in dict.fromkeys(t[0] for t in trabajos):
+            seeds = [t[2] for t in trabajos if t[0] == indice]
+            for grupo in agrupar_semillas(seeds, puntos[indice]['num_vehiculos'],
+                                          simetria).values():
+                self._grupos[(indice, grupo[0])] = grupo
+                representantes.append((indice, self._parametros_corrida(puntos[indice]), grupo[0]))
+        trabajos = representantes
+        trabajos.sort(key=lambda t: self._costo(puntos[t[0]]), reverse=True)
+
+        if sumidero is not None:
+            for indice, resumen in guardados:
+                sumidero.agregar(resumen, particion_de(claves[indice]))
+
+        if workers is None or workers <= 1:
+            nuevos = list(self._recibir(map(_ejecutar_trabajo, trabajos), claves, sumidero))
+        else:
+            # Importación diferida: el pool de procesos solo hace falta en paralelo
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                nuevos = list(self._recibir(
+                    pool.map(_ejecutar_trabajo, trabajos, chunksize=chunksize), claves, sumidero))
+        por_punto = self._agrupar(guardados + nuevos, len(puntos))
+
+        self._runs = []
+        self._filas = []
+        for punto, runs in zip(puntos, por_punto):
+            runs.sort(key=lambda r: r['seed'])
+            self._runs.extend(dict(punto, **r) for r in runs)
+            self._filas.append(dict(punto, **resumir_corridas(runs)))
+
+        return self._filas
+
+    def _recibir(self, resultados, claves: List[dict], sumidero):
+        """
+        Expande cada resultado a las semillas de su clase y las guarda en la
+        caché y el sumidero en cuanto llega
+        """
+        for indice, resumen in resultados:
+            for s in self._grupos[(indice, resumen['seed'])]:
+                fila = expandir(resumen, s, claves[indice]['num_vehiculos'])
+                # Con rotación las filas expandidas son aproximadas: solo se guarda la simulada
+                if self.cache is not None and (self.simetria != SIMETRIA_ROTACION
+                                               or s == resumen['seed']):
+                    self.cache.guardar(claves[indice], s, fila)
+                if sumidero is not None:
+                    sumidero.agregar(fila, particion_de(claves[indice]))
+                yield indice, fila
+
+    @staticmethod
+    def _agrupar(resultados, num_puntos: int) -> List[List[dict]]:
+        por_punto = [[] for _ in range(num_puntos)]
+        for indice, resumen in resultados:
+            por_punto[indice].append(resumen)
+        return por_punto
+
+    def diferencias(self, eje: str = 'distancia_seguridad') -> List[dict]:
+        """
+        Efecto de cambiar `eje` entre valores consecutivos, manteniendo fijos
+        los demás parámetros.
+
+        Todos los puntos usan las mismas semillas, es decir, los mismos
+        números aleatorios (el mismo vehículo problema en cada semilla), así
+        que las diferencias se estiman pareando las corridas por semilla: el
+        ruido común se cancela y el error estándar es menor que comparando
+        muestras independientes. `tamano_efectivo` es el número de corridas
+        independientes por punto que daría la misma precisión.
+
+        Returns:
+            list: una fila por par de puntos con los parámetros fijos,
+            `desde`, `hasta`, `colisiones_diferencia`,
+            `colisiones_diferencia_ee`, `vehiculos_afectados_diferencia`,
+            `vehiculos_afectados_diferencia_ee` y `tamano_efectivo`.
+        """
+        if eje not in PARAMETROS_GRILLA:
+            raise ValueError(f"Eje desconocido: {eje!r}")
+        if not self._runs:
+            raise RuntimeError('No hay resultados. Ejecute `run()` antes de comparar.')
+
+        fijos = [p for p in PARAMETROS_GRILLA if p != eje]
+        series = {}  # parámetros fijos -> valor del eje -> semilla -> corrida
+        for r in self._runs:
+            clave = tuple(r[p] for p in fijos)
+            series.setdefault(clave, {}).setdefault(r[eje], {})[r['seed']] = r
+
+        filas = []
+        for clave, por_valor in series.items():
+            valores = sorted(por_valor)
+            for desde, hasta in zip(valores, valores[1:]):
+                a, b = por_valor[desde], por_valor[hasta]
+                comunes = [s for s in a if s in b]
+                n = len(comunes)
+                fila = dict(zip(fijos, clave), desde=desde, hasta=hasta)
+                for columna, nombre in (('hubo_colisiones', 'colisiones'),
+                                        ('vehiculos_afectados', 'vehiculos_afectados')):
+                    d = [float(b[s][columna]) - float(a[s][columna]) for s in comunes]
+                    fila[f'{nombre}_diferencia'] = sum(d) / n
+                    fila[f'{nombre}_diferencia_ee'] = (varianza_muestral(d) / n) ** 0.5
+                # Varianza de la diferencia con muestras independientes en cada punto
+                pa = sum(a[s]['hubo_colisiones'] for s in comunes) / n
+                pb = sum(b[s]['hubo_colisiones'] for s in comunes) / n
+                fila['tamano_efectivo'] = tamano_efectivo(
+                    pa * (1 - pa) + pb * (1 - pb), fila['colisiones_diferencia_ee'] ** 2, n)
+                filas.append(fila)
+        return filas
+
+    def to_dataframe(self, por_corrida: bool = False):
+        """
+        Devuelve la tabla agregada (o la de corridas si `por_corrida`) como
+        `pandas.DataFrame`, o None si `pandas` no está instalado.
+        """
+        pd = importar_opcional('pandas')
+        if pd is None:
+            return None
+        return pd.DataFrame(self._runs if por_corrida else self._filas)
+
+    def save(self, filepath: str, por_corrida: bool = False):
+        """Guarda la tabla agregada (o la de corridas) como `MonteCarlo.save`"""
+        filas = self._runs if por_corrida else self._filas
+        if not filas:
+            raise RuntimeError('No hay resultados. Ejecute `run()` antes de guardar.')
+        return guardar_filas(filas, filepath)
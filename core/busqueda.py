@@ -0,0 +1,186 @@
+import itertools
+from typing import Dict, Iterable, List, Optional
+
+from core.montecarlo import MonteCarlo
+from core.estadisticas import ResumenEnLinea
+
+# Lado de una sonda respecto del objetivo
+LADO_ARRIBA = 'arriba'  # probabilidad de colisión mayor que el objetivo
+LADO_ABAJO = 'abajo'
+
+
+class BusquedaDistanciaCritica:
+    """
+    Búsqueda de la distancia de seguridad crítica: aquella en la que la
+    probabilidad de colisión cruza `objetivo`.
+
+    En lugar de recorrer una grilla fija, evalúa los extremos del intervalo
+    (`distancia_min`, `distancia_max`) y, si el cruce queda encerrado entre
+    ellos, lo biseca hasta que el intervalo mide menos que `tolerancia`.
+    Cada sonda agrega corridas de a `lote` hasta que el intervalo de Wilson
+    de la fracción de colisiones queda de un lado del objetivo o se llega a
+    `max_runs`; las sondas lejos de la frontera se deciden con pocas
+    corridas. Todas las sondas usan las mismas semillas (números aleatorios
+    comunes), así que las comparaciones entre distancias no agregan ruido.
+    Las sondas se guardan por distancia y, con `cache`, cada corrida queda
+    en disco para búsquedas posteriores.
+    """
+
+    def __init__(self,
+                objetivo: float = 0.05,
+                distancia_min: float = 0.0,
+                distancia_max: float = 30.0,
+                tolerancia: float = 0.1,
+                confianza: float = 0.95,
+                lote: int = 20,
+                max_runs: int = 1000,
+                seed_start: int = 0,
+                cache=None,
+                **parametros):
+        """
+        Args:
+            objetivo: probabilidad de colisión buscada.
+            distancia_min, distancia_max: intervalo inicial de búsqueda (m).
+            tolerancia: ancho final del intervalo que contiene la distancia crítica (m).
+            confianza: nivel de confianza con que se decide el lado de cada sonda.
+            lote: corridas agregadas entre decisiones.
+            max_runs: máximo de corridas por sonda; si no alcanza para decidir,
+                se usa la estimación puntual y la sonda queda marcada `incierta`.
+            seed_start: primera semilla de cada sonda.
+            cache: `CacheResultados` opcional.
+            **parametros: parámetros de `MonteCarlo` (`num_vehiculos`, `radio`, ...).
+        """
+        if not 0 < objetivo < 1:
+            raise ValueError('El objetivo debe estar entre 0 y 1.')
+        if distancia_max <= distancia_min:
+            raise ValueError('distancia_max debe ser mayor que distancia_min.')
+        self.objetivo = objetivo
+        self.distancia_min = float(distancia_min)
+        self.distancia_max = float(distancia_max)
+        self.tolerancia = float(tolerancia)
+        self.confianza = confianza
+        self.lote = max(1, int(lote))
+        self.max_runs = max(self.lote, int(max_runs))
+        self.seed_start = int(seed_start)
+        self.cache = cache
+        self.parametros = parametros
+
+        self._sondas = {}  # distancia -> resultado de `sondear`
+
+    def sondear(self, distancia: float) -> dict:
+        """
+        Estima la probabilidad de colisión en `distancia` con las corridas
+        justas para decidir de qué lado del objetivo está.
+
+        Returns:
+            dict: `distancia`, `colisiones_frac`, `colisiones_ic`,
+            `num_corridas`, `lado` (`arriba` o `abajo`) e `incierta`.
+        """
+        distancia = float(distancia)
+        if distancia in self._sondas:
+            return self._sondas[distancia]
+
+        mc = MonteCarlo(num_runs=0, distancia_seguridad=distancia, cache=self.cache,
+                        **self.parametros)
+        estadisticas = ResumenEnLinea(self.confianza)
+        siguiente = self.seed_start
+        while True:
+            seeds = list(range(siguiente, siguiente + min(self.lote, self.max_runs - estadisticas.n)))
+            siguiente += len(seeds)
+            for resumen in mc.run(seeds=seeds):
+                estadisticas.agregar(resumen)
+            inferior, superior = estadisticas.intervalo_colisiones()
+            decidida = inferior > self.objetivo or superior < self.objetivo
+            if decidida or estadisticas.n >= self.max_runs:
+                break
+
+        frac = estadisticas.colisiones / estadisticas.n
+        sonda = {
+            'distancia': distancia,
+            'colisiones_frac': frac,
+            'colisiones_ic': (inferior, superior),
+            'num_corridas': estadisticas.n,
+            'lado': LADO_ARRIBA if frac > self.objetivo else LADO_ABAJO,
+            'incierta': not decidida
+        }
+        self._sondas[distancia] = sonda
+        return sonda
+
+    def buscar(self) -> dict:
+        """
+        Ejecuta la búsqueda.
+
+        Returns:
+            dict: `encontrada` (False si los extremos quedan del mismo lado
+            del objetivo), `distancia_critica` (centro del intervalo final),
+            `intervalo`, `corridas` (total simuladas en las sondas), `sondas`
+            (en orden de evaluación) y `decreciente` (True si la probabilidad
+            baja al aumentar la distancia).
+        """
+        inicio = len(self._sondas)
+        lo = self.sondear(self.distancia_min)
+        hi = self.sondear(self.distancia_max)
+        encontrada = lo['lado'] != hi['lado']
+
+        desde, hasta = self.distancia_min, self.distancia_max
+        if encontrada:
+            lado_desde = lo['lado']
+            while hasta - desde > self.tolerancia:
+                medio = (desde + hasta) / 2
+                if self.sondear(medio)['lado'] == lado_desde:
+                    desde = medio
+                else:
+                    hasta = medio
+
+        sondas = list(self._sondas.values())[inicio:]
+        return {
+            'encontrada': encontrada,
+            'distancia_critica': (desde + hasta) / 2 if encontrada else None,
+            'intervalo': (desde, hasta) if encontrada else None,
+            'decreciente': lo['colisiones_frac'] >= hi['colisiones_frac'],
+            'corridas': sum(s['num_corridas'] for s in sondas),
+            'sondas': sondas
+        }
+
+
+def _buscar_punto(trabajo):
+    """Búsqueda en un punto del mapa. Función de módulo para enviarla a otros procesos"""
+    punto, opciones = trabajo
+    return BusquedaDistanciaCritica(**opciones, **punto).buscar()
+
+
+def mapa_frontera(ejes: Dict[str, Iterable], workers: Optional[int] = None,
+                  **opciones) -> List[dict]:
+    """
+    Distancia crítica en cada punto del producto cartesiano de `ejes`.
+
+    Args:
+        ejes: valores de cada parámetro de `MonteCarlo` que varía, por ejemplo
+            `{'num_vehiculos': [8, 10, 12], 'radio': [40, 50, 60]}`.
+        workers: número de procesos (uno por punto); None o 1 en serie.
+        **opciones: argumentos de `BusquedaDistanciaCritica` comunes a todos
+            los puntos.
+
+    Returns:
+        list: una fila por punto con sus parámetros, `encontrada`,
+        `distancia_critica`, `intervalo`, `decreciente` y `corridas`.
+    """
+    nombres = list(ejes)
+    puntos = [dict(zip(nombres, valores))
+              for valores in itertools.product(*(list(ejes[n]) for n in nombres))]
+    trabajos = [(p, opciones) for p in puntos]
+
+    if workers is None or workers <= 1:
+        resultados = list(map(_buscar_punto, trabajos))
+    else:
+        # Importación diferida: el pool de procesos solo hace falta en paralelo
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            resultados = list(pool.map(_buscar_punto, trabajos))
+
+    filas = []
+    for punto, resultado in zip(puntos, resultados):
+        fila = dict(punto, **resultado)
+        del fila['sondas']
+        filas.append(fila)
+    return filas
@@ -0,0 +1,152 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Optional
+
+from utils import constantes
+
+# Módulos cuyo código define el resultado de una corrida: si cambian, la
+# huella cambia y las entradas anteriores dejan de coincidir. Incluye los que
+# arman la fila guardada (`MonteCarlo._run_single`) y los que la reescriben
+# para otras semillas de la misma clase (`expandir`)
+MODULOS_MODELO = (
+    'models/vehiculo.py',
+    'models/redondel.py',
+    'models/redondel_vectorizado.py',
+    'models/conductores.py',
+    'core/simulacion.py',
+    'core/montecarlo.py',
+    'core/simetria.py',
+)
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_huella = None
+
+
+def constantes_fisicas() -> dict:
+    """Constantes numéricas de `utils/constantes.py` (MAYÚSCULAS)"""
+    return {nombre: valor for nombre, valor in sorted(vars(constantes).items())
+            if nombre.isupper() and isinstance(valor, (int, float)) and not isinstance(valor, bool)}
+
+
+def huella_modelo() -> str:
+    """
+    Huella del modelo: `VERSION_MODELO`, las constantes físicas y el código de
+    `MODULOS_MODELO`. Se calcula una vez por proceso.
+    """
+    global _huella
+    if _huella is None:
+        h = hashlib.sha256()
+        h.update(json.dumps(constantes_fisicas(), sort_keys=True).encode())
+        for ruta in MODULOS_MODELO:
+            try:
+                with open(os.path.join(_RAIZ, ruta), 'rb') as f:
+                    h.update(f.read())
+            except OSError:
+                h.update(ruta.encode())
+        _huella = h.hexdigest()
+    return _huella
+
+
+class CacheResultados:
+    """
+    Caché persistente de resultados de corridas, direccionada por contenido.
+
+    La clave de cada corrida es el hash de sus parámetros, la semilla y la
+    huella del modelo (ver `huella_modelo`), así que un cambio en las
+    constantes o en el código de la simulación invalida automáticamente los
+    resultados previos. Cada entrada es un JSON pequeño; las lecturas
+    renuevan su fecha de modificación y, al superar `max_bytes`, se expulsan
+    las menos usadas recientemente (LRU). Las escrituras son atómicas, de
+    modo que varios procesos pueden compartir el mismo directorio.
+    """
+
+    def __init__(self, directorio: str = '.cache_simulacion', max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            directorio: carpeta de la caché (se crea si no existe).
+            max_bytes: tamaño máximo aproximado en disco.
+        """
+        self.directorio = directorio
+        self.max_bytes = int(max_bytes)
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+        self._bytes = sum(os.path.getsize(r) for r, _ in self._entradas())
+
+    @staticmethod
+    def clave(parametros: dict, seed: int) -> str:
+        """Hash SHA-256 de los parámetros de la corrida, la semilla y la huella del modelo"""
+        contenido = json.dumps({'parametros': parametros, 'seed': int(seed),
+                                'modelo': huella_modelo()}, sort_keys=True)
+        return hashlib.sha256(contenido.encode()).hexdigest()
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], clave + '.json')
+
+    def _entradas(self):
+        """Recorre (ruta, fecha de modificación) de todas las entradas"""
+        for raiz, _, archivos in os.walk(self.directorio):
+            for nombre in archivos:
+                if nombre.endswith('.json'):
+                    ruta = os.path.join(raiz, nombre)
+                    try:
+                        yield ruta, os.path.getmtime(ruta)
+                    except OSError:
+                        continue
+
+    def obtener(self, parametros: dict, seed: int) -> Optional[dict]:
+        """Devuelve el resultado guardado o None si no está en la caché"""
+        ruta = self._ruta(self.clave(parametros, seed))
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                resultado = json.load(f)
+            os.utime(ruta)  # marca de uso para la expulsión LRU
+        except (OSError, ValueError):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return resultado
+
+    def guardar(self, parametros: dict, seed: int, resultado: dict):
+        """Guarda el resultado de una corrida"""
+        ruta = self._ruta(self.clave(parametros, seed))
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f)
+        tamano = os.path.getsize(temporal)
+        try:
+            anterior = os.path.getsize(ruta)  # se reemplaza una entrada existente
+        except OSError:
+            anterior = 0
+        os.replace(temporal, ruta)
+        self._bytes += tamano - anterior
+        if self._bytes > self.max_bytes:
+            self._expulsar()
+
+    def _expulsar(self):
+        """Elimina las entradas menos usadas hasta bajar al 90 % de `max_bytes`"""
+        entradas = sorted(self._entradas(), key=lambda e: e[1])
+        total = sum(os.path.getsize(r) for r, _ in entradas)
+        objetivo = 0.9 * self.max_bytes
+        for ruta, _ in entradas:
+            if total <= objetivo:
+                break
+            try:
+                tamano = os.path.getsize(ruta)
+                os.remove(ruta)
+                total -= tamano
+            except OSError:
+                continue
+        self._bytes = total
+
+    def limpiar(self):
+        """Elimina todas las entradas"""
+        for ruta, _ in list(self._entradas()):
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+        self._bytes = 0
@@ -0,0 +1,316 @@
+"""
+Interfaz de línea de comandos no interactiva, para lanzar corridas desde
+scripts y planificadores.
+
+Uso (desde la raíz del proyecto; `python main.py <comando>` es equivalente):
+
+    python -m core.cli simple --seed 7 --distancia-seguridad 4
+    python -m core.cli distancias --distancias 3 4 5 6
+    python -m core.cli montecarlo --corridas 1000 --workers 4 --salida mc.csv
+    python -m core.cli barrido --distancia-seguridad 3 5 7 --vehiculos 10 20 --semillas 50
+    python -m core.cli busqueda --objetivo 0.05
+    python -m core.cli red --redondeles 200 --procesos 4 --duracion 120
+    python -m core.cli lote trabajos.jsonl
+
+Cada resultado se escribe en la salida estándar como una línea JSON. El
+archivo de `lote` (una lista JSON o una línea JSON por trabajo) describe
+trabajos `{"comando": ..., <opción>: <valor>}` con las opciones con los
+nombres de los parámetros (`num_vehiculos`, `distancia_seguridad`, ...):
+se ejecutan todos en el mismo proceso, así el arranque se paga una vez.
+Un trabajo que falla produce `{"trabajo": i, "error": ...}` y el código de
+salida es 1.
+
+Los módulos de cada comando se importan recién al ejecutarlo, y `pandas`
+solo si se guarda un Excel.
+"""
+import sys
+import json
+import argparse
+
+from utils.constantes import (
+    MOTOR_OBJETOS, MOTOR_VECTORIZADO, INTEGRADOR_FIJO, INTEGRADOR_ADAPTATIVO
+)
+
+COMANDOS = ('simple', 'distancias', 'montecarlo', 'barrido', 'busqueda', 'red')
+
+# Parámetros del modelo comunes a todos los comandos (destino, opción, tipo)
+_OPCIONES_MODELO = (
+    ('num_vehiculos', '--vehiculos', int),
+    ('radio', '--radio', float),
+    ('distancia_seguridad', '--distancia-seguridad', float),
+    ('dt', '--dt', float),
+    ('tiempo_inicio_frenado', '--inicio-frenado', float),
+)
+
+
+def _agregar_modelo(parser, grilla=False, excluir=()):
+    """Opciones del modelo; con `grilla` cada una acepta varios valores"""
+    for destino, opcion, tipo in _OPCIONES_MODELO:
+        if destino in excluir:
+            continue
+        parser.add_argument(opcion, dest=destino, type=tipo, default=None,
+                            nargs='+' if grilla else None)
+    parser.add_argument('--duracion', type=float, default=30.0)
+    parser.add_argument('--motor', default=None, choices=(MOTOR_OBJETOS, MOTOR_VECTORIZADO))
+    parser.add_argument('--integrador', default=None,
+                        choices=(INTEGRADOR_FIJO, INTEGRADOR_ADAPTATIVO))
+
+
+def _parametros(opciones: dict, nombres) -> dict:
+    """Parámetros indicados (no None) entre `nombres`"""
+    return {nombre: opciones[nombre] for nombre in nombres if opciones.get(nombre) is not None}
+
+
+def _modelo(opciones: dict) -> dict:
+    return _parametros(opciones, [destino for destino, _, _ in _OPCIONES_MODELO]
+                       + ['duracion', 'motor', 'integrador'])
+
+
+def ejecutar_simple(opciones: dict) -> list:
+    """Una corrida de `Simulacion`, sin historial"""
+    from core.simulacion import Simulacion
+    from utils.constantes import REGISTRO_NINGUNO
+
+    parametros = _parametros(opciones, ('num_vehiculos', 'radio', 'distancia_seguridad', 'dt',
+                                        'motor', 'integrador'))
+    simulacion = Simulacion(registro=REGISTRO_NINGUNO, **parametros)
+    resultados = simulacion.ejecutar_completa(
+        duracion=opciones['duracion'],
+        tiempo_inicio_frenado=(opciones['tiempo_inicio_frenado']
+                               if opciones.get('tiempo_inicio_frenado') is not None else 5.0),
+        seed=opciones['seed'])
+    del resultados['historial']
+    return [resultados]
+
+
+def ejecutar_barrido(opciones: dict) -> list:
+    """Una fila por punto de la grilla de `Barrido`"""
+    from core.barrido import Barrido
+
+    inicio = opciones['semilla_inicial']
+    barrido = Barrido(seeds=range(inicio, inicio + opciones['semillas']), **_modelo(opciones))
+    filas = barrido.run(workers=opciones.get('workers'))
+    if opciones.get('salida'):
+        barrido.save(opciones['salida'], por_corrida=opciones.get('por_corrida', False))
+    return filas
+
+
+def ejecutar_distancias(opciones: dict) -> list:
+    """Barrido de la distancia de seguridad (opción 2 del menú)"""
+    return ejecutar_barrido(dict(opciones, distancia_seguridad=opciones['distancias']))
+
+
+def ejecutar_montecarlo(opciones: dict) -> list:
+    """Resumen estadístico de `MonteCarlo`; con `salida`, guarda las corridas"""
+    from core.montecarlo import MonteCarlo
+
+    mc = MonteCarlo(num_runs=opciones['corridas'], **_modelo(opciones))
+    mc.run(seed_start=opciones['semilla_inicial'], workers=opciones.get('workers'))
+    resumen = mc.summary_statistics()
+    if opciones.get('salida'):
+        resumen['archivo'] = mc.save(opciones['salida'])
+    return [resumen]
+
+
+def ejecutar_busqueda(opciones: dict) -> list:
+    """Distancia de seguridad crítica por bisección (`BusquedaDistanciaCritica`)"""
+    from core.busqueda import BusquedaDistanciaCritica
+
+    busqueda = BusquedaDistanciaCritica(
+        objetivo=opciones['objetivo'], distancia_min=opciones['distancia_min'],
+        distancia_max=opciones['distancia_max'], tolerancia=opciones['tolerancia'],
+        max_runs=opciones['max_corridas'], seed_start=opciones['semilla_inicial'],
+        **_modelo(opciones))
+    return [busqueda.buscar()]
+
+
+def ejecutar_red(opciones: dict) -> list:
+    """Corrida de un corredor de redondeles (`SimulacionRed`)"""
+    from models.red import Red
+    from core.simulacion_red import SimulacionRed
+
+    red = Red.corredor(
+        opciones['redondeles'], **_parametros(opciones, (
+            'longitud_enlace', 'flujo', 'flujo_transversal', 'fraccion_salida',
+            'radio', 'num_vehiculos')))
+    simulacion = SimulacionRed(red, procesos=opciones.get('procesos'),
+                               **_parametros(opciones, ('distancia_seguridad', 'dt')))
+    resultados = simulacion.ejecutar(
+        duracion=opciones['duracion'], tiempo_inicio_frenado=opciones['tiempo_inicio_frenado'],
+        redondel_problema=opciones['redondel_problema'], seed=opciones['seed'])
+    if not opciones.get('muestras'):
+        del resultados['muestras']
+    return [resultados]
+
+
+_EJECUTORES = {
+    'simple': ejecutar_simple,
+    'distancias': ejecutar_distancias,
+    'montecarlo': ejecutar_montecarlo,
+    'barrido': ejecutar_barrido,
+    'busqueda': ejecutar_busqueda,
+    'red': ejecutar_red,
+}
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m core.cli',
+        description='Simulación de tráfico en redondel (salida: una línea JSON por resultado)')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    simple = subparsers.add_parser('simple', help='Una corrida')
+    _agregar_modelo(simple)
+    simple.add_argument('--seed', type=int, default=42)
+
+    for nombre, ayuda in (('distancias', 'Barrido de la distancia de seguridad'),
+                          ('barrido', 'Grilla de parámetros')):
+        sub = subparsers.add_parser(nombre, help=ayuda)
+        if nombre == 'distancias':
+            _agregar_modelo(sub, excluir=('distancia_seguridad',))
+            sub.add_argument('--distancias', type=float, nargs='+', default=[3, 4, 5, 6, 7, 8])
+            sub.add_argument('--semillas', type=int, default=1)
+            sub.add_argument('--semilla-inicial', type=int, default=42)
+        else:
+            _agregar_modelo(sub, grilla=True)
+            sub.add_argument('--semillas', type=int, default=10,
+                             help='Corridas por punto (semillas consecutivas)')
+            sub.add_argument('--semilla-inicial', type=int, default=0)
+            sub.add_argument('--por-corrida', action='store_true',
+                             help='Guardar en --salida una fila por corrida')
+        sub.add_argument('--workers', type=int, default=None)
+        sub.add_argument('--salida', default=None)
+
+    montecarlo = subparsers.add_parser('montecarlo', help='Experimento Monte Carlo')
+    _agregar_modelo(montecarlo)
+    montecarlo.add_argument('--corridas', type=int, default=100)
+    montecarlo.add_argument('--semilla-inicial', type=int, default=0)
+    montecarlo.add_argument('--workers', type=int, default=None)
+    montecarlo.add_argument('--salida', default=None, help='Archivo csv o xlsx de corridas')
+
+    busqueda = subparsers.add_parser('busqueda', help='Distancia de seguridad crítica')
+    _agregar_modelo(busqueda, excluir=('distancia_seguridad',))
+    busqueda.add_argument('--objetivo', type=float, default=0.05)
+    busqueda.add_argument('--distancia-min', type=float, default=0.0)
+    busqueda.add_argument('--distancia-max', type=float, default=30.0)
+    busqueda.add_argument('--tolerancia', type=float, default=0.1)
+    busqueda.add_argument('--max-corridas', type=int, default=1000)
+    busqueda.add_argument('--semilla-inicial', type=int, default=0)
+
+    red = subparsers.add_parser('red', help='Corredor de redondeles repartido entre procesos')
+    for destino, opcion, tipo in _OPCIONES_MODELO:
+        if destino != 'tiempo_inicio_frenado':
+            red.add_argument(opcion, dest=destino, type=tipo, default=None)
+    red.add_argument('--inicio-frenado', dest='tiempo_inicio_frenado', type=float, default=5.0)
+    red.add_argument('--duracion', type=float, default=60.0)
+    red.add_argument('--redondeles', type=int, default=20)
+    red.add_argument('--longitud-enlace', type=float, default=None)
+    red.add_argument('--flujo', type=float, default=None, help='Vehículos/s que entran al corredor')
+    red.add_argument('--flujo-transversal', type=float, default=None)
+    red.add_argument('--fraccion-salida', type=float, default=None)
+    red.add_argument('--redondel-problema', type=int, default=0)
+    red.add_argument('--procesos', type=int, default=None)
+    red.add_argument('--seed', type=int, default=42)
+    red.add_argument('--muestras', action='store_true',
+                     help='Incluir las muestras por redondel (velocidad media, vehículos, frenadas)')
+
+    lote = subparsers.add_parser('lote', help='Ejecutar los trabajos de un archivo JSON')
+    lote.add_argument('archivo', help="Lista JSON o una línea JSON por trabajo ('-' = stdin)")
+    return parser
+
+
+def _a_json(valor):
+    """Valores NumPy (del motor vectorizado) como tipos de Python"""
+    if hasattr(valor, 'item'):
+        return valor.item()
+    if hasattr(valor, 'tolist'):
+        return valor.tolist()
+    raise TypeError(f'{type(valor).__name__} no es serializable')
+
+
+def _emitir(registro: dict, salida):
+    salida.write(json.dumps(registro, ensure_ascii=False, default=_a_json) + '\n')
+
+
+def leer_trabajos(ruta: str) -> list:
+    """
+    Lee un archivo de trabajos: una lista JSON o una línea JSON por trabajo
+
+    Returns:
+        list: Un diccionario por trabajo
+    """
+    if ruta == '-':
+        texto = sys.stdin.read()
+    else:
+        with open(ruta, encoding='utf-8') as f:
+            texto = f.read()
+    if texto.lstrip().startswith('['):
+        return json.loads(texto)
+    return [json.loads(linea) for linea in texto.splitlines() if linea.strip()]
+
+
+def opciones_trabajo(parser: argparse.ArgumentParser, trabajo: dict) -> dict:
+    """
+    Opciones de un trabajo del lote: los valores por defecto del comando,
+    reemplazados por los del trabajo
+
+    Raises:
+        ValueError: Si el comando o alguna opción no existen
+    """
+    trabajo = dict(trabajo)
+    comando = trabajo.pop('comando', None)
+    trabajo.pop('id', None)
+    if comando not in COMANDOS:
+        raise ValueError(f"Comando desconocido: {comando!r}")
+    opciones = vars(parser.parse_args([comando]))
+    desconocidas = sorted(set(trabajo) - set(opciones))
+    if desconocidas:
+        raise ValueError(f"Opciones desconocidas para {comando}: {', '.join(desconocidas)}")
+    opciones.update(trabajo)
+    return opciones
+
+
+def ejecutar_lote(parser: argparse.ArgumentParser, ruta: str, salida) -> int:
+    """
+    Ejecuta los trabajos de `ruta` en orden, emitiendo cada resultado con el
+    índice del trabajo (y su `id`, si lo tiene)
+
+    Returns:
+        int: Cantidad de trabajos que fallaron
+    """
+    fallidos = 0
+    for indice, trabajo in enumerate(leer_trabajos(ruta)):
+        etiqueta = {'trabajo': indice}
+        if isinstance(trabajo, dict) and 'id' in trabajo:
+            etiqueta['id'] = trabajo['id']
+        try:
+            if not isinstance(trabajo, dict):
+                raise ValueError('Cada trabajo debe ser un objeto JSON')
+            opciones = opciones_trabajo(parser, trabajo)
+            registros = _EJECUTORES[opciones['comando']](opciones)
+        except Exception as e:
+            fallidos += 1
+            _emitir({**etiqueta, 'error': f'{type(e).__name__}: {e}'}, salida)
+            continue
+        for registro in registros:
+            _emitir({**etiqueta, 'comando': opciones['comando'], **registro}, salida)
+        salida.flush()
+    return fallidos
+
+
+def main(argv=None) -> int:
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    salida = sys.stdout
+
+    if args.comando == 'lote':
+        return 1 if ejecutar_lote(parser, args.archivo, salida) else 0
+
+    opciones = vars(args)
+    for registro in _EJECUTORES[args.comando](opciones):
+        _emitir({'comando': args.comando, **registro}, salida)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import math
+
+
+def valor_z(confianza: float) -> float:
+    """Cuantil normal bilateral para un nivel de confianza (0.95 -> 1.96)"""
+    if not 0 < confianza < 1:
+        raise ValueError('La confianza debe estar entre 0 y 1.')
+    # Importación diferida: `statistics` arrastra `decimal` y `fractions`
+    from statistics import NormalDist
+    return NormalDist().inv_cdf((1 + confianza) / 2)
+
+
+def intervalo_wilson(exitos: int, total: int, confianza: float = 0.95):
+    """
+    Intervalo de Wilson para una proporción. A diferencia del intervalo
+    normal, sigue siendo válido con proporciones cercanas a 0 o 1.
+
+    Args:
+        exitos: número de casos favorables.
+        total: número de ensayos.
+        confianza: nivel de confianza del intervalo.
+
+    Returns:
+        tuple: (límite inferior, límite superior); (0, 1) si no hay ensayos.
+    """
+    if total == 0:
+        return 0.0, 1.0
+    z = valor_z(confianza)
+    p = exitos / total
+    denominador = 1 + z * z / total
+    centro = (p + z * z / (2 * total)) / denominador
+    margen = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominador
+    return max(0.0, centro - margen), min(1.0, centro + margen)
+
+
+class EstadisticaEnLinea:
+    """
+    Media y varianza acumuladas valor a valor (algoritmo de Welford), en
+    memoria constante y numéricamente estable.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0  # suma de cuadrados de las desviaciones
+
+    def agregar(self, valor: float):
+        """Incorpora un valor"""
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+
+    def varianza(self, ddof: int = 0) -> float:
+        """Varianza poblacional (ddof=0) o muestral (ddof=1)"""
+        if self.n <= ddof:
+            return 0.0
+        return self._m2 / (self.n - ddof)
+
+    def desviacion(self, ddof: int = 0) -> float:
+        return math.sqrt(self.varianza(ddof))
+
+    def intervalo_media(self, confianza: float = 0.95):
+        """
+        Intervalo de confianza normal para la media
+
+        Returns:
+            tuple: (límite inferior, límite superior)
+        """
+        if self.n < 2:
+            return -math.inf, math.inf
+        margen = valor_z(confianza) * self.desviacion(ddof=1) / math.sqrt(self.n)
+        return self.media - margen, self.media + margen
+
+
+class ResumenEnLinea:
+    """
+    Estadísticas de las corridas de un experimento actualizadas a medida que
+    terminan: proporción de corridas con colisión (con intervalo de Wilson) y
+    media/desviación de vehículos afectados (Welford). Produce las mismas
+    claves que `resumir_corridas` más los intervalos de confianza.
+    """
+
+    def __init__(self, confianza: float = 0.95):
+        self.confianza = confianza
+        self.colisiones = 0
+        self.afectados = EstadisticaEnLinea()
+
+    @property
+    def n(self) -> int:
+        return self.afectados.n
+
+    def agregar(self, resumen: dict):
+        """Incorpora el resumen de una corrida (como el de `MonteCarlo._run_single`)"""
+        if resumen.get('hubo_colisiones'):
+            self.colisiones += 1
+        self.afectados.agregar(resumen.get('vehiculos_afectados', 0))
+
+    def intervalo_colisiones(self):
+        return intervalo_wilson(self.colisiones, self.n, self.confianza)
+
+    def intervalo_afectados(self):
+        return self.afectados.intervalo_media(self.confianza)
+
+    def precision_alcanzada(self, tolerancia: float, tolerancia_afectados=None) -> bool:
+        """
+        Indica si la semiamplitud del intervalo de la fracción de colisiones
+        (y, si se indica, la de la media de afectados) ya es menor o igual a
+        la tolerancia pedida
+        """
+        if self.n < 2:
+            return False
+        inferior, superior = self.intervalo_colisiones()
+        if (superior - inferior) / 2 > tolerancia:
+            return False
+        if tolerancia_afectados is not None:
+            inferior, superior = self.intervalo_afectados()
+            if (superior - inferior) / 2 > tolerancia_afectados:
+                return False
+        return True
+
+    def resultado(self) -> dict:
+        if not self.n:
+            return {}
+        return {
+            'num_corridas': self.n,
+            'colisiones_total': self.colisiones,
+            'colisiones_frac': self.colisiones / self.n,
+            'vehiculos_afectados_mean': self.afectados.media,
+            'vehiculos_afectados_std': self.afectados.desviacion(),
+            'colisiones_ic': self.intervalo_colisiones(),
+            'vehiculos_afectados_ic': self.intervalo_afectados(),
+            'confianza': self.confianza
+        }
@@ -0,0 +1,213 @@
+import os
+import csv
+import glob
+import tempfile
+import importlib
+from typing import Optional
+
+FORMATO_CSV = 'csv'
+FORMATO_PARQUET = 'parquet'
+FORMATOS = (FORMATO_CSV, FORMATO_PARQUET)
+
+# Parámetros que definen la partición (una carpeta por combinación)
+CLAVES_PARTICION = ('distancia_seguridad', 'num_vehiculos', 'radio', 'dt',
+                    'tiempo_inicio_frenado')
+
+# Límite de filas de una hoja de Excel (incluye el encabezado)
+MAX_FILAS_EXCEL = 1048576
+
+_opcionales = {}
+
+
+def importar_opcional(nombre: str):
+    """
+    Importa una dependencia opcional (`pandas`, `pyarrow`...) recién cuando
+    se usa: importarla junto con el módulo retrasaría el arranque de cada
+    proceso, aunque nunca exporte nada.
+
+    Returns:
+        El módulo, o None si no está instalado.
+    """
+    if nombre not in _opcionales:
+        try:
+            _opcionales[nombre] = importlib.import_module(nombre)
+        except Exception:
+            _opcionales[nombre] = None
+    return _opcionales[nombre]
+
+
+def particion_de(parametros: dict) -> dict:
+    """Extrae de `parametros` las claves de `CLAVES_PARTICION` presentes"""
+    return {clave: parametros[clave] for clave in CLAVES_PARTICION if clave in parametros}
+
+
+def _carpeta_particion(particion: dict) -> str:
+    """Ruta relativa de una partición al estilo `clave=valor/clave=valor`"""
+    return os.path.join(*(f'{clave}={valor}' for clave, valor in particion.items())) if particion else ''
+
+
+class SumideroCorridas:
+    """
+    Exporta filas de resultados a disco a medida que se producen.
+
+    Las filas se acumulan en memoria hasta `filas_por_bloque` y luego se
+    vuelcan a la carpeta de su partición (`distancia_seguridad=5.0/...`):
+    en CSV se agregan a `corridas.csv`; en Parquet cada volcado escribe un
+    archivo `parte-NNNNN.parquet` nuevo de forma atómica. Lo ya volcado
+    sobrevive a una interrupción y la memoria usada no depende del número
+    de corridas. Cada fila incluye sus parámetros de partición, por lo que
+    los archivos son autocontenidos.
+
+    Parquet requiere `pyarrow`.
+    """
+
+    def __init__(self, directorio: str, formato: str = FORMATO_CSV, filas_por_bloque: int = 10000):
+        """
+        Args:
+            directorio: carpeta raíz de la exportación (se crea si no existe).
+            formato: `csv` o `parquet`.
+            filas_por_bloque: filas acumuladas antes de escribir a disco.
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato!r}. Opciones: {', '.join(FORMATOS)}")
+        if formato == FORMATO_PARQUET and importar_opcional('pyarrow.parquet') is None:
+            raise ImportError('La exportación a Parquet requiere `pyarrow`.')
+
+        self.directorio = directorio
+        self.formato = formato
+        self.filas_por_bloque = max(1, int(filas_por_bloque))
+        self.filas_escritas = 0
+
+        self._pendientes = {}  # carpeta de partición -> filas sin volcar
+        self._num_pendientes = 0
+        self._partes = {}  # carpeta de partición -> número de la siguiente parte (Parquet)
+        self._encabezados = {}  # archivo CSV -> columnas de su encabezado
+
+        os.makedirs(directorio, exist_ok=True)
+
+    def agregar(self, fila: dict, particion: Optional[dict] = None):
+        """
+        Agrega una fila
+
+        Args:
+            fila: valores de la fila (por ejemplo, el resumen de una corrida).
+            particion: parámetros que eligen la carpeta de destino; se
+                incluyen también como columnas de la fila.
+        """
+        particion = particion or {}
+        carpeta = _carpeta_particion(particion)
+        self._pendientes.setdefault(carpeta, []).append(dict(particion, **fila))
+        self._num_pendientes += 1
+        if self._num_pendientes >= self.filas_por_bloque:
+            self.volcar()
+
+    def volcar(self):
+        """Escribe en disco todas las filas pendientes"""
+        for carpeta, filas in self._pendientes.items():
+            ruta = os.path.join(self.directorio, carpeta)
+            os.makedirs(ruta, exist_ok=True)
+            if self.formato == FORMATO_CSV:
+                self._escribir_csv(ruta, filas)
+            else:
+                self._escribir_parquet(carpeta, ruta, filas)
+            self.filas_escritas += len(filas)
+        self._pendientes = {}
+        self._num_pendientes = 0
+
+    def _escribir_csv(self, ruta: str, filas: list):
+        """
+        Agrega `filas` al CSV de la partición. Las columnas son las del
+        encabezado ya escrito (al reanudar, las del archivo existente); una
+        fila sin alguna queda vacía en ella, y una columna que no está en el
+        encabezado es un error
+        """
+        archivo = os.path.join(ruta, 'corridas.csv')
+        nuevo = not os.path.exists(archivo) or os.path.getsize(archivo) == 0
+        if nuevo:
+            columnas = list(dict.fromkeys(k for fila in filas for k in fila))
+        else:
+            columnas = self._encabezados.get(archivo)
+            if columnas is None:
+                with open(archivo, newline='', encoding='utf-8') as f:
+                    columnas = next(csv.reader(f))
+        nuevas = [k for k in dict.fromkeys(k for fila in filas for k in fila) if k not in columnas]
+        if nuevas:
+            raise ValueError(f"Columnas que no están en el encabezado de {archivo}: "
+                             f"{', '.join(nuevas)}. Exporte a otra carpeta.")
+        self._encabezados[archivo] = columnas
+        with open(archivo, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columnas)
+            if nuevo:
+                writer.writeheader()
+            writer.writerows(filas)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _escribir_parquet(self, carpeta: str, ruta: str, filas: list):
+        if carpeta not in self._partes:
+            # Continuar la numeración si la partición ya tenía partes (reanudación)
+            self._partes[carpeta] = len(glob.glob(os.path.join(ruta, 'parte-*.parquet')))
+        archivo = os.path.join(ruta, f'parte-{self._partes[carpeta]:05d}.parquet')
+        fd, temporal = tempfile.mkstemp(dir=ruta, suffix='.tmp')
+        os.close(fd)
+        pa = importar_opcional('pyarrow')
+        importar_opcional('pyarrow.parquet').write_table(pa.Table.from_pylist(filas), temporal)
+        os.replace(temporal, archivo)
+        self._partes[carpeta] += 1
+
+    def cerrar(self):
+        """Vuelca las filas pendientes"""
+        self.volcar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def archivos_exportados(directorio: str) -> list:
+    """Archivos de datos de una exportación, en orden de partición y parte"""
+    archivos = glob.glob(os.path.join(directorio, '**', 'corridas.csv'), recursive=True)
+    archivos += glob.glob(os.path.join(directorio, '**', 'parte-*.parquet'), recursive=True)
+    return sorted(archivos)
+
+
+def leer_corridas(directorio: str):
+    """
+    Lee todas las filas de una exportación de `SumideroCorridas`.
+
+    Returns:
+        pandas.DataFrame: todas las particiones concatenadas, o None si
+        `pandas` no está instalado.
+    """
+    pd = importar_opcional('pandas')
+    if pd is None:
+        return None
+    tablas = []
+    for archivo in archivos_exportados(directorio):
+        if archivo.endswith('.csv'):
+            tablas.append(pd.read_csv(archivo))
+        else:
+            tablas.append(pd.read_parquet(archivo))
+    if not tablas:
+        return pd.DataFrame()
+    return pd.concat(tablas, ignore_index=True)
+
+
+def exportar_excel(directorio: str, filepath: str) -> str:
+    """
+    Genera un Excel a partir de una exportación de `SumideroCorridas`.
+    Paso final opcional: requiere `pandas` + `openpyxl` y que el total de
+    filas quepa en una hoja.
+
+    Returns:
+        str: ruta del archivo escrito.
+    """
+    if importar_opcional('pandas') is None:
+        raise ImportError('La exportación a Excel requiere `pandas`.')
+    df = leer_corridas(directorio)
+    if len(df) + 1 > MAX_FILAS_EXCEL:
+        raise ValueError(f'{len(df)} filas no caben en una hoja de Excel; use CSV o Parquet.')
+    df.to_excel(filepath, index=False)
+    return filepath
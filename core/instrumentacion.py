@@ -0,0 +1,124 @@
+import json
+from time import perf_counter
+from contextlib import contextmanager
+
+
+class Instrumentacion:
+    """
+    Temporizadores por fase y contadores de una simulación.
+
+    Se conecta con `Simulacion(..., instrumentacion=Instrumentacion())`; sin
+    ella, la simulación y el redondel solo pagan una comparación con None
+    por fase. Las fases medidas son `paso` (un paso completo) y, dentro de
+    él, `fisica` (reglas de todos los vehículos), `orden` (reordenamiento
+    por ángulo), `estados`/`colisiones`/`registro` (historial) y
+    `trayectoria`; además `equilibrio` (criterio de corte). Los contadores
+    incluyen `pasos`, `reacciones` (vehículos que frenan por el de adelante,
+    cada una inicia un tiempo de reacción), `pasos_frenado_problema`,
+    `rotaciones` y `ordenamientos` del reordenamiento, `registros` y
+    `estados_creados` (diccionarios de estado creados para el historial).
+
+    Con `trazar=True` se guarda además cada intervalo medido, exportable
+    con `exportar_traza` al formato de trazas de Chrome (chrome://tracing,
+    Perfetto).
+    """
+
+    def __init__(self, trazar=False, max_eventos=1000000):
+        """
+        Args:
+            trazar (bool): Guardar cada intervalo para `exportar_traza`
+            max_eventos (int): Máximo de intervalos guardados (acota la memoria)
+        """
+        self.trazar = trazar
+        self.max_eventos = int(max_eventos)
+        self.tiempos = {}  # fase -> segundos acumulados
+        self.llamadas = {}  # fase -> veces medida
+        self.contadores = {}
+        self.eventos = []  # (fase, inicio, fin) en segundos de perf_counter
+        self.corridas = 0  # corridas acumuladas con `acumular`
+        self._origen = perf_counter()
+
+    def registrar(self, fase, inicio, fin):
+        """
+        Acumula un intervalo medido con `time.perf_counter`
+
+        Args:
+            fase (str): Nombre de la fase
+            inicio (float): Instante inicial
+            fin (float): Instante final
+        """
+        self.tiempos[fase] = self.tiempos.get(fase, 0.0) + (fin - inicio)
+        self.llamadas[fase] = self.llamadas.get(fase, 0) + 1
+        if self.trazar and len(self.eventos) < self.max_eventos:
+            self.eventos.append((fase, inicio, fin))
+
+    @contextmanager
+    def medir(self, fase):
+        """Mide el bloque `with` como un intervalo de `fase`"""
+        inicio = perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(fase, inicio, perf_counter())
+
+    def contar(self, nombre, cantidad=1):
+        """Suma `cantidad` al contador `nombre`"""
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def resumen(self):
+        """
+        Obtiene los totales medidos
+
+        Returns:
+            dict: `fases` (segundos, llamadas y microsegundos por llamada de
+            cada fase), `contadores` y `corridas`
+        """
+        return {
+            'fases': {
+                fase: {
+                    'segundos': segundos,
+                    'llamadas': self.llamadas[fase],
+                    'us_por_llamada': 1e6 * segundos / self.llamadas[fase]
+                }
+                for fase, segundos in self.tiempos.items()
+            },
+            'contadores': dict(self.contadores),
+            'corridas': self.corridas
+        }
+
+    def acumular(self, resumen):
+        """
+        Suma el resumen de otra instrumentación (por ejemplo, de una corrida
+        ejecutada en otro proceso)
+
+        Args:
+            resumen (dict): Resultado de `Instrumentacion.resumen`
+        """
+        for fase, datos in resumen['fases'].items():
+            self.tiempos[fase] = self.tiempos.get(fase, 0.0) + datos['segundos']
+            self.llamadas[fase] = self.llamadas.get(fase, 0) + datos['llamadas']
+        for nombre, cantidad in resumen['contadores'].items():
+            self.contar(nombre, cantidad)
+        self.corridas += max(1, resumen.get('corridas', 0))
+
+    def exportar_traza(self, ruta, proceso='simulacion'):
+        """
+        Escribe los intervalos guardados en formato de trazas de Chrome
+
+        Args:
+            ruta (str): Archivo JSON de salida
+            proceso (str): Nombre del proceso mostrado en el visor
+
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        eventos = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 1,
+                    'args': {'name': proceso}}]
+        eventos += [
+            {'name': fase, 'ph': 'X', 'pid': 1, 'tid': 1,
+             'ts': (inicio - self._origen) * 1e6, 'dur': (fin - inicio) * 1e6}
+            for fase, inicio, fin in self.eventos
+        ]
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': eventos, 'otherData': {'contadores': self.contadores}}, f)
+        return ruta
@@ -1,14 +1,88 @@
 import os
+import json
 import math
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-try:
-    import pandas as pd
-except Exception:
-    pd = None
+from core.simulacion import Simulacion, INTEGRADORES, contar_pasos
+from core.estadisticas import ResumenEnLinea
+from core.instrumentacion import Instrumentacion
+from core.exportacion import importar_opcional, particion_de
+from models.conductores import PoblacionConductores
+from core.muestreo import MUESTREO_INDEPENDIENTE, MODOS_MUESTREO, disenar, estimar
+from core.simetria import (
+    SIMETRIA_NINGUNA, SIMETRIA_EXACTA, SIMETRIA_ROTACION, MODOS_SIMETRIA,
+    agrupar_semillas, diferencias, expandir, vehiculo_problema_de
+)
+from utils.constantes import (
+    DISTANCIA_SEGURIDAD, RADIO_REDONDEL, NUMERO_VEHICULOS, DT, MOTOR_OBJETOS,
+    REGISTRO_NINGUNO, INTEGRADOR_FIJO, PASO_MAXIMO
+)
 
-from core.simulacion import Simulacion
-from utils.constantes import DISTANCIA_SEGURIDAD, RADIO_REDONDEL, NUMERO_VEHICULOS, DT
+# Corridas entre evaluaciones del criterio de `run_adaptive` (el mismo en
+# serie y en paralelo, así el punto de corte no depende de `workers`)
+LOTE_ADAPTATIVO = 16
+
+
+def resumir_corridas(runs: List[dict]):
+    """
+    Estadísticas básicas de una lista de corridas (sin depender de `pandas`).
+
+    Retorna un diccionario con conteo de colisiones, promedio y desviación de
+    vehículos afectados.
+    """
+    total = len(runs)
+    if not total:
+        return {}
+    colisiones = sum(1 for r in runs if r.get('hubo_colisiones'))
+    affected = [r.get('vehiculos_afectados', 0) for r in runs]
+    mean_aff = sum(affected) / total
+    var = sum((x - mean_aff) ** 2 for x in affected) / total
+    return {
+        'num_corridas': total,
+        'colisiones_total': colisiones,
+        'colisiones_frac': colisiones / total,
+        'vehiculos_afectados_mean': mean_aff,
+        'vehiculos_afectados_std': math.sqrt(var)
+    }
+
+
+def guardar_filas(filas: List[dict], filepath: str):
+    """
+    Guarda una lista de filas (dicts con las mismas claves) en `filepath`. Si
+    la extensión es `.xlsx` intentará usar Excel vía `pandas`. Si `pandas` no
+    está disponible o la extensión no es xlsx, guardará CSV como respaldo.
+
+    Returns:
+        str: ruta del archivo escrito.
+    """
+    root, ext = os.path.splitext(filepath)
+    ext = ext.lower()
+
+    # CSV no necesita `pandas`: solo se importa para Excel
+    pd = importar_opcional('pandas') if ext == '.xlsx' else None
+    if pd is not None:
+        try:
+            df = pd.DataFrame(filas)
+            df.to_excel(filepath, index=False)
+            return filepath
+        except Exception as e:
+            # fallback a csv
+            csv_path = root + '.csv'
+            try:
+                df.to_csv(csv_path, index=False)
+                return csv_path
+            except Exception:
+                raise
+    else:
+        # CSV fallback: columnas de todas las filas, en orden de aparición
+        import csv
+        csv_path = root + '.csv'
+        keys = list(dict.fromkeys(k for fila in filas for k in fila))
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=keys)
+            writer.writeheader()
+            writer.writerows(filas)
+        return csv_path
 
 
 class MonteCarlo:
@@ -27,7 +101,26 @@ class MonteCarlo:
                 duracion: float = 30.0,
                 tiempo_inicio_frenado: float = 5.0,
                 distancia_seguridad: float = None,
-                dt: float = None):
+                dt: float = None,
+                motor: str = MOTOR_OBJETOS,
+                registro: str = REGISTRO_NINGUNO,
+                detener_en_equilibrio: bool = False,
+                saltar_reposo: bool = True,
+                compartir_prefijo: bool = True,
+                simetria: str = SIMETRIA_EXACTA,
+                muestreo: str = MUESTREO_INDEPENDIENTE,
+                propuesta: Optional[List[float]] = None,
+                poblacion=None,
+                integrador: str = INTEGRADOR_FIJO,
+                paso_maximo: float = PASO_MAXIMO,
+                cache=None,
+                instrumentar: bool = False):
+        if simetria not in MODOS_SIMETRIA:
+            raise ValueError(f"Modo de simetría desconocido: {simetria!r}")
+        if muestreo not in MODOS_MUESTREO:
+            raise ValueError(f"Modo de muestreo desconocido: {muestreo!r}")
+        if integrador not in INTEGRADORES:
+            raise ValueError(f"Integrador desconocido: {integrador!r}")
         self.num_runs = int(num_runs)
         self.num_vehiculos = num_vehiculos if num_vehiculos is not None else NUMERO_VEHICULOS
         self.radio = radio if radio is not None else RADIO_REDONDEL
@@ -35,19 +128,87 @@ class MonteCarlo:
         self.tiempo_inicio_frenado = tiempo_inicio_frenado
         self.distancia_seguridad = distancia_seguridad if distancia_seguridad is not None else DISTANCIA_SEGURIDAD
         self.dt = dt if dt is not None else DT
+        self.motor = motor
+        self.registro = registro  # el historial se descarta: por defecto no se registra
+        # Opcional: cortar cada corrida al volver a régimen estable no altera
+        # el resultado y ahorra los pasos restantes
+        self.detener_en_equilibrio = detener_en_equilibrio
+        # Tampoco saltar de una vez los tramos en reposo (p. ej. antes del frenado)
+        self.saltar_reposo = saltar_reposo
+        # Simular una sola vez el tramo previo al frenado, común a todas las corridas
+        self.compartir_prefijo = compartir_prefijo
+        self._prefijo = None
+        # Simular un representante por clase de corridas equivalentes (ver core/simetria.py)
+        self.simetria = simetria
+        self._clases = {}  # (parámetros, clase) -> resumen del representante
+        # Estrategia de reducción de varianza (ver core/muestreo.py) y, con
+        # `importancia`, probabilidad de elegir cada vehículo problema
+        self.muestreo = muestreo
+        self.propuesta = propuesta
+        # Conductores heterogéneos (ver models/conductores.py): cada semilla
+        # sortea su propia población
+        self.poblacion = PoblacionConductores.desde_dict(poblacion)
+        # Integrador de cada corrida (ver `Simulacion`); el adaptativo cambia
+        # los resultados, así que forma parte de `parametros_corrida`
+        self.integrador = integrador
+        self.paso_maximo = paso_maximo
+        self.cache = cache  # CacheResultados opcional: solo se simulan las corridas que falten
+        # Tiempos por fase y contadores sumados sobre las corridas simuladas
+        self.instrumentacion = Instrumentacion() if instrumentar else None
 
         self._runs = []  # lista de dicts con resultados por corrida
 
-    def _run_single(self, seed: int):
-        sim = Simulacion(num_vehiculos=self.num_vehiculos,
-                         radio=self.radio,
-                         distancia_seguridad=self.distancia_seguridad,
-                         dt=self.dt)
+    def _estado_prefijo(self):
+        """
+        Estado de la simulación justo antes del frenado. Hasta ese instante
+        todas las corridas son idénticas (el vehículo problema aún no influye),
+        así que se calcula una vez y cada corrida parte de una copia.
+        Solo sin historial: con él, los registros del tramo incluirían la
+        marca del vehículo problema de cada corrida. Tampoco con conductores
+        heterogéneos, que difieren entre corridas desde el comienzo.
+        """
+        if not self.compartir_prefijo or self.registro != REGISTRO_NINGUNO:
+            return None
+        if self._heterogenea():
+            return None
+        if self._prefijo is None:
+            sim = Simulacion(num_vehiculos=self.num_vehiculos,
+                             radio=self.radio,
+                             distancia_seguridad=self.distancia_seguridad,
+                             dt=self.dt,
+                             motor=self.motor,
+                             registro=self.registro,
+                             poblacion=self.poblacion,
+                             integrador=self.integrador,
+                             paso_maximo=self.paso_maximo)
+            sim.asignar_conductores()
+            sim.avanzar_hasta(min(self.duracion, self.tiempo_inicio_frenado),
+                              saltar_reposo=self.saltar_reposo)
+            self._prefijo = sim.guardar_estado()
+        return self._prefijo
+
+    def _run_single(self, seed: int, instrumentacion: Optional[Instrumentacion] = None):
+        prefijo = self._estado_prefijo()
+        if prefijo is not None:
+            sim = Simulacion.desde_estado(prefijo, instrumentacion=instrumentacion)
+        else:
+            sim = Simulacion(num_vehiculos=self.num_vehiculos,
+                             radio=self.radio,
+                             distancia_seguridad=self.distancia_seguridad,
+                             dt=self.dt,
+                             motor=self.motor,
+                             registro=self.registro,
+                             instrumentacion=instrumentacion,
+                             poblacion=self.poblacion,
+                             integrador=self.integrador,
+                             paso_maximo=self.paso_maximo)
 
         # Ejecutar completa con la semilla
         resultado = sim.ejecutar_completa(duracion=self.duracion,
                                           tiempo_inicio_frenado=self.tiempo_inicio_frenado,
-                                          seed=seed)
+                                          seed=seed,
+                                          detener_en_equilibrio=self.detener_en_equilibrio,
+                                          saltar_reposo=self.saltar_reposo)
 
         # Construir resumen de la corrida
         resumen = {
@@ -62,29 +223,405 @@ class MonteCarlo:
 
         return resumen
 
-    def run(self, seed_start: int = 0, seeds: Optional[List[int]] = None):
+    def _heterogenea(self) -> bool:
+        """True si los conductores se sortean y difieren entre corridas"""
+        return self.poblacion is not None and not self.poblacion.homogenea
+
+    def _modo_simetria(self) -> str:
+        """
+        Modo de deduplicación aplicable: con conductores heterogéneos cada
+        semilla tiene su propia población y ninguna corrida equivale a otra
+        """
+        return SIMETRIA_NINGUNA if self._heterogenea() else self.simetria
+
+    def _run_instrumentado(self, seed: int):
+        """
+        Ejecuta una corrida instrumentada
+
+        Returns:
+            tuple: (resumen de la corrida, `Instrumentacion.resumen()` de la corrida)
+        """
+        instrumentacion = Instrumentacion()
+        resumen = self._run_single(seed, instrumentacion)
+        return resumen, instrumentacion.resumen()
+
+    def parametros_corrida(self):
+        """
+        Entradas que determinan el resultado de una corrida (además de la
+        semilla); identifican la corrida en la caché. El motor, el registro y
+        el corte en equilibrio no cambian el resultado y no se incluyen.
+        La población de conductores solo se incluye si se indicó, y el
+        integrador solo si no es el de paso fijo.
+        """
+        parametros = {
+            'num_vehiculos': int(self.num_vehiculos),
+            'radio': float(self.radio),
+            'distancia_seguridad': float(self.distancia_seguridad),
+            'dt': float(self.dt),
+            'duracion': float(self.duracion),
+            'tiempo_inicio_frenado': float(self.tiempo_inicio_frenado)
+        }
+        if self.poblacion is not None:
+            parametros['poblacion'] = self.poblacion.describir()
+        if self.integrador != INTEGRADOR_FIJO:
+            parametros['integrador'] = self.integrador
+            parametros['paso_maximo'] = float(self.paso_maximo)
+        return parametros
+
+    def run(self, seed_start: int = 0, seeds: Optional[List[int]] = None,
+            workers: Optional[int] = None, chunksize: Optional[int] = None,
+            sumidero=None):
         """
         Ejecuta el experimento Monte Carlo.
 
+        Cada corrida usa su propio generador derivado de su semilla, por lo que
+        los resultados son idénticos sin importar `workers` ni el orden en que
+        terminen las corridas, y siempre se devuelven en el orden de las semillas.
+
+        Con un `muestreo` distinto de `independiente` las semillas las elige
+        el diseño (`core.muestreo.disenar`) y cada corrida lleva además su
+        `peso` y su `grupo` (estrato o par).
+
         Args:
             seed_start: semilla inicial (si `seeds` es None se usan `range(seed_start, seed_start+num_runs)`).
-            seeds: lista opcional de semillas a usar (ignora `seed_start` si provista).
+            seeds: lista opcional de semillas a usar (ignora `seed_start` si provista;
+                solo con muestreo independiente).
+            workers: número de procesos; None o 1 ejecuta en serie en este proceso.
+            chunksize: corridas enviadas a cada proceso por tarea (por defecto
+                se reparten en unos 4 bloques por proceso).
+            sumidero: `SumideroCorridas` opcional que recibe cada corrida en
+                cuanto termina (exportación incremental).
         """
         self._runs = []
 
+        seeds_to_use, diseno = self._semillas(seed_start, seeds)
+
+        if workers is None or workers <= 1:
+            self._runs = self._ejecutar(seeds_to_use, sumidero=sumidero, diseno=diseno)
+        else:
+            if chunksize is None:
+                chunksize = max(1, len(seeds_to_use) // (workers * 4))
+            # Importación diferida: el pool de procesos solo hace falta en paralelo
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self._runs = self._ejecutar(seeds_to_use, pool, chunksize, sumidero, diseno)
+
+        return self._runs
+
+    def _semillas(self, seed_start: int = 0, seeds: Optional[List[int]] = None):
+        """
+        Semillas del experimento y, con un `muestreo` distinto de
+        `independiente`, el `peso` y el `grupo` de cada una según el diseño
+        (`core.muestreo.disenar`).
+
+        Returns:
+            tuple: (lista de semillas, dict semilla -> {'peso', 'grupo'} o None)
+        """
+        if self.muestreo != MUESTREO_INDEPENDIENTE:
+            if seeds is not None:
+                raise ValueError('Con muestreo distinto de independiente las semillas las elige el diseño.')
+            diseno = disenar(self.muestreo, self.num_runs, self.num_vehiculos, seed_start,
+                             self.propuesta)
+            # Las semillas de un diseño no se repiten: cada una lleva su peso y grupo
+            return ([d['seed'] for d in diseno],
+                    {d['seed']: {'peso': d['peso'], 'grupo': d['grupo']} for d in diseno})
         if seeds is None:
-            seeds_to_use = list(range(seed_start, seed_start + self.num_runs))
+            return list(range(seed_start, seed_start + self.num_runs)), None
+        return [int(s) for s in seeds], None
+
+    def _ejecutar(self, seeds: List[int], pool=None, chunksize: int = 1,
+                  sumidero=None, diseno: Optional[Dict[int, dict]] = None) -> List[dict]:
+        """
+        Resultados de `seeds` en orden: toma de la caché los que existan y
+        simula el resto, en este proceso o en `pool`. Si se indica `sumidero`
+        (un `SumideroCorridas`), cada resultado se le entrega en cuanto está
+        disponible. `diseno` agrega a cada resultado, también a los que
+        recibe el sumidero, el `peso` y el `grupo` de su semilla (la caché y
+        las clases de simetría guardan las filas sin ellos).
+        """
+        def con_diseno(fila, s):
+            return fila if diseno is None else {**fila, **diseno[s]}
+
+        guardados = {}
+        parametros = self.parametros_corrida()
+        if self.cache is not None:
+            for s in seeds:
+                if s not in guardados:
+                    guardados[s] = self.cache.obtener(parametros, s)
+        pendientes = [s for s in dict.fromkeys(seeds) if guardados.get(s) is None]
+
+        # Solo se simula el representante de cada clase aún no conocida
+        firma = json.dumps(parametros, sort_keys=True)
+        modo = self._modo_simetria()
+        clases = agrupar_semillas(pendientes, self.num_vehiculos, modo)
+        grupos = {}  # semilla representante -> semillas de su clase
+        for clave, grupo in clases.items():
+            conocido = self._clases.get((firma, clave))
+            if conocido is None:
+                grupos[grupo[0]] = (clave, grupo)
+            else:
+                for s in grupo:
+                    guardados[s] = expandir(conocido, s, self.num_vehiculos)
+        representantes = list(grupos)
+
+        funcion = self._run_single if self.instrumentacion is None else self._run_instrumentado
+        if pool is None:
+            nuevos = map(funcion, representantes)
         else:
-            seeds_to_use = list(seeds)
+            # Calcular el prefijo aquí para enviarlo ya hecho a los procesos
+            if representantes:
+                self._estado_prefijo()
+            # `map` conserva el orden de entrada aunque los bloques terminen desordenados
+            nuevos = pool.map(funcion, representantes, chunksize=chunksize)
 
-        for s in seeds_to_use:
-            resumen = self._run_single(int(s))
-            self._runs.append(resumen)
+        if sumidero is not None:
+            particion = particion_de(parametros)
+            for s in dict.fromkeys(seeds):
+                if guardados.get(s) is not None:
+                    sumidero.agregar(con_diseno(guardados[s], s), particion)
 
-        return self._runs
+        for resumen in nuevos:
+            if self.instrumentacion is not None:
+                resumen, medicion = resumen
+                self.instrumentacion.acumular(medicion)
+            clave, grupo = grupos[resumen['seed']]
+            if modo != SIMETRIA_NINGUNA:
+                self._clases[(firma, clave)] = resumen
+            for s in grupo:
+                fila = expandir(resumen, s, self.num_vehiculos)
+                guardados[s] = fila
+                # Con rotación las filas expandidas son aproximadas: solo se guarda la simulada
+                if self.cache is not None and (modo != SIMETRIA_ROTACION
+                                               or s == resumen['seed']):
+                    self.cache.guardar(parametros, s, fila)
+                if sumidero is not None:
+                    sumidero.agregar(con_diseno(fila, s), particion)
+
+        return [dict(con_diseno(guardados[s], s)) for s in seeds]
+
+    def verificar_simetria(self, seed_start: int = 0, seeds: Optional[List[int]] = None,
+                           workers: Optional[int] = None):
+        """
+        Comprueba la deduplicación contra la fuerza bruta: ejecuta las mismas
+        semillas con el modo `simetria` actual y con `SIMETRIA_NINGUNA`, sin
+        caché ni resultados previos, y compara corrida a corrida. Los
+        resultados de `run()` anteriores se conservan.
+
+        Args:
+            seed_start: semilla inicial (si `seeds` es None se usan `range(seed_start, seed_start+num_runs)`).
+            seeds: lista opcional de semillas a usar (ignora `seed_start` si provista).
+            workers: número de procesos; None o 1 ejecuta en serie.
+
+        Returns:
+            dict: `exacta` (True si todas coinciden), `corridas`, `simuladas`
+            (corridas simuladas con deduplicación) y `diferencias` (ver
+            `core.simetria.diferencias`).
+        """
+        if seeds is None:
+            seeds = list(range(seed_start, seed_start + self.num_runs))
+        guardado = (self.simetria, self.muestreo, self.cache, self._clases, self._runs)
+        try:
+            self.muestreo = MUESTREO_INDEPENDIENTE
+            self.cache = None
+            self._clases = {}
+            deduplicadas = self.run(seeds=seeds, workers=workers)
+            simuladas = len(self._clases) or len(set(seeds))
+            self.simetria = SIMETRIA_NINGUNA
+            fuerza_bruta = self.run(seeds=seeds, workers=workers)
+        finally:
+            self.simetria, self.muestreo, self.cache, self._clases, self._runs = guardado
+
+        distintas = diferencias(fuerza_bruta, deduplicadas)
+        return {
+            'exacta': not distintas,
+            'corridas': len(seeds),
+            'simuladas': simuladas,
+            'diferencias': distintas
+        }
+
+    def run_adaptive(self, tolerancia: float = 0.02, tolerancia_afectados: Optional[float] = None,
+                     confianza: float = 0.95, min_runs: int = 30, max_runs: int = 10000,
+                     seed_start: int = 0, lote: Optional[int] = None,
+                     workers: Optional[int] = None, guardar_corridas: bool = False,
+                     sumidero=None):
+        """
+        Ejecuta corridas hasta alcanzar la precisión pedida.
+
+        Las estadísticas se actualizan a medida que terminan las corridas
+        (ver `ResumenEnLinea`) y el experimento se detiene cuando la semiamplitud
+        del intervalo de Wilson de la fracción de colisiones es menor o igual a
+        `tolerancia` (y, si se indica, la del intervalo de la media de vehículos
+        afectados a `tolerancia_afectados`), o al llegar a `max_runs`. Las
+        semillas son consecutivas desde `seed_start` y el criterio se evalúa
+        cada `lote` corridas, así que el resultado es reproducible y no depende
+        de `workers`. Solo admite muestreo independiente: los diseños de
+        `core.muestreo` fijan de antemano el número de corridas.
+
+        Args:
+            tolerancia: semiamplitud objetivo para la fracción de colisiones.
+            tolerancia_afectados: semiamplitud objetivo para la media de
+                vehículos afectados (None = no se exige).
+            confianza: nivel de confianza de los intervalos.
+            min_runs: corridas mínimas antes de evaluar el criterio.
+            max_runs: máximo de corridas.
+            seed_start: primera semilla.
+            lote: corridas entre evaluaciones del criterio (por defecto
+                `LOTE_ADAPTATIVO`); con `workers` conviene un múltiplo del
+                número de procesos.
+            workers: número de procesos; None o 1 ejecuta en serie.
+            guardar_corridas: conservar cada corrida en `_runs` (por defecto
+                no se guardan y la memoria usada es constante).
+            sumidero: `SumideroCorridas` opcional que recibe cada corrida.
+
+        Returns:
+            dict: las claves de `summary_statistics` más `colisiones_ic`,
+            `vehiculos_afectados_ic`, `confianza` y `convergio`.
+        """
+        if self.muestreo != MUESTREO_INDEPENDIENTE:
+            raise ValueError('run_adaptive solo admite muestreo independiente.')
+        self._runs = []
+        paralelo = workers is not None and workers > 1
+        lote = max(1, int(lote if lote is not None else LOTE_ADAPTATIVO))
+
+        estadisticas = ResumenEnLinea(confianza)
+
+        pool = None
+        if paralelo:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            siguiente = seed_start
+            convergio = False
+            while estadisticas.n < max_runs:
+                seeds = list(range(siguiente, siguiente + min(lote, max_runs - estadisticas.n)))
+                siguiente += len(seeds)
+                for resumen in self._ejecutar(seeds, pool, max(1, len(seeds) // (workers or 1)),
+                                              sumidero):
+                    estadisticas.agregar(resumen)
+                    if guardar_corridas:
+                        self._runs.append(resumen)
+                if (estadisticas.n >= min_runs
+                        and estadisticas.precision_alcanzada(tolerancia, tolerancia_afectados)):
+                    convergio = True
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        resultado = estadisticas.resultado()
+        resultado['convergio'] = convergio
+        return resultado
+
+    def run_batched(self, seed_start: int = 0, seeds: Optional[List[int]] = None,
+                    batch_size: int = 10000):
+        """
+        Ejecuta el experimento avanzando muchas corridas a la vez.
+
+        Cada semilla es una fila de un `LoteRedondeles` con su propio
+        `vehiculo_problema`, elegido igual que en `Simulacion`, por lo que los
+        resultados coinciden con `run()`, también con un `muestreo` distinto de
+        `independiente`. Requiere NumPy.
+
+        Args:
+            seed_start: semilla inicial (si `seeds` es None se usan `range(seed_start, seed_start+num_runs)`).
+            seeds: lista opcional de semillas a usar (ignora `seed_start` si provista;
+                solo con muestreo independiente).
+            batch_size: máximo de corridas simultáneas (acota la memoria).
+
+        Returns:
+            dict: arreglos NumPy por columna (`seed`, `vehiculo_problema_id`,
+            `hubo_colisiones`, `vehiculos_afectados` y, con un diseño de
+            muestreo, `peso` y `grupo`), una posición por corrida.
+        """
+        import numpy as np
+        from models.redondel_vectorizado import LoteRedondeles
+
+        if self.integrador != INTEGRADOR_FIJO:
+            # Cada corrida elegiría su propio paso: las filas del lote se desfasarían
+            raise ValueError('run_batched solo admite el integrador de paso fijo.')
+        seeds_to_use, diseno = self._semillas(seed_start, seeds)
+
+        ids_problema = np.array([vehiculo_problema_de(s, self.num_vehiculos)
+                                 for s in seeds_to_use], dtype=np.int64)
+        colisiones = np.zeros(len(seeds_to_use), dtype=bool)
+        afectados = np.zeros(len(seeds_to_use), dtype=np.int64)
+
+        for inicio in range(0, len(seeds_to_use), batch_size):
+            fin = min(inicio + batch_size, len(seeds_to_use))
+            lote = LoteRedondeles(self.radio, self.num_vehiculos, fin - inicio)
+            if self.poblacion is not None:
+                # Una población por fila, sorteada con la semilla de la corrida
+                muestras = [self.poblacion.muestrear(self.num_vehiculos, s)
+                            for s in seeds_to_use[inicio:fin]]
+                lote.asignar_conductores({nombre: np.stack([m[nombre] for m in muestras])
+                                          for nombre in muestras[0]})
+            lote.marcar_problemas(ids_problema[inicio:fin])
+
+            # Posición en los resultados de cada fila que sigue activa
+            activas = np.arange(inicio, fin)
+
+            # Mismo bucle de tiempo que `Simulacion.ejecutar_completa`
+            tiempo_actual = 0.0
+            frenado_iniciado = False
+
+            # Hasta el frenado todas las corridas están en reposo: saltar ese tramo
+            # (salvo con velocidades distintas, que acercan a los vehículos)
+            if self.saltar_reposo and lote.filas_en_equilibrio().all():
+                pasos, tiempo_actual = contar_pasos(
+                    tiempo_actual, self.dt, min(self.duracion, self.tiempo_inicio_frenado))
+                lote.avanzar_en_reposo(self.dt, pasos)
+            while tiempo_actual < self.duracion and len(activas):
+                if not frenado_iniciado and tiempo_actual >= self.tiempo_inicio_frenado:
+                    lote.iniciar_frenado()
+                    frenado_iniciado = True
+                lote.actualizar(self.dt, self.distancia_seguridad)
+                tiempo_actual += self.dt
+
+                # Retirar las corridas cuyo resultado ya no puede cambiar
+                if frenado_iniciado:
+                    terminadas = lote.filas_en_equilibrio()
+                    if terminadas.any():
+                        colisiones[activas[terminadas]] = lote.colisiones_por_corrida()[terminadas]
+                        afectados[activas[terminadas]] = lote.afectados_por_corrida()[terminadas]
+                        lote.conservar_filas(~terminadas)
+                        activas = activas[~terminadas]
+
+            colisiones[activas] = lote.colisiones_por_corrida()
+            afectados[activas] = lote.afectados_por_corrida()
+
+        resultados = {
+            'seed': np.array(seeds_to_use, dtype=np.int64),
+            'vehiculo_problema_id': ids_problema,
+            'hubo_colisiones': colisiones,
+            'vehiculos_afectados': afectados
+        }
+
+        self._runs = [
+            {
+                'seed': seed,
+                'vehiculo_problema_id': vid,
+                'hubo_colisiones': col,
+                'vehiculos_afectados': afe,
+                'total_vehiculos': int(self.num_vehiculos),
+                'distancia_seguridad': float(self.distancia_seguridad),
+                'duracion': float(self.duracion)
+            }
+            for seed, vid, col, afe in zip(seeds_to_use, ids_problema.tolist(),
+                                           colisiones.tolist(), afectados.tolist())
+        ]
+
+        if diseno is not None:
+            for fila in self._runs:
+                fila.update(diseno[fila['seed']])
+            resultados['peso'] = np.array([diseno[s]['peso'] for s in seeds_to_use])
+            resultados['grupo'] = np.array([diseno[s]['grupo'] for s in seeds_to_use],
+                                           dtype=np.int64)
+
+        return resultados
 
     def to_dataframe(self):
         """Devuelve un `pandas.DataFrame` o None si `pandas` no está instalado."""
+        pd = importar_opcional('pandas')
         if pd is None:
             return None
         return pd.DataFrame(self._runs)
@@ -98,72 +635,23 @@ class MonteCarlo:
         if not self._runs:
             raise RuntimeError('No hay resultados. Ejecute `run()` antes de guardar.')
 
-        root, ext = os.path.splitext(filepath)
-        ext = ext.lower()
-
-        if ext in ('.xlsx',) and pd is not None:
-            try:
-                df = pd.DataFrame(self._runs)
-                df.to_excel(filepath, index=False)
-                return filepath
-            except Exception as e:
-                # fallback a csv
-                csv_path = root + '.csv'
-                try:
-                    df.to_csv(csv_path, index=False)
-                    return csv_path
-                except Exception:
-                    raise
-        else:
-            # CSV fallback
-            try:
-                if pd is not None:
-                    df = pd.DataFrame(self._runs)
-                    df.to_csv(filepath if ext == '.csv' else root + '.csv', index=False)
-                    return filepath if ext == '.csv' else root + '.csv'
-                else:
-                    # escribir CSV manualmente
-                    import csv
-                    csv_path = root + '.csv'
-                    keys = list(self._runs[0].keys())
-                    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=keys)
-                        writer.writeheader()
-                        writer.writerows(self._runs)
-                    return csv_path
-            except Exception:
-                raise
+        return guardar_filas(self._runs, filepath)
 
     def summary_statistics(self):
         """Calcula estadísticas básicas sobre las corridas.
 
         Retorna un diccionario con conteo de colisiones, promedio y desviación de
-        vehículos afectados.
+        vehículos afectados. Con un `muestreo` distinto de `independiente` las
+        estimaciones usan la ponderación de la estrategia e incluyen errores
+        estándar y tamaño de muestra efectivo (ver `core.muestreo.estimar`),
+        siempre que las corridas traigan el `peso` y el `grupo` del diseño.
         """
         if not self._runs:
             return {}
 
-        if pd is not None:
-            df = pd.DataFrame(self._runs)
-            resumen = {
-                'num_corridas': len(df),
-                'colisiones_total': int(df['hubo_colisiones'].sum()),
-                'colisiones_frac': float(df['hubo_colisiones'].mean()),
-                'vehiculos_afectados_mean': float(df['vehiculos_afectados'].mean()),
-                'vehiculos_afectados_std': float(df['vehiculos_afectados'].std(ddof=0))
-            }
-            return resumen
-        else:
-            # cálculo manual
-            total = len(self._runs)
-            colisiones = sum(1 for r in self._runs if r.get('hubo_colisiones'))
-            affected = [r.get('vehiculos_afectados', 0) for r in self._runs]
-            mean_aff = sum(affected) / total
-            var = sum((x - mean_aff) ** 2 for x in affected) / total
-            return {
-                'num_corridas': total,
-                'colisiones_total': colisiones,
-                'colisiones_frac': colisiones / total,
-                'vehiculos_afectados_mean': mean_aff,
-                'vehiculos_afectados_std': math.sqrt(var)
-            }
\ No newline at end of file
+        if self.muestreo != MUESTREO_INDEPENDIENTE and all(
+                'peso' in r and 'grupo' in r for r in self._runs):
+            return estimar(self._runs, self.muestreo)
+
+        # Sin `pandas`: importarlo costaría más que el propio resumen
+        return resumir_corridas(self._runs)
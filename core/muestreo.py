@@ -0,0 +1,192 @@
+import math
+import random
+from typing import Dict, List, Optional, Sequence
+
+from core.simetria import vehiculo_problema_de
+
+# Estrategias de muestreo de `MonteCarlo`
+MUESTREO_INDEPENDIENTE = 'independiente'  # semillas consecutivas
+MUESTREO_ESTRATIFICADO = 'estratificado'  # el mismo número de corridas por vehículo problema
+MUESTREO_ANTITETICO = 'antitetico'  # pares de vehículos i y N-1-i
+MUESTREO_IMPORTANCIA = 'importancia'  # vehículos según `propuesta`, con pesos
+MODOS_MUESTREO = (MUESTREO_INDEPENDIENTE, MUESTREO_ESTRATIFICADO,
+                  MUESTREO_ANTITETICO, MUESTREO_IMPORTANCIA)
+
+
+class SemillasPorVehiculo:
+    """
+    Entrega semillas cuyo vehículo problema (ver `vehiculo_problema_de`) es
+    el pedido. Recorre las semillas en orden desde `inicio` y guarda las que
+    aún no se pidieron, así que el resultado es determinista y nunca repite
+    una semilla.
+    """
+
+    def __init__(self, num_vehiculos: int, inicio: int = 0):
+        self.num_vehiculos = num_vehiculos
+        self._siguiente = inicio
+        self._pendientes = {v: [] for v in range(num_vehiculos)}
+
+    def semilla(self, vehiculo: int) -> int:
+        """Próxima semilla libre cuyo vehículo problema es `vehiculo`"""
+        pendientes = self._pendientes[vehiculo]
+        while not pendientes:
+            s = self._siguiente
+            self._siguiente += 1
+            self._pendientes[vehiculo_problema_de(s, self.num_vehiculos)].append(s)
+        return pendientes.pop(0)
+
+
+def normalizar_propuesta(propuesta: Sequence[float], num_vehiculos: int) -> List[float]:
+    """Valida la distribución de propuesta (un peso por vehículo) y la normaliza"""
+    if propuesta is None or len(propuesta) != num_vehiculos:
+        raise ValueError('La propuesta debe tener una probabilidad por vehículo.')
+    if any(q <= 0 for q in propuesta):
+        raise ValueError('La propuesta debe ser positiva para todos los vehículos.')
+    total = float(sum(propuesta))
+    return [q / total for q in propuesta]
+
+
+def disenar(modo: str, num_runs: int, num_vehiculos: int, seed_start: int = 0,
+            propuesta: Optional[Sequence[float]] = None) -> List[dict]:
+    """
+    Semillas de un experimento según la estrategia de muestreo.
+
+    La única entrada aleatoria de una corrida es el vehículo problema
+    (uniforme). Cada estrategia fija qué vehículo usa cada corrida y busca
+    una semilla que lo produzca, por lo que cada corrida sigue identificada
+    por su semilla (caché, deduplicación y procesos funcionan igual).
+
+    - `MUESTREO_INDEPENDIENTE`: `seed_start`, `seed_start+1`, ...
+    - `MUESTREO_ESTRATIFICADO`: asignación proporcional, `num_runs / N`
+      corridas por vehículo (el resto a los primeros). Requiere
+      `num_runs >= N`.
+    - `MUESTREO_ANTITETICO`: pares (i, N-1-i), el reflejo de la inversa de la
+      distribución uniforme; con `num_runs` impar se agrega una corrida.
+    - `MUESTREO_IMPORTANCIA`: vehículos tomados de `propuesta`, con peso
+      `(1/N) / propuesta[i]`.
+
+    Returns:
+        list: un dict por corrida con `seed`, `peso` y `grupo` (estrato o
+        par; la propia corrida en los demás modos).
+    """
+    num_runs = int(num_runs)
+    if modo == MUESTREO_INDEPENDIENTE:
+        return [{'seed': s, 'peso': 1.0, 'grupo': i}
+                for i, s in enumerate(range(seed_start, seed_start + num_runs))]
+
+    semillas = SemillasPorVehiculo(num_vehiculos, seed_start)
+    if modo == MUESTREO_ESTRATIFICADO:
+        if num_runs < num_vehiculos:
+            raise ValueError('El muestreo estratificado requiere al menos una corrida por vehículo.')
+        base, resto = divmod(num_runs, num_vehiculos)
+        return [{'seed': semillas.semilla(v), 'peso': 1.0, 'grupo': v}
+                for v in range(num_vehiculos) for _ in range(base + (v < resto))]
+
+    if modo == MUESTREO_ANTITETICO:
+        # Vehículos de la primera mitad de cada par: uniformes con su propio generador
+        rng = random.Random(seed_start)
+        diseno = []
+        for par in range(math.ceil(num_runs / 2)):
+            v = rng.randrange(num_vehiculos)
+            for vehiculo in (v, num_vehiculos - 1 - v):
+                diseno.append({'seed': semillas.semilla(vehiculo), 'peso': 1.0, 'grupo': par})
+        return diseno
+
+    if modo == MUESTREO_IMPORTANCIA:
+        q = normalizar_propuesta(propuesta, num_vehiculos)
+        rng = random.Random(seed_start)
+        vehiculos = rng.choices(range(num_vehiculos), weights=q, k=num_runs)
+        return [{'seed': semillas.semilla(v), 'peso': (1.0 / num_vehiculos) / q[v], 'grupo': i}
+                for i, v in enumerate(vehiculos)]
+
+    raise ValueError(f"Modo de muestreo desconocido: {modo!r}")
+
+
+def varianza_muestral(valores: List[float]) -> float:
+    """Varianza muestral (ddof=1); 0 con menos de dos valores"""
+    n = len(valores)
+    if n < 2:
+        return 0.0
+    media = sum(valores) / n
+    return sum((x - media) ** 2 for x in valores) / (n - 1)
+
+
+def _estimar_columna(runs: List[dict], modo: str, columna: str):
+    """
+    Estimación de la media de `columna` y su varianza según el diseño
+
+    Returns:
+        tuple: (estimación, varianza del estimador)
+    """
+    valores = [float(r[columna]) for r in runs]
+    n = len(valores)
+
+    if modo == MUESTREO_ESTRATIFICADO:
+        estratos: Dict[int, List[float]] = {}
+        for r, x in zip(runs, valores):
+            estratos.setdefault(r['grupo'], []).append(x)
+        # Todos los estratos tienen la misma probabilidad (1/N)
+        k = len(estratos)
+        media = sum(sum(xs) / len(xs) for xs in estratos.values()) / k
+        varianza = sum(varianza_muestral(xs) / len(xs) for xs in estratos.values()) / (k * k)
+        return media, varianza
+
+    if modo == MUESTREO_ANTITETICO:
+        pares: Dict[int, List[float]] = {}
+        for r, x in zip(runs, valores):
+            pares.setdefault(r['grupo'], []).append(x)
+        promedios = [sum(xs) / len(xs) for xs in pares.values()]
+        return sum(promedios) / len(promedios), varianza_muestral(promedios) / len(promedios)
+
+    if modo == MUESTREO_IMPORTANCIA:
+        # Estimador autonormalizado: sum(w x) / sum(w), varianza por método delta
+        pesos = [r['peso'] for r in runs]
+        total = sum(pesos)
+        media = sum(w * x for w, x in zip(pesos, valores)) / total
+        varianza = sum((w * (x - media)) ** 2 for w, x in zip(pesos, valores)) / (total * total)
+        return media, varianza
+
+    return sum(valores) / n, varianza_muestral(valores) / n
+
+
+def tamano_efectivo(varianza_unitaria: float, varianza: float, n: int) -> float:
+    """
+    Corridas independientes que darían la misma varianza que el diseño.
+    Infinito si el diseño no tiene varianza pero el muestreo simple sí.
+    """
+    if varianza <= 0:
+        return float(n) if varianza_unitaria <= 0 else math.inf
+    return varianza_unitaria / varianza
+
+
+def estimar(runs: List[dict], modo: str) -> dict:
+    """
+    Estadísticas de un experimento muestreado con `disenar`, con la
+    ponderación y la varianza de su estrategia.
+
+    Además de las claves de `resumir_corridas`, incluye el error estándar de
+    cada estimación (`colisiones_ee`, `vehiculos_afectados_ee`) y el tamaño
+    de muestra efectivo de la fracción de colisiones (`tamano_efectivo`):
+    el número de corridas independientes con la misma precisión.
+    """
+    n = len(runs)
+    if not n:
+        return {}
+    p, var_p = _estimar_columna(runs, modo, 'hubo_colisiones')
+    media, var_media = _estimar_columna(runs, modo, 'vehiculos_afectados')
+    # Varianza de vehículos afectados bajo la distribución original (uniforme)
+    dispersion, _ = _estimar_columna(
+        [dict(r, vehiculos_afectados=(r['vehiculos_afectados'] - media) ** 2) for r in runs],
+        modo, 'vehiculos_afectados')
+    p_acotada = min(max(p, 0.0), 1.0)
+    return {
+        'num_corridas': n,
+        'colisiones_total': sum(1 for r in runs if r['hubo_colisiones']),
+        'colisiones_frac': p,
+        'colisiones_ee': math.sqrt(var_p),
+        'vehiculos_afectados_mean': media,
+        'vehiculos_afectados_std': math.sqrt(dispersion),
+        'vehiculos_afectados_ee': math.sqrt(var_media),
+        'tamano_efectivo': tamano_efectivo(p_acotada * (1 - p_acotada), var_p, n),
+        'muestreo': modo
+    }
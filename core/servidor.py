@@ -0,0 +1,613 @@
+"""
+Servidor local que avanza una `Simulacion` y transmite su estado a la
+interfaz web (`components/SimulationCanvas.tsx`) por WebSocket.
+
+Uso (desde la raíz del proyecto):
+
+    python -m core.servidor --vehiculos 10000 --puerto 8765
+
+y abrir la interfaz (`npm run dev`) con `?servidor=ws://127.0.0.1:8765`.
+
+Cada cuadro es un mensaje binario con un encabezado fijo (`ENCABEZADO`)
+seguido de arreglos little-endian ordenados por ID:
+
+- Cuadro clave: `angulo` (Float32, n), `velocidad` (Float32, n) y `estado`
+  (Uint8, n, bits `BIT_*`).
+- Cuadro delta: `angulo` (Float32, n) y solo los vehículos cuya velocidad o
+  estado cambió respecto del último cuadro enviado a ese cliente: índices
+  (Uint32, k), `velocidad` (Float32, k) y `estado` (Uint8, k).
+
+Los ángulos viajan siempre completos (cambian en cada paso), así el cliente
+nunca acumula error. La simulación avanza a su ritmo (`escala_tiempo`
+segundos simulados por segundo real) y se publica a lo sumo `fps` cuadros
+por segundo, con los pasos intermedios descartados. El cliente confirma
+cada cuadro binario con `{"accion": "recibido"}` y el servidor no le deja
+más de `MAXIMO_EN_VUELO` sin confirmar: mientras tanto solo se conserva el
+cuadro más reciente, así un cliente lento recibe menos cuadros (sin
+retraso acumulado y sin frenar la simulación ni a los demás clientes) y su
+delta se calcula contra lo que efectivamente recibió.
+
+El cliente controla la corrida con mensajes de texto JSON
+(`{"accion": "pausar" | "continuar" | "frenar" | "reiniciar"}`; con
+`reiniciar` puede indicar `parametros`, ver `validar_reinicio`). El
+servidor responde con mensajes de texto `{"evento": "configuracion" |
+"fin" | "error", ...}`.
+
+Solo usa la biblioteca estándar y NumPy: implementa el subconjunto de
+WebSocket (RFC 6455) que necesita, sin extensiones.
+"""
+import sys
+import json
+import math
+import time
+import base64
+import struct
+import asyncio
+import hashlib
+import argparse
+from typing import Optional
+
+import numpy as np
+
+from core.simulacion import Simulacion
+from utils.constantes import (
+    NUMERO_VEHICULOS, RADIO_REDONDEL, DISTANCIA_SEGURIDAD, VELOCIDAD_NORMAL,
+    LONGITUD_VEHICULO, MOTOR_VECTORIZADO, REGISTRO_NINGUNO, INTEGRADOR_FIJO
+)
+
+VERSION_CUADRO = 1
+CUADRO_CLAVE = 0
+CUADRO_DELTA = 1
+
+# tipo, versión, reservado, vehículos, paso, cambios (delta), tiempo
+ENCABEZADO = struct.Struct('<BBHIIId')
+
+# Bits del arreglo `estado`
+BIT_FRENANDO = 1
+BIT_PROBLEMA = 2
+BIT_TUVO_QUE_FRENAR = 4
+BIT_COLISIONO = 8
+BIT_DESACELERANDO = 16  # la velocidad bajó desde el cuadro anterior
+
+# Parámetros de la corrida que un cliente puede cambiar al reiniciar
+PARAMETROS_REINICIO = ('num_vehiculos', 'radio', 'distancia_seguridad', 'seed',
+                       'tiempo_inicio_frenado', 'duracion')
+# Vehículos que un cliente puede pedir al reiniciar (acota memoria y tiempo por paso)
+MAXIMO_VEHICULOS_CLIENTE = 200000
+
+_GUID_WEBSOCKET = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+_OPCODE_TEXTO = 0x1
+_OPCODE_BINARIO = 0x2
+_OPCODE_CIERRE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+# Los mensajes del cliente son comandos cortos
+_MAXIMO_MENSAJE = 1 << 16
+# Cuadros enviados a un cliente sin confirmar; los búferes de TCP y del
+# navegador absorben segundos de cuadros, así que el límite es explícito
+MAXIMO_EN_VUELO = 2
+
+
+class Cuadro:
+    """Estado publicado en un instante, con arreglos ordenados por ID"""
+
+    def __init__(self, paso: int, tiempo: float, angulo, velocidad, estado):
+        self.paso = paso
+        self.tiempo = tiempo
+        self.angulo = angulo
+        self.velocidad = velocidad
+        self.estado = estado
+
+    def __len__(self):
+        return len(self.angulo)
+
+
+def capturar(simulacion: Simulacion, anterior: Optional[Cuadro] = None) -> Cuadro:
+    """
+    Toma el estado actual de la simulación como `Cuadro` (Float32 y bits de
+    estado), a partir de su instantánea
+
+    Args:
+        simulacion (Simulacion): Simulación en curso
+        anterior (Cuadro, optional): Cuadro publicado antes, para marcar
+            `BIT_DESACELERANDO`
+
+    Returns:
+        Cuadro: Estado actual
+    """
+    instantanea = simulacion.instantanea()
+    posicion = instantanea.posicion
+    velocidad = instantanea.velocidad[posicion].astype(np.float32)
+    estado = (instantanea.frenando.view(np.uint8) * BIT_FRENANDO
+              | instantanea.es_problema.view(np.uint8) * BIT_PROBLEMA
+              | instantanea.tuvo_que_frenar.view(np.uint8) * BIT_TUVO_QUE_FRENAR
+              | instantanea.colisiono.view(np.uint8) * BIT_COLISIONO)[posicion]
+    if anterior is not None and len(anterior) == len(velocidad):
+        estado[velocidad < anterior.velocidad] |= BIT_DESACELERANDO
+    return Cuadro(simulacion.pasos, simulacion.tiempo_actual,
+                  instantanea.angulo[posicion].astype(np.float32), velocidad, estado)
+
+
+class Codificador:
+    """
+    Codifica los cuadros que se envían a un cliente: delta respecto del
+    último cuadro enviado cuando resulta más corto que un cuadro clave
+    """
+
+    def __init__(self):
+        self.velocidad = None
+        self.estado = None
+
+    def codificar(self, cuadro: Cuadro) -> bytes:
+        """
+        Args:
+            cuadro (Cuadro): Cuadro a enviar
+
+        Returns:
+            bytes: Mensaje binario (ver el formato al comienzo del módulo)
+        """
+        n = len(cuadro)
+        partes = None
+        if self.velocidad is not None and len(self.velocidad) == n:
+            cambios = np.flatnonzero((cuadro.velocidad != self.velocidad)
+                                     | (cuadro.estado != self.estado))
+            # Delta: 4n + 9k bytes; clave: 9n
+            if 9 * len(cambios) < 5 * n:
+                partes = [ENCABEZADO.pack(CUADRO_DELTA, VERSION_CUADRO, 0, n, cuadro.paso,
+                                          len(cambios), cuadro.tiempo),
+                          cuadro.angulo.astype('<f4', copy=False).tobytes(),
+                          cambios.astype('<u4').tobytes(),
+                          cuadro.velocidad[cambios].astype('<f4', copy=False).tobytes(),
+                          cuadro.estado[cambios].tobytes()]
+        if partes is None:
+            partes = [ENCABEZADO.pack(CUADRO_CLAVE, VERSION_CUADRO, 0, n, cuadro.paso, n,
+                                      cuadro.tiempo),
+                      cuadro.angulo.astype('<f4', copy=False).tobytes(),
+                      cuadro.velocidad.astype('<f4', copy=False).tobytes(),
+                      cuadro.estado.tobytes()]
+        # Los arreglos de un cuadro no se modifican: basta con guardar la referencia
+        self.velocidad = cuadro.velocidad
+        self.estado = cuadro.estado
+        return b''.join(partes)
+
+
+def decodificar(datos: bytes, base: Optional[Cuadro] = None) -> Cuadro:
+    """
+    Reconstruye un cuadro a partir de un mensaje de `Codificador`; es la
+    misma lógica que aplica el cliente web
+
+    Args:
+        datos (bytes): Mensaje binario
+        base (Cuadro, optional): Último cuadro decodificado (requerido para
+            un cuadro delta)
+
+    Returns:
+        Cuadro: Cuadro reconstruido
+    """
+    tipo, version, _, n, paso, cambios, tiempo = ENCABEZADO.unpack_from(datos)
+    if version != VERSION_CUADRO:
+        raise ValueError(f"Versión de cuadro desconocida: {version!r}")
+    desplazamiento = ENCABEZADO.size
+    angulo = np.frombuffer(datos, '<f4', n, desplazamiento)
+    desplazamiento += 4 * n
+    if tipo == CUADRO_CLAVE:
+        velocidad = np.frombuffer(datos, '<f4', n, desplazamiento).copy()
+        estado = np.frombuffer(datos, np.uint8, n, desplazamiento + 4 * n).copy()
+    elif tipo == CUADRO_DELTA:
+        if base is None or len(base) != n:
+            raise ValueError("Un cuadro delta requiere el cuadro anterior")
+        indices = np.frombuffer(datos, '<u4', cambios, desplazamiento)
+        desplazamiento += 4 * cambios
+        velocidad = base.velocidad.copy()
+        velocidad[indices] = np.frombuffer(datos, '<f4', cambios, desplazamiento)
+        estado = base.estado.copy()
+        estado[indices] = np.frombuffer(datos, np.uint8, cambios, desplazamiento + 4 * cambios)
+    else:
+        raise ValueError(f"Tipo de cuadro desconocido: {tipo!r}")
+    return Cuadro(paso, tiempo, angulo.copy(), velocidad, estado)
+
+
+def _encabezado_websocket(opcode: int, largo: int) -> bytes:
+    """Encabezado de un mensaje del servidor (sin máscara, en un solo fragmento)"""
+    if largo < 126:
+        return struct.pack('!BB', 0x80 | opcode, largo)
+    if largo < 1 << 16:
+        return struct.pack('!BBH', 0x80 | opcode, 126, largo)
+    return struct.pack('!BBQ', 0x80 | opcode, 127, largo)
+
+
+def _desenmascarar(datos: bytes, mascara: bytes) -> bytes:
+    largo = len(datos)
+    clave = (mascara * (largo // 4 + 1))[:largo]
+    return (int.from_bytes(datos, 'big') ^ int.from_bytes(clave, 'big')).to_bytes(largo, 'big')
+
+
+async def _leer_mensaje(lector: asyncio.StreamReader):
+    """
+    Lee un mensaje del cliente, reuniendo sus fragmentos
+
+    Returns:
+        tuple: (opcode, datos)
+    """
+    partes = []
+    opcode_mensaje = None
+    while True:
+        byte0, byte1 = await lector.readexactly(2)
+        opcode = byte0 & 0x0F
+        largo = byte1 & 0x7F
+        if largo == 126:
+            largo, = struct.unpack('!H', await lector.readexactly(2))
+        elif largo == 127:
+            largo, = struct.unpack('!Q', await lector.readexactly(8))
+        if largo > _MAXIMO_MENSAJE:
+            raise ConnectionError("Mensaje del cliente demasiado largo")
+        mascara = await lector.readexactly(4) if byte1 & 0x80 else None
+        datos = await lector.readexactly(largo)
+        if mascara is not None:
+            datos = _desenmascarar(datos, mascara)
+        # Los mensajes de control no se fragmentan y pueden intercalarse
+        if opcode >= _OPCODE_CIERRE:
+            return opcode, datos
+        if opcode:
+            opcode_mensaje = opcode
+        partes.append(datos)
+        if byte0 & 0x80:
+            return opcode_mensaje, b''.join(partes)
+
+
+async def _aceptar(lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> bool:
+    """
+    Responde la solicitud HTTP de apertura del WebSocket
+
+    Returns:
+        bool: True si la conexión quedó abierta
+    """
+    solicitud = (await lector.readuntil(b'\r\n\r\n')).decode('latin-1')
+    cabeceras = {}
+    for linea in solicitud.split('\r\n')[1:]:
+        nombre, _, valor = linea.partition(':')
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    clave = cabeceras.get('sec-websocket-key')
+    if cabeceras.get('upgrade', '').lower() != 'websocket' or not clave:
+        escritor.write(b'HTTP/1.1 426 Upgrade Required\r\nSec-WebSocket-Version: 13\r\n'
+                       b'Content-Length: 0\r\nConnection: close\r\n\r\n')
+        await escritor.drain()
+        return False
+    aceptacion = base64.b64encode(hashlib.sha1((clave + _GUID_WEBSOCKET).encode()).digest())
+    escritor.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                   b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + aceptacion + b'\r\n\r\n')
+    await escritor.drain()
+    return True
+
+
+def _numero(clave: str, valor, entero: bool = False, minimo: float = 0.0,
+            incluir_minimo: bool = True, maximo: Optional[float] = None):
+    """Convierte un parámetro recibido en JSON a número y comprueba su rango"""
+    if isinstance(valor, bool):
+        raise ValueError(f"{clave} debe ser numérico: {valor!r}")
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"{clave} debe ser numérico: {valor!r}") from None
+    if not math.isfinite(numero):
+        raise ValueError(f"{clave} debe ser finito: {valor!r}")
+    if entero:
+        if not numero.is_integer():
+            raise ValueError(f"{clave} debe ser entero: {valor!r}")
+        numero = int(numero)
+    if numero < minimo or (numero == minimo and not incluir_minimo):
+        relacion = '>=' if incluir_minimo else '>'
+        raise ValueError(f"{clave} debe ser {relacion} {minimo:g}: {valor!r}")
+    if maximo is not None and numero > maximo:
+        raise ValueError(f"{clave} debe ser <= {maximo:g}: {valor!r}")
+    return numero
+
+
+def validar_reinicio(parametros) -> dict:
+    """
+    Valida los parámetros de un comando `reiniciar` y los convierte a los
+    tipos de `Simulacion`
+
+    Args:
+        parametros (dict): Parámetros enviados por el cliente (ver
+            `PARAMETROS_REINICIO`); `seed`, `tiempo_inicio_frenado` y
+            `duracion` admiten null
+
+    Returns:
+        dict: Parámetros convertidos
+
+    Raises:
+        ValueError: Si hay parámetros desconocidos o fuera de rango
+    """
+    if not isinstance(parametros, dict):
+        raise ValueError("parametros debe ser un objeto")
+    desconocidos = sorted(set(parametros) - set(PARAMETROS_REINICIO))
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(desconocidos)}")
+    validados = {}
+    for clave, valor in parametros.items():
+        if clave == 'num_vehiculos':
+            valor = _numero(clave, valor, entero=True, minimo=1,
+                            maximo=MAXIMO_VEHICULOS_CLIENTE)
+        elif clave == 'radio':
+            valor = _numero(clave, valor, incluir_minimo=False)
+        elif clave == 'distancia_seguridad':
+            valor = _numero(clave, valor)
+        elif valor is not None:
+            if clave == 'seed':
+                valor = _numero(clave, valor, entero=True)
+            elif clave == 'tiempo_inicio_frenado':
+                valor = _numero(clave, valor)
+            else:
+                valor = _numero(clave, valor, incluir_minimo=False)
+        validados[clave] = valor
+    return validados
+
+
+class _Cliente:
+    """Conexión abierta: cuadro pendiente, mensajes de texto y su codificador"""
+
+    def __init__(self, escritor: asyncio.StreamWriter):
+        self.escritor = escritor
+        self.codificador = Codificador()
+        self.pendiente = asyncio.Event()
+        self.mensajes = []
+        self.ultimo = None
+        self.en_vuelo = 0
+        self.enviados = 0
+        self.descartados = 0
+
+    def escribir(self, opcode: int, datos: bytes):
+        # Una sola llamada síncrona: los mensajes de distintas tareas no se mezclan
+        self.escritor.writelines([_encabezado_websocket(opcode, len(datos)), datos])
+
+    def encolar(self, evento: dict):
+        self.mensajes.append(json.dumps(evento).encode())
+        self.pendiente.set()
+
+
+class ServidorSimulacion:
+    """
+    Avanza una simulación con el motor vectorizado y transmite sus cuadros a
+    todos los clientes conectados
+    """
+
+    def __init__(self, parametros: Optional[dict] = None, fps: float = 30.0,
+                 escala_tiempo: float = 1.0, duracion: Optional[float] = None,
+                 tiempo_inicio_frenado: Optional[float] = None, seed: Optional[int] = None):
+        """
+        Args:
+            parametros (dict, optional): Argumentos de `Simulacion` (sin `motor`
+                ni `registro`)
+            fps (float): Cuadros publicados por segundo, como máximo
+            escala_tiempo (float): Segundos simulados por segundo real
+            duracion (float, optional): Fin de la corrida; sin él avanza
+                hasta que se reinicie
+            tiempo_inicio_frenado (float, optional): Instante del frenado del
+                vehículo problema; sin él frena solo cuando un cliente lo pide
+            seed (int, optional): Semilla de conductores y vehículo problema
+        """
+        if fps <= 0:
+            raise ValueError(f"fps debe ser positivo: {fps!r}")
+        self.parametros = dict(parametros or {})
+        self.fps = fps
+        self.escala_tiempo = escala_tiempo
+        self.duracion = duracion
+        self.tiempo_inicio_frenado = tiempo_inicio_frenado
+        self.seed = seed
+        self.clientes = set()
+        self.pausado = False
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Crea una corrida nueva con los parámetros actuales"""
+        self.simulacion = Simulacion(**{'integrador': INTEGRADOR_FIJO, **self.parametros},
+                                     motor=MOTOR_VECTORIZADO, registro=REGISTRO_NINGUNO)
+        self.simulacion.asignar_conductores(self.seed)
+        self.simulacion.seleccionar_vehiculo_aleatorio(self.seed)
+        self.simulacion.iniciar_frenado(self.tiempo_inicio_frenado)
+        self.objetivo = 0.0
+        self.terminado = False
+        self.cuadro = capturar(self.simulacion)
+        for cliente in self.clientes:
+            cliente.encolar(self.configuracion())
+
+    def configuracion(self) -> dict:
+        simulacion = self.simulacion
+        return {
+            'evento': 'configuracion',
+            'version': VERSION_CUADRO,
+            'num_vehiculos': simulacion.redondel.num_vehiculos,
+            'radio': simulacion.redondel.radio,
+            'distancia_seguridad': simulacion.distancia_seguridad,
+            'dt': simulacion.dt,
+            'integrador': simulacion.integrador,
+            'velocidad_normal': VELOCIDAD_NORMAL,
+            'longitud_vehiculo': LONGITUD_VEHICULO,
+            'fps': self.fps,
+            'escala_tiempo': self.escala_tiempo,
+            'duracion': self.duracion,
+        }
+
+    def avanzar(self):
+        """
+        Avanza la simulación lo que corresponde a un cuadro y, si dio algún
+        paso, publica el estado resultante a todos los clientes
+        """
+        if self.pausado or self.terminado:
+            return
+        simulacion = self.simulacion
+        self.objetivo += self.escala_tiempo / self.fps
+        if self.duracion is not None:
+            self.objetivo = min(self.objetivo, self.duracion)
+        pasos = simulacion.pasos
+        simulacion.avanzar_hasta(self.objetivo)
+        if simulacion.pasos != pasos:
+            self.cuadro = capturar(simulacion, self.cuadro)
+            for cliente in self.clientes:
+                cliente.pendiente.set()
+        if self.duracion is not None and simulacion.tiempo_actual >= self.duracion:
+            self.terminado = True
+            fin = {'evento': 'fin', 'tiempo_final': simulacion.tiempo_actual,
+                   'hubo_colisiones': simulacion.redondel.hay_colisiones(),
+                   'vehiculos_afectados': simulacion.redondel.contar_vehiculos_afectados(),
+                   'contactos': len(simulacion.contactos)}
+            for cliente in self.clientes:
+                cliente.encolar(fin)
+
+    def ejecutar_comando(self, comando: dict) -> Optional[dict]:
+        """
+        Aplica un comando de un cliente
+
+        Returns:
+            dict: Evento de error para ese cliente, o None
+        """
+        accion = comando.get('accion')
+        if accion == 'pausar':
+            self.pausado = True
+        elif accion == 'continuar':
+            self.pausado = False
+        elif accion == 'frenar':
+            simulacion = self.simulacion
+            if not simulacion.simulacion_iniciada:
+                simulacion.iniciar_frenado(simulacion.tiempo_actual)
+            elif not simulacion.vehiculo_problema.frenando:
+                simulacion.vehiculo_problema.iniciar_frenado()
+        elif accion == 'reiniciar':
+            try:
+                parametros = validar_reinicio(comando.get('parametros') or {})
+            except ValueError as e:
+                return {'evento': 'error', 'mensaje': str(e)}
+            anteriores = (dict(self.parametros), self.seed, self.tiempo_inicio_frenado,
+                          self.duracion)
+            for clave, valor in parametros.items():
+                if clave in ('seed', 'tiempo_inicio_frenado', 'duracion'):
+                    setattr(self, clave, valor)
+                else:
+                    self.parametros[clave] = valor
+            try:
+                self.reiniciar()
+            except (ValueError, TypeError) as e:
+                (self.parametros, self.seed, self.tiempo_inicio_frenado,
+                 self.duracion) = anteriores
+                return {'evento': 'error', 'mensaje': f"No se pudo reiniciar: {e}"}
+        else:
+            return {'evento': 'error', 'mensaje': f"Acción desconocida: {accion!r}"}
+        return None
+
+    async def _enviar(self, cliente: _Cliente):
+        """
+        Envía a un cliente sus mensajes y el cuadro más reciente. Mientras
+        tenga `MAXIMO_EN_VUELO` cuadros sin confirmar o la conexión no drene,
+        los cuadros nuevos reemplazan al pendiente.
+        """
+        while True:
+            await cliente.pendiente.wait()
+            cliente.pendiente.clear()
+            mensajes, cliente.mensajes = cliente.mensajes, []
+            for mensaje in mensajes:
+                cliente.escribir(_OPCODE_TEXTO, mensaje)
+            cuadro = self.cuadro
+            if cuadro is not cliente.ultimo and cliente.en_vuelo < MAXIMO_EN_VUELO:
+                if cliente.ultimo is not None and cuadro.paso > cliente.ultimo.paso:
+                    cliente.descartados += cuadro.paso - cliente.ultimo.paso - 1
+                cliente.escribir(_OPCODE_BINARIO, cliente.codificador.codificar(cuadro))
+                cliente.ultimo = cuadro
+                cliente.en_vuelo += 1
+                cliente.enviados += 1
+            await cliente.escritor.drain()
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atiende una conexión: envío de cuadros y lectura de comandos"""
+        try:
+            if not await _aceptar(lector, escritor):
+                escritor.close()
+                return
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            escritor.close()
+            return
+        cliente = _Cliente(escritor)
+        self.clientes.add(cliente)
+        cliente.encolar(self.configuracion())
+        envio = asyncio.create_task(self._enviar(cliente))
+        direccion = escritor.get_extra_info('peername')
+        print(f'Cliente conectado: {direccion}')
+        try:
+            while not envio.done():
+                opcode, datos = await _leer_mensaje(lector)
+                if opcode == _OPCODE_CIERRE:
+                    cliente.escribir(_OPCODE_CIERRE, datos[:2])
+                    break
+                if opcode == _OPCODE_PING:
+                    cliente.escribir(_OPCODE_PONG, datos)
+                elif opcode == _OPCODE_TEXTO:
+                    try:
+                        comando = json.loads(datos)
+                        if comando.get('accion') == 'recibido':
+                            cliente.en_vuelo = max(0, cliente.en_vuelo - 1)
+                            cliente.pendiente.set()
+                            continue
+                        error = self.ejecutar_comando(comando)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        error = {'evento': 'error', 'mensaje': str(e)}
+                    if error is not None:
+                        cliente.encolar(error)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clientes.discard(cliente)
+            envio.cancel()
+            escritor.close()
+            print(f'Cliente desconectado: {direccion} '
+                  f'({cliente.enviados} cuadros enviados, {cliente.descartados} pasos sin enviar)')
+
+    async def servir(self, host: str = '127.0.0.1', puerto: int = 8765):
+        """Acepta conexiones y avanza la simulación hasta que se cancele"""
+        servidor = await asyncio.start_server(self._atender, host, puerto)
+        print(f'Servidor de simulación en ws://{host}:{puerto} '
+              f'({self.simulacion.redondel.num_vehiculos} vehículos)')
+        periodo = 1.0 / self.fps
+        async with servidor:
+            while True:
+                inicio = time.perf_counter()
+                self.avanzar()
+                # Si avanzar tarda más que un cuadro, la simulación va más lenta que el reloj
+                await asyncio.sleep(max(0.0, periodo - (time.perf_counter() - inicio)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Transmitir la simulación a la interfaz web')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--vehiculos', type=int, default=NUMERO_VEHICULOS)
+    parser.add_argument('--radio', type=float, default=None,
+                        help='Radio en metros (por defecto, proporcional a los vehículos)')
+    parser.add_argument('--distancia-seguridad', type=float, default=DISTANCIA_SEGURIDAD)
+    parser.add_argument('--integrador', default=INTEGRADOR_FIJO)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--escala-tiempo', type=float, default=1.0,
+                        help='Segundos simulados por segundo real')
+    parser.add_argument('--duracion', type=float, default=None)
+    parser.add_argument('--inicio-frenado', type=float, default=None,
+                        help='Instante del frenado (por defecto, cuando lo pida la interfaz)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    radio = args.radio
+    if radio is None:
+        # Misma densidad que el redondel de referencia
+        radio = RADIO_REDONDEL * args.vehiculos / NUMERO_VEHICULOS
+    servidor = ServidorSimulacion(
+        {'num_vehiculos': args.vehiculos, 'radio': radio,
+         'distancia_seguridad': args.distancia_seguridad, 'integrador': args.integrador},
+        fps=args.fps, escala_tiempo=args.escala_tiempo, duracion=args.duracion,
+        tiempo_inicio_frenado=args.inicio_frenado, seed=args.seed)
+    try:
+        asyncio.run(servidor.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import random
+from typing import Dict, Hashable, List
+
+# Modos de deduplicación de corridas en `MonteCarlo`
+SIMETRIA_NINGUNA = 'ninguna'  # fuerza bruta: se simula cada semilla
+SIMETRIA_EXACTA = 'exacta'  # una corrida por vehículo problema (resultado idéntico)
+SIMETRIA_ROTACION = 'rotacion'  # una corrida para todos los vehículos (aproximado)
+MODOS_SIMETRIA = (SIMETRIA_NINGUNA, SIMETRIA_EXACTA, SIMETRIA_ROTACION)
+
+# Columnas de un resumen de corrida que dependen de la dinámica
+COLUMNAS_RESULTADO = ('hubo_colisiones', 'vehiculos_afectados')
+
+
+def vehiculo_problema_de(seed: int, num_vehiculos: int) -> int:
+    """
+    Vehículo problema que elige `Simulacion.seleccionar_vehiculo_aleatorio`
+    con `seed`: es la única entrada aleatoria de una corrida.
+    """
+    return random.Random(seed).randint(0, num_vehiculos - 1)
+
+
+def clase_equivalencia(seed: int, num_vehiculos: int, modo: str = SIMETRIA_EXACTA) -> Hashable:
+    """
+    Clave de la clase de equivalencia de la corrida con `seed`: dos corridas
+    con la misma clave tienen la misma dinámica.
+
+    - `SIMETRIA_NINGUNA`: la propia semilla (cada corrida es su clase).
+    - `SIMETRIA_EXACTA`: el vehículo problema. Con los mismos parámetros y el
+      mismo vehículo problema la corrida es la misma, bit a bit.
+    - `SIMETRIA_ROTACION`: una sola clase. Con la ubicación inicial uniforme
+      de `Redondel._inicializar_vehiculos`, elegir el vehículo *i* es una
+      rotación de elegir el 0; en punto flotante los ángulos rotados no son
+      idénticos y en casos límite (vehículos a la distancia justa) el
+      resultado puede variar en uno o dos vehículos afectados. Ver
+      `MonteCarlo.verificar_simetria`.
+    """
+    if modo == SIMETRIA_NINGUNA:
+        return ('seed', int(seed))
+    if modo == SIMETRIA_EXACTA:
+        return ('vehiculo', vehiculo_problema_de(seed, num_vehiculos))
+    if modo == SIMETRIA_ROTACION:
+        return ('rotacion',)
+    raise ValueError(f"Modo de simetría desconocido: {modo!r}")
+
+
+def agrupar_semillas(seeds: List[int], num_vehiculos: int,
+                     modo: str = SIMETRIA_EXACTA) -> Dict[Hashable, List[int]]:
+    """
+    Agrupa las semillas por clase de equivalencia, conservando el orden de
+    aparición (la primera semilla de cada grupo es su representante).
+    """
+    clases = {}
+    for s in seeds:
+        clases.setdefault(clase_equivalencia(s, num_vehiculos, modo), []).append(s)
+    return clases
+
+
+def expandir(resumen: dict, seed: int, num_vehiculos: int) -> dict:
+    """
+    Resumen de la corrida con `seed` a partir del de su representante: se
+    copian los resultados y se reemplazan la semilla y el vehículo problema.
+    """
+    fila = dict(resumen)
+    fila['seed'] = seed
+    fila['vehiculo_problema_id'] = vehiculo_problema_de(seed, num_vehiculos)
+    return fila
+
+
+def diferencias(esperadas: List[dict], obtenidas: List[dict]) -> List[dict]:
+    """
+    Compara dos listas de resúmenes (misma semilla en cada posición) en las
+    columnas de `COLUMNAS_RESULTADO` y `vehiculo_problema_id`.
+
+    Returns:
+        list: una entrada por semilla que no coincide, con los valores de
+        ambas listas.
+    """
+    distintas = []
+    columnas = ('vehiculo_problema_id',) + COLUMNAS_RESULTADO
+    for a, b in zip(esperadas, obtenidas):
+        if any(a.get(c) != b.get(c) for c in columnas):
+            distintas.append({'seed': a['seed'],
+                              'esperado': {c: a.get(c) for c in columnas},
+                              'obtenido': {c: b.get(c) for c in columnas}})
+    return distintas
@@ -1,10 +1,36 @@
+import os
 import random
+from time import perf_counter
 from models.redondel import Redondel
+from models.conductores import PoblacionConductores
 from utils.constantes import (
     DT, DURACION_FRENADO, DISTANCIA_SEGURIDAD,
-    NUMERO_VEHICULOS, RADIO_REDONDEL
+    NUMERO_VEHICULOS, RADIO_REDONDEL, MOTOR_OBJETOS, MOTOR_VECTORIZADO,
+    REGISTRO_COMPLETO, REGISTRO_NINGUNO, REGISTRO_RESUMEN, REGISTRO_INTERVALO,
+    REGISTRO_FRENADO, REGISTRO_COLUMNAR, INTEGRADOR_FIJO, INTEGRADOR_ADAPTATIVO, PASO_MAXIMO,
+    PASO_REGLAS
 )
 
+MODOS_REGISTRO = (REGISTRO_COMPLETO, REGISTRO_NINGUNO, REGISTRO_RESUMEN,
+                  REGISTRO_INTERVALO, REGISTRO_FRENADO, REGISTRO_COLUMNAR)
+INTEGRADORES = (INTEGRADOR_FIJO, INTEGRADOR_ADAPTATIVO)
+
+
+def contar_pasos(tiempo, dt, limite):
+    """
+    Cuenta los pasos de `dt` que da el reloj desde `tiempo` hasta alcanzar
+    `limite`, acumulando igual que `Simulacion.actualizar` para que el
+    redondeo coincida
+    
+    Returns:
+        tuple: (pasos, tiempo final)
+    """
+    pasos = 0
+    while tiempo < limite:
+        tiempo += dt
+        pasos += 1
+    return pasos, tiempo
+
 
 class Simulacion:
     """
@@ -12,7 +38,10 @@ class Simulacion:
     """
     
     def __init__(self, num_vehiculos=NUMERO_VEHICULOS, radio=RADIO_REDONDEL, 
-                distancia_seguridad=DISTANCIA_SEGURIDAD, dt=DT):
+                distancia_seguridad=DISTANCIA_SEGURIDAD, dt=DT, motor=MOTOR_OBJETOS,
+                registro=REGISTRO_COMPLETO, intervalo_registro=10, trayectoria=None,
+                instrumentacion=None, poblacion=None, integrador=INTEGRADOR_FIJO,
+                paso_maximo=PASO_MAXIMO):
         """
         Inicializa la simulación
         
@@ -21,18 +50,99 @@ class Simulacion:
             radio (float): Radio del redondel
             distancia_seguridad (float): Distancia de seguridad entre vehículos
             dt (float): Intervalo de tiempo de actualización
+            motor (str): Motor de simulación, `MOTOR_OBJETOS` o `MOTOR_VECTORIZADO`
+            registro (str): Qué guardar en el historial en cada paso:
+                `REGISTRO_COMPLETO` (estado de todos los vehículos),
+                `REGISTRO_NINGUNO`, `REGISTRO_RESUMEN` (métricas agregadas),
+                `REGISTRO_INTERVALO` (estado completo cada `intervalo_registro`
+                pasos), `REGISTRO_FRENADO` (estado completo mientras algún
+                vehículo frena o va por debajo de la velocidad normal) o
+                `REGISTRO_COLUMNAR` (arreglos tiempo x vehículo)
+            intervalo_registro (int): Pasos entre registros con `REGISTRO_INTERVALO`
+            trayectoria (EscritorTrayectoria, optional): Si se indica, cada paso
+                se vuelca también a disco; quien lo crea debe cerrarlo
+            instrumentacion (Instrumentacion, optional): Si se indica, acumula
+                tiempos por fase y contadores de la simulación
+            poblacion (PoblacionConductores | dict, optional): Distribución de
+                los parámetros de los conductores, sorteados en cada corrida
+                con su semilla; sin ella todos usan las constantes
+            integrador (str): `INTEGRADOR_FIJO` (un paso de `dt` con las
+                reglas de reacción) o `INTEGRADOR_ADAPTATIVO` (pasos exactos
+                de hasta `paso_maximo` mientras ninguna regla puede
+                activarse, pasos de `dt` cerca de frenados y reacciones, pero
+                nunca más largos que `PASO_REGLAS`, y detección continua de
+                colisiones)
+            paso_maximo (float): Paso más largo del integrador adaptativo
         """
-        self.redondel = Redondel(radio, num_vehiculos)
+        if registro not in MODOS_REGISTRO:
+            raise ValueError(f"Modo de registro desconocido: {registro!r}")
+        if integrador not in INTEGRADORES:
+            raise ValueError(f"Integrador desconocido: {integrador!r}")
+        self.motor = motor
+        self.registro = registro
+        self.intervalo_registro = max(1, int(intervalo_registro))
+        self.trayectoria = trayectoria
+        self.instrumentacion = instrumentacion
+        self.poblacion = PoblacionConductores.desde_dict(poblacion)
+        self.redondel = self._crear_redondel(radio, num_vehiculos)
         self.distancia_seguridad = distancia_seguridad
         self.dt = dt
+        self.integrador = integrador
+        self.paso_maximo = paso_maximo
         self.tiempo_actual = 0.0
         self.tiempo_inicio_frenado = None
         self.vehiculo_problema = None
         self.simulacion_iniciada = False
         self.simulacion_terminada = False
+        self.rng = None
+        self.pasos = 0
+        # Colisiones localizadas por la detección continua (integrador adaptativo)
+        self.contactos = []
         
         # Historial de estados para análisis
-        self.historial = []
+        self.historial = self._historial_vacio()
+        
+    def _historial_vacio(self):
+        """Crea el contenedor del historial según el modo de registro"""
+        if self.registro == REGISTRO_COLUMNAR:
+            return {'tiempo': [], 'angulo': [], 'velocidad': [], 'frenando': [],
+                    'tuvo_que_frenar': [], 'colisiono': []}
+        return []
+        
+    def _crear_redondel(self, radio, num_vehiculos):
+        """
+        Crea el redondel correspondiente al motor seleccionado
+        
+        Args:
+            radio (float): Radio del redondel
+            num_vehiculos (int): Número de vehículos en el redondel
+            
+        Returns:
+            Redondel | RedondelVectorizado: Redondel inicializado
+        """
+        if self.motor == MOTOR_OBJETOS:
+            redondel = Redondel(radio, num_vehiculos)
+        elif self.motor == MOTOR_VECTORIZADO:
+            # Importación diferida: NumPy solo es necesario para este motor
+            from models.redondel_vectorizado import RedondelVectorizado
+            redondel = RedondelVectorizado(radio, num_vehiculos)
+        else:
+            raise ValueError(f"Motor de simulación desconocido: {self.motor!r}")
+        redondel.instrumentacion = self.instrumentacion
+        return redondel
+        
+    def asignar_conductores(self, seed=None):
+        """
+        Sortea los parámetros de los conductores de la corrida según
+        `poblacion` (no hace nada sin población)
+        
+        Args:
+            seed (int, optional): Semilla para reproducibilidad
+        """
+        if self.poblacion is None:
+            return
+        self.redondel.asignar_conductores(
+            self.poblacion.muestrear(self.redondel.num_vehiculos, seed))
         
     def seleccionar_vehiculo_aleatorio(self, seed=None):
         """
@@ -41,11 +151,12 @@ class Simulacion:
         Args:
             seed (int, optional): Semilla para reproducibilidad
         """
-        if seed is not None:
-            random.seed(seed)
+        # Generador propio de la corrida: no toca el estado global de `random`,
+        # así varias simulaciones pueden ejecutarse en paralelo sin interferir
+        self.rng = random.Random(seed)
             
         # Seleccionar un vehículo aleatorio
-        vehiculo_id = random.randint(0, len(self.redondel.vehiculos) - 1)
+        vehiculo_id = self.rng.randint(0, self.redondel.num_vehiculos - 1)
         self.vehiculo_problema = self.redondel.obtener_vehiculo_por_id(vehiculo_id)
         self.vehiculo_problema.marcar_como_problema()
         
@@ -60,13 +171,47 @@ class Simulacion:
         """
         self.tiempo_inicio_frenado = tiempo_inicio
         
-    def actualizar(self):
+    def _fin_paso_libre(self, limite=None):
+        """
+        Fin del próximo paso del integrador adaptativo si puede ser un paso
+        libre: hasta `paso_maximo` adelante, sin pasar el inicio del frenado
+        ni `limite`. Si ninguna regla queda libre al menos un paso de las
+        reglas, se da un paso con ellas.
+        
+        Args:
+            limite (float, optional): Instante que el paso no debe sobrepasar
+            
+        Returns:
+            float: Instante final del paso libre, o None para un paso de `dt`
+        """
+        paso = self.redondel.paso_libre(self.distancia_seguridad)
+        if paso < self._paso_reglas():
+            return None
+        fin = self.tiempo_actual + min(paso, self.paso_maximo)
+        eventos = [limite]
+        if not self.simulacion_iniciada:
+            eventos.append(self.tiempo_inicio_frenado)
+        for evento in eventos:
+            if evento is not None and self.tiempo_actual < evento < fin:
+                fin = evento
+        return fin
+        
+    def actualizar(self, limite=None):
         """
         Actualiza un paso de la simulación
         
+        Args:
+            limite (float, optional): Con el integrador adaptativo, instante
+                que un paso libre no debe sobrepasar (el fin de la corrida)
+        
         Returns:
-            dict: Estado actual de la simulación
+            dict: Registro agregado al historial en este paso, o None si el
+            modo de registro no guardó nada
         """
+        instrumentacion = self.instrumentacion
+        if instrumentacion is not None:
+            inicio_paso = perf_counter()
+            
         # Iniciar frenado si corresponde
         if (self.tiempo_inicio_frenado is not None and 
             self.tiempo_actual >= self.tiempo_inicio_frenado and 
@@ -75,27 +220,194 @@ class Simulacion:
             self.simulacion_iniciada = True
             
         # Actualizar el redondel
-        self.redondel.actualizar(self.dt, self.distancia_seguridad)
-        
-        # Incrementar tiempo
-        self.tiempo_actual += self.dt
+        if self.integrador == INTEGRADOR_FIJO:
+            self.redondel.actualizar(self.dt, self.distancia_seguridad)
+            self.tiempo_actual += self.dt
+        else:
+            self._paso_adaptativo(limite)
+        self.pasos += 1
         
         # Guardar estado en historial
+        if instrumentacion is None:
+            estado_actual = self._registrar()
+            if self.trayectoria is not None:
+                self.trayectoria.agregar(self.tiempo_actual, self.redondel.obtener_columnas())
+        else:
+            with instrumentacion.medir('registro'):
+                estado_actual = self._registrar()
+            if self.trayectoria is not None:
+                with instrumentacion.medir('trayectoria'):
+                    self.trayectoria.agregar(self.tiempo_actual, self.redondel.obtener_columnas())
+        
+        # Verificar si la simulación debe terminar
+        if (self.simulacion_iniciada and 
+            self.tiempo_actual > self.tiempo_inicio_frenado + DURACION_FRENADO + 10):
+            self.simulacion_terminada = True
+            
+        if instrumentacion is not None:
+            instrumentacion.contar('pasos')
+            instrumentacion.registrar('paso', inicio_paso, perf_counter())
+            
+        return estado_actual
+        
+    def _paso_adaptativo(self, limite):
+        """
+        Da un paso del integrador adaptativo: libre si ninguna regla puede
+        activarse (el reloj llega exactamente al fin del paso) o con las
+        reglas y detección continua de colisiones (ver `_paso_reglas`)
+        """
+        fin = self._fin_paso_libre(limite)
+        if fin is not None:
+            self.redondel.avanzar_libre(fin - self.tiempo_actual)
+            self.tiempo_actual = fin
+            return
+            
+        # Las reglas de reacción dependen del paso: con un `dt` grueso se
+        # frena y se reacciona tarde, así que cerca de los eventos el paso
+        # no supera `PASO_REGLAS`
+        paso = self._paso_reglas()
+        brechas = self.redondel.brechas()
+        self.redondel.actualizar(paso, self.distancia_seguridad)
+        for instante, id_vehiculo, id_adelante in sorted(self.redondel.contactos(brechas, paso)):
+            self.contactos.append({'tiempo': self.tiempo_actual + instante,
+                                   'vehiculo': id_vehiculo,
+                                   'adelante': id_adelante})
+        self.tiempo_actual += paso
+        
+    def _paso_reglas(self):
+        """Paso del integrador adaptativo cuando se aplican las reglas"""
+        return min(self.dt, PASO_REGLAS)
+        
+    def _registrar(self):
+        """
+        Guarda el paso actual en el historial según el modo de registro
+        
+        Returns:
+            dict: Registro guardado, o None si no se guardó nada
+        """
+        if self.registro == REGISTRO_NINGUNO:
+            return None
+            
+        if self.registro == REGISTRO_RESUMEN:
+            estado_actual = {'tiempo': self.tiempo_actual, **self.redondel.obtener_resumen()}
+            self.historial.append(estado_actual)
+            return estado_actual
+            
+        if self.registro == REGISTRO_COLUMNAR:
+            columnas = self.redondel.obtener_columnas()
+            self.historial['tiempo'].append(self.tiempo_actual)
+            for clave, valores in columnas.items():
+                self.historial[clave].append(valores)
+            return {'tiempo': self.tiempo_actual, **columnas}
+            
+        if self.registro == REGISTRO_INTERVALO and self.pasos % self.intervalo_registro:
+            return None
+        if self.registro == REGISTRO_FRENADO and not self.redondel.hay_perturbacion():
+            return None
+            
+        if self.instrumentacion is None:
+            vehiculos = self.redondel.obtener_estados()
+            hay_colisiones = self.redondel.hay_colisiones()
+        else:
+            with self.instrumentacion.medir('estados'):
+                vehiculos = self.redondel.obtener_estados()
+            with self.instrumentacion.medir('colisiones'):
+                hay_colisiones = self.redondel.hay_colisiones()
+            self.instrumentacion.contar('registros')
+            self.instrumentacion.contar('estados_creados', len(vehiculos))
+            
         estado_actual = {
             'tiempo': self.tiempo_actual,
-            'vehiculos': self.redondel.obtener_estados(),
-            'hay_colisiones': self.redondel.hay_colisiones()
+            'vehiculos': vehiculos,
+            'hay_colisiones': hay_colisiones
         }
         self.historial.append(estado_actual)
+        return estado_actual
         
-        # Verificar si la simulación debe terminar
+    def obtener_historial(self):
+        """
+        Obtiene el historial registrado
+        
+        Returns:
+            list | dict: Lista de registros por paso o, con `REGISTRO_COLUMNAR`,
+            un diccionario de arreglos NumPy (`tiempo` de forma (pasos,) y el
+            resto de forma (pasos, vehículos), columnas ordenadas por ID)
+        """
+        if self.registro != REGISTRO_COLUMNAR:
+            return self.historial
+            
+        import numpy as np
+        return {clave: np.asarray(valores) for clave, valores in self.historial.items()}
+        
+    def instantanea(self):
+        """
+        Obtiene el estado actual de los vehículos como arreglos NumPy de solo
+        lectura, sin crear un diccionario por vehículo (ver
+        `models/instantanea.py`). Con el motor vectorizado son vistas que
+        solo valen hasta el próximo paso; `copiar()` las conserva.
+        
+        Returns:
+            Instantanea: Estado de los vehículos
+        """
+        return self.redondel.instantanea()
+        
+    def en_equilibrio(self, tolerancia=0.0):
+        """
+        Indica si el resultado de la simulación ya no puede cambiar: el
+        frenado del vehículo problema empezó y terminó, todos circulan a
+        velocidad normal y no quedan tiempos de reacción pendientes
+        
+        Args:
+            tolerancia (float): Diferencia de velocidad admitida (con 0 el
+                criterio es exacto y los resultados no cambian)
+            
+        Returns:
+            bool: True si la simulación volvió a régimen estable
+        """
+        return self.simulacion_iniciada and self.redondel.en_equilibrio(tolerancia)
+        
+    def avanzar_en_reposo(self, duracion):
+        """
+        Salta de una vez los pasos en que el redondel está en reposo (todos a
+        velocidad normal, nadie frena ni espera su tiempo de reacción) hasta
+        el próximo evento: el inicio del frenado o el fin de la corrida. El
+        estado resultante es idéntico al de avanzar paso a paso.
+        
+        Solo se aplica sin historial por paso (`REGISTRO_NINGUNO`) ni
+        trayectoria, ya que los pasos saltados no se registran.
+        
+        Args:
+            duracion (float): Fin de la corrida
+            
+        Returns:
+            int: Pasos saltados (0 si no está en reposo)
+        """
+        if self.registro != REGISTRO_NINGUNO or self.trayectoria is not None:
+            return 0
+        if not self.redondel.en_equilibrio():
+            return 0
+            
+        # El frenado se inicia al comienzo del primer paso con tiempo >= inicio
+        limite = duracion
+        if self.tiempo_inicio_frenado is not None and not self.simulacion_iniciada:
+            limite = min(duracion, self.tiempo_inicio_frenado)
+        pasos, tiempo = contar_pasos(self.tiempo_actual, self.dt, limite)
+        if not pasos:
+            return 0
+            
+        self.redondel.avanzar_en_reposo(self.dt, pasos)
+        self.tiempo_actual = tiempo
+        self.pasos += pasos
         if (self.simulacion_iniciada and 
             self.tiempo_actual > self.tiempo_inicio_frenado + DURACION_FRENADO + 10):
             self.simulacion_terminada = True
-            
-        return estado_actual
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar('pasos_saltados', pasos)
+        return pasos
         
-    def ejecutar_completa(self, duracion=30.0, tiempo_inicio_frenado=5.0, seed=None):
+    def ejecutar_completa(self, duracion=30.0, tiempo_inicio_frenado=5.0, seed=None,
+                          detener_en_equilibrio=False, tolerancia_equilibrio=0.0,
+                          saltar_reposo=False):
         """
         Ejecuta la simulación completa
         
@@ -103,31 +415,219 @@ class Simulacion:
             duracion (float): Duración total de la simulación en segundos
             tiempo_inicio_frenado (float): Tiempo en que inicia el frenado
             seed (int, optional): Semilla para reproducibilidad
+            detener_en_equilibrio (bool): Terminar antes de `duracion` en cuanto
+                el redondel vuelve a régimen estable (ver `en_equilibrio`)
+            tolerancia_equilibrio (float): Tolerancia de velocidad del criterio
+            saltar_reposo (bool): Saltar los tramos en reposo en lugar de
+                integrarlos paso a paso (ver `avanzar_en_reposo`)
             
         Returns:
-            dict: Resultados de la simulación
+            dict: Resultados de la simulación (con `instrumentacion` si la
+            simulación está instrumentada y, con `detener_en_equilibrio`,
+            `tiempo_final`, el instante en que terminó). `contactos` lista las colisiones
+            localizadas por el integrador adaptativo: instante exacto,
+            vehículo y vehículo de adelante
         """
-        # Seleccionar vehículo problema
-        vehiculo_id = self.seleccionar_vehiculo_aleatorio(seed)
+        # Sortear los conductores y seleccionar el vehículo problema
+        self.asignar_conductores(seed)
+        self.seleccionar_vehiculo_aleatorio(seed)
         self.iniciar_frenado(tiempo_inicio_frenado)
         
-        # Ejecutar simulación
+        return self.continuar(duracion, detener_en_equilibrio, tolerancia_equilibrio,
+                              saltar_reposo)
+        
+    def continuar(self, duracion=30.0, detener_en_equilibrio=False, tolerancia_equilibrio=0.0,
+                  saltar_reposo=False):
+        """
+        Ejecuta la simulación desde el estado actual hasta `duracion`. Permite
+        completar una corrida restaurada con `restaurar_estado` o
+        `cargar_checkpoint`; los argumentos son los de `ejecutar_completa`.
+        
+        Returns:
+            dict: Resultados de la simulación (ver `ejecutar_completa`)
+        """
+        instrumentacion = self.instrumentacion
         while self.tiempo_actual < duracion:
-            self.actualizar()
+            # Tras el frenado, con `detener_en_equilibrio` el reposo ya termina la corrida
+            if (saltar_reposo and not (detener_en_equilibrio and self.simulacion_iniciada)
+                    and self.avanzar_en_reposo(duracion)):
+                continue
+            self.actualizar(duracion)
+            if detener_en_equilibrio:
+                if instrumentacion is None:
+                    equilibrio = self.en_equilibrio(tolerancia_equilibrio)
+                else:
+                    with instrumentacion.medir('equilibrio'):
+                        equilibrio = self.en_equilibrio(tolerancia_equilibrio)
+                if equilibrio:
+                    self.simulacion_terminada = True
+                    break
             
         # Recopilar resultados
         resultados = {
-            'vehiculo_problema_id': vehiculo_id,
+            'vehiculo_problema_id': (self.vehiculo_problema.id
+                                     if self.vehiculo_problema is not None else None),
             'hubo_colisiones': self.redondel.hay_colisiones(),
             'vehiculos_afectados': self.redondel.contar_vehiculos_afectados(),
-            'total_vehiculos': len(self.redondel.vehiculos),
+            'total_vehiculos': self.redondel.num_vehiculos,
             'distancia_seguridad': self.distancia_seguridad,
             'duracion': duracion,
-            'historial': self.historial
+            'contactos': list(self.contactos),
+            'historial': self.obtener_historial()
         }
+        if detener_en_equilibrio:
+            resultados['tiempo_final'] = self.tiempo_actual
+        if instrumentacion is not None:
+            resultados['instrumentacion'] = instrumentacion.resumen()
         
         return resultados
         
+    def avanzar_hasta(self, tiempo, saltar_reposo=False):
+        """
+        Avanza la simulación hasta que el reloj alcance `tiempo`
+        
+        Args:
+            tiempo (float): Instante objetivo
+            saltar_reposo (bool): Saltar los tramos en reposo (ver `avanzar_en_reposo`)
+        """
+        while self.tiempo_actual < tiempo:
+            if saltar_reposo and self.avanzar_en_reposo(tiempo):
+                continue
+            self.actualizar(tiempo)
+            
+    def guardar_estado(self, incluir_historial=True):
+        """
+        Obtiene un punto de control con todo el estado de la simulación: reloj,
+        vehículos, vehículo problema y generador aleatorio. Es un diccionario
+        de valores simples, copiable y serializable, a partir del cual
+        `restaurar_estado` continúa exactamente igual que la simulación
+        original.
+        
+        Args:
+            incluir_historial (bool): Incluir el historial registrado hasta ahora
+            
+        Returns:
+            dict: Estado de la simulación
+        """
+        historial = None
+        if incluir_historial:
+            historial = self._copiar_historial(self.historial)
+        return {
+            'parametros': {
+                'num_vehiculos': self.redondel.num_vehiculos,
+                'radio': self.redondel.radio,
+                'distancia_seguridad': self.distancia_seguridad,
+                'dt': self.dt,
+                'motor': self.motor,
+                'registro': self.registro,
+                'intervalo_registro': self.intervalo_registro,
+                'integrador': self.integrador,
+                'paso_maximo': self.paso_maximo,
+                'poblacion': self.poblacion.describir() if self.poblacion is not None else None
+            },
+            'tiempo_actual': self.tiempo_actual,
+            'tiempo_inicio_frenado': self.tiempo_inicio_frenado,
+            'vehiculo_problema_id': (self.vehiculo_problema.id
+                                     if self.vehiculo_problema is not None else None),
+            'simulacion_iniciada': self.simulacion_iniciada,
+            'simulacion_terminada': self.simulacion_terminada,
+            'pasos': self.pasos,
+            'contactos': [dict(c) for c in self.contactos],
+            'rng': self.rng.getstate() if self.rng is not None else None,
+            'redondel': self.redondel.guardar_estado(),
+            'historial': historial
+        }
+        
+    def _copiar_historial(self, historial):
+        """Copia el historial (los registros no se modifican, basta copiar las listas)"""
+        if isinstance(historial, dict):
+            return {clave: list(valores) for clave, valores in historial.items()}
+        return list(historial)
+        
+    def restaurar_estado(self, estado):
+        """
+        Restablece un estado obtenido con `guardar_estado`. Puede provenir de
+        otro motor; los parámetros del redondel se toman del estado.
+        
+        Args:
+            estado (dict): Estado guardado
+        """
+        self.distancia_seguridad = estado['parametros']['distancia_seguridad']
+        self.dt = estado['parametros']['dt']
+        self.redondel.restaurar_estado(estado['redondel'])
+        self.tiempo_actual = estado['tiempo_actual']
+        self.tiempo_inicio_frenado = estado['tiempo_inicio_frenado']
+        self.simulacion_iniciada = estado['simulacion_iniciada']
+        self.simulacion_terminada = estado['simulacion_terminada']
+        self.pasos = estado['pasos']
+        self.contactos = [dict(c) for c in estado.get('contactos', [])]
+        self.vehiculo_problema = None
+        if estado['vehiculo_problema_id'] is not None:
+            self.vehiculo_problema = self.redondel.obtener_vehiculo_por_id(
+                estado['vehiculo_problema_id'])
+        self.rng = None
+        if estado['rng'] is not None:
+            self.rng = random.Random()
+            self.rng.setstate(estado['rng'])
+        if estado['historial'] is not None:
+            self.historial = self._copiar_historial(estado['historial'])
+        else:
+            self.historial = self._historial_vacio()
+            
+    @classmethod
+    def desde_estado(cls, estado, **opciones):
+        """
+        Crea una simulación a partir de un estado de `guardar_estado`
+        
+        Args:
+            estado (dict): Estado guardado
+            **opciones: Argumentos de `Simulacion` que reemplazan a los
+                guardados (por ejemplo `motor`, `trayectoria` o `instrumentacion`)
+            
+        Returns:
+            Simulacion: Simulación lista para `continuar`
+        """
+        simulacion = cls(**dict(estado['parametros'], **opciones))
+        simulacion.restaurar_estado(estado)
+        return simulacion
+        
+    def guardar_checkpoint(self, ruta):
+        """
+        Guarda el estado en disco (de forma atómica) para reanudar la corrida
+        con `cargar_checkpoint`
+        
+        Args:
+            ruta (str): Archivo de destino
+            
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        # Importación diferida: solo los puntos de control usan estos módulos
+        import pickle
+        import tempfile
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        fd, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(self.guardar_estado(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+        return ruta
+        
+    @classmethod
+    def cargar_checkpoint(cls, ruta, **opciones):
+        """
+        Crea una simulación a partir de un archivo de `guardar_checkpoint`
+        
+        Args:
+            ruta (str): Archivo guardado
+            **opciones: Ver `desde_estado`
+            
+        Returns:
+            Simulacion: Simulación lista para `continuar`
+        """
+        import pickle
+        with open(ruta, 'rb') as f:
+            return cls.desde_estado(pickle.load(f), **opciones)
+        
     def obtener_estadisticas(self):
         """
         Obtiene estadísticas de la simulación
@@ -139,17 +639,20 @@ class Simulacion:
             'tiempo_actual': self.tiempo_actual,
             'hubo_colisiones': self.redondel.hay_colisiones(),
             'vehiculos_afectados': self.redondel.contar_vehiculos_afectados(),
-            'total_vehiculos': len(self.redondel.vehiculos),
+            'total_vehiculos': self.redondel.num_vehiculos,
             'simulacion_iniciada': self.simulacion_iniciada,
             'simulacion_terminada': self.simulacion_terminada
         }
         
     def reiniciar(self):
         """Reinicia la simulación"""
-        self.redondel = Redondel(self.redondel.radio, self.redondel.num_vehiculos)
+        self.redondel = self._crear_redondel(self.redondel.radio, self.redondel.num_vehiculos)
         self.tiempo_actual = 0.0
         self.tiempo_inicio_frenado = None
         self.vehiculo_problema = None
         self.simulacion_iniciada = False
         self.simulacion_terminada = False
-        self.historial = []
\ No newline at end of file
+        self.rng = None
+        self.pasos = 0
+        self.contactos = []
+        self.historial = self._historial_vacio()
\ No newline at end of file
@@ -0,0 +1,358 @@
+import os
+import queue
+import random
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.simulacion import contar_pasos
+from models.red import Red, FragmentoRed, CAMPOS_TRASPASO
+from utils.constantes import DT, DISTANCIA_SEGURIDAD
+
+# Registro de un vehículo que cambia de proceso (ver `VehiculoRed.a_registro`)
+TIPO_TRASPASO = np.dtype(list(CAMPOS_TRASPASO))
+
+# Vehículos que un enlace puede recibir por paso: hace falta la distancia de
+# seguridad libre al comienzo, así que con DT y velocidades normales es uno
+TRASPASOS_POR_ENLACE = 8
+
+# Segundos sin noticias de un proceso antes de revisar si sigue vivo
+ESPERA_RESULTADOS = 1.0
+
+
+class ColaFrontera:
+    """
+    Cola en memoria compartida de un fragmento de la red a otro, para el
+    intercambio de cada paso: los vehículos que toman un enlace del otro
+    fragmento y la posición del último vehículo de los enlaces propios que
+    salen de él (el otro la necesita para saber si hay lugar).
+
+    Tiene dos mitades y el paso `p` usa la `p % 2`: entre la escritura del
+    paso `p` y su lectura hay una barrera, y nadie vuelve a escribir esa
+    mitad (paso `p + 2`) sin pasar la barrera del paso `p + 1`, a la que el
+    lector solo llega después de leer. Así basta una barrera por paso.
+    """
+
+    def __init__(self, nombre: Optional[str] = None, capacidad: int = 1, num_ultimos: int = 0,
+                 crear: bool = False):
+        """
+        Args:
+            nombre: Nombre del bloque de memoria compartida (al crearla, None
+                para que lo elija el sistema)
+            capacidad: Vehículos por paso
+            num_ultimos: Enlaces cuya última posición se envía
+            crear: Crear el bloque (el proceso principal) o abrir uno existente
+        """
+        self.capacidad = max(1, capacidad)
+        self.num_ultimos = num_ultimos
+        mitad = 8 * (1 + num_ultimos) + self.capacidad * TIPO_TRASPASO.itemsize
+        self._memoria = shared_memory.SharedMemory(name=nombre, create=crear,
+                                                   size=2 * mitad if crear else 0)
+        self.nombre = self._memoria.name
+        buffer = self._memoria.buf
+        self._mitades = []
+        for inicio in (0, mitad):
+            self._mitades.append((
+                np.ndarray((1,), np.int64, buffer, inicio),
+                np.ndarray((num_ultimos,), np.float64, buffer, inicio + 8),
+                np.ndarray((self.capacidad,), TIPO_TRASPASO, buffer, inicio + 8 * (1 + num_ultimos)),
+            ))
+
+    def descripcion(self) -> tuple:
+        """Argumentos para abrir la cola desde otro proceso"""
+        return self.nombre, self.capacidad, self.num_ultimos
+
+    def escribir(self, paso: int, registros: list, ultimos: list):
+        """
+        Args:
+            paso: Paso de la simulación
+            registros: Tuplas de `VehiculoRed.a_registro`
+            ultimos: Posición del último vehículo de cada enlace
+        """
+        conteo, posiciones, destino = self._mitades[paso % 2]
+        if len(registros) > self.capacidad:
+            raise RuntimeError(f'{len(registros)} traspasos en un paso superan la capacidad '
+                               f'de la cola ({self.capacidad})')
+        if registros:
+            destino[:len(registros)] = registros
+        posiciones[:] = ultimos
+        conteo[0] = len(registros)
+
+    def leer(self, paso: int) -> tuple:
+        """
+        Returns:
+            tuple: (registros, últimas posiciones) escritos en `paso`
+        """
+        conteo, posiciones, registros = self._mitades[paso % 2]
+        return registros[:int(conteo[0])].tolist(), posiciones.tolist()
+
+    def cerrar(self):
+        self._mitades = []  # las vistas deben liberarse antes de cerrar el bloque
+        self._memoria.close()
+
+    def eliminar(self):
+        self._memoria.unlink()
+
+
+def _avanzar(fragmento: FragmentoRed, pasos: int, salidas: dict, entradas: dict,
+             destino_enlace: dict, barrera=None):
+    """
+    Avanza `pasos` pasos un fragmento intercambiando las fronteras en cada uno
+
+    Args:
+        salidas: Por fragmento vecino, (cola hacia él, enlaces cuya última
+            posición se le envía)
+        entradas: Por fragmento vecino, (cola desde él, enlaces cuya última
+            posición se recibe)
+        destino_enlace: Fragmento dueño de cada enlace de salida remoto
+        barrera: Barrera compartida por todos los procesos (sin vecinos, None)
+    """
+    for paso in range(pasos):
+        grupos = {vecino: [] for vecino in salidas}
+        for vehiculo in fragmento.avanzar():
+            grupos[destino_enlace[vehiculo.salida]].append(vehiculo.a_registro())
+        for vecino, (cola, enlaces) in salidas.items():
+            cola.escribir(paso, grupos[vecino], fragmento.ultimos(enlaces))
+        if barrera is not None:
+            barrera.wait()
+            ultimos = {}
+            for cola, enlaces in entradas.values():
+                registros, posiciones = cola.leer(paso)
+                fragmento.recibir(registros)
+                ultimos.update(zip(enlaces, posiciones))
+            fragmento.actualizar_ultimos(ultimos)
+        fragmento.terminar_paso()
+
+
+def _ejecutar_fragmento(indice, red, redondeles, opciones, pasos, salidas, entradas,
+                        destino_enlace, barrera, resultados):
+    """Proceso de un fragmento: avanza la corrida y envía su resumen"""
+    colas = []
+
+    def abrir(extremos):
+        abiertas = {}
+        for vecino, (descripcion, enlaces) in extremos.items():
+            cola = ColaFrontera(*descripcion)
+            colas.append(cola)
+            abiertas[vecino] = (cola, enlaces)
+        return abiertas
+
+    try:
+        fragmento = FragmentoRed(red, redondeles, **opciones)
+        _avanzar(fragmento, pasos, abrir(salidas), abrir(entradas), destino_enlace, barrera)
+        resultados.put((indice, fragmento.resumen(), None))
+    except BaseException:
+        # Los demás procesos no deben quedar esperando en la barrera
+        barrera.abort()
+        resultados.put((indice, None, traceback.format_exc()))
+    finally:
+        for cola in colas:
+            cola.cerrar()
+
+
+class SimulacionRed:
+    """
+    Simula una `Red` de redondeles repartida entre procesos.
+
+    Cada proceso avanza un bloque de redondeles consecutivos
+    (`Red.particionar`) con un `FragmentoRed`. En cada paso los procesos
+    vecinos intercambian por `ColaFrontera` los vehículos que cruzan de
+    bloque y la ocupación de los enlaces de borde, y se sincronizan con
+    una barrera. Como los fragmentos solo usan datos del comienzo del paso
+    para lo que ocurre en el borde, el resultado no depende del número de
+    procesos: con la misma semilla es idéntico al de un solo proceso.
+    """
+
+    def __init__(self, red: Red, distancia_seguridad: float = DISTANCIA_SEGURIDAD,
+                 dt: float = DT, procesos: Optional[int] = None, intervalo_muestreo: int = 10):
+        """
+        Args:
+            red: Topología de la red
+            distancia_seguridad: Distancia de seguridad entre vehículos
+            dt: Intervalo de tiempo de cada paso
+            procesos: Procesos a usar (por defecto, uno por núcleo); con 1
+                la red se simula en este proceso
+            intervalo_muestreo: Pasos entre muestras por redondel
+        """
+        if not red.redondeles:
+            raise ValueError('La red no tiene redondeles')
+        self.red = red
+        self.distancia_seguridad = distancia_seguridad
+        self.dt = dt
+        self.procesos = procesos or os.cpu_count() or 1
+        self.intervalo_muestreo = intervalo_muestreo
+
+    def ejecutar(self, duracion: float = 60.0, tiempo_inicio_frenado: Optional[float] = 5.0,
+                 redondel_problema: int = 0, seed: Optional[int] = None) -> dict:
+        """
+        Ejecuta una corrida
+
+        Args:
+            duracion: Duración en segundos
+            tiempo_inicio_frenado: Instante en que frena un vehículo de
+                `redondel_problema` (None: corrida sin perturbación, útil como
+                referencia con la misma semilla)
+            redondel_problema: Redondel donde se sortea el vehículo que frena
+            seed: Semilla de las llegadas, las salidas y el vehículo problema
+
+        Returns:
+            dict: Totales de la red, listas `por_redondel` (ingresos, salidas,
+            frenadas por reacción y vehículos al final, incluidos sus enlaces
+            de llegada) y `muestras` cada `intervalo_muestreo` pasos
+            (`velocidad_media`, `vehiculos` y `frenadas`: una lista por
+            muestra con un valor por redondel)
+        """
+        if not 0 <= redondel_problema < len(self.red.redondeles):
+            raise ValueError(f"Redondel desconocido: {redondel_problema!r}")
+        semilla = seed if seed is not None else random.getrandbits(32)
+        pasos, _ = contar_pasos(0.0, self.dt, duracion)
+        opciones = {
+            'distancia_seguridad': self.distancia_seguridad,
+            'dt': self.dt,
+            'semilla': semilla,
+            'redondel_problema': redondel_problema,
+            'tiempo_inicio_frenado': tiempo_inicio_frenado,
+            'intervalo_muestreo': self.intervalo_muestreo,
+        }
+        bloques = self.red.particionar(self.procesos)
+        if len(bloques) == 1:
+            fragmento = FragmentoRed(self.red, bloques[0], **opciones)
+            _avanzar(fragmento, pasos, {}, {}, {})
+            partes = [fragmento.resumen()]
+        else:
+            partes = self._ejecutar_en_procesos(bloques, opciones, pasos)
+
+        resultados = self._combinar(partes)
+        resultados.update({
+            'semilla': semilla,
+            'procesos': len(bloques),
+            'duracion': duracion,
+            'tiempo_inicio_frenado': tiempo_inicio_frenado,
+            'redondel_problema': redondel_problema,
+        })
+        return resultados
+
+    def _fronteras(self, bloques: List[list]) -> tuple:
+        """
+        Returns:
+            tuple: (enlaces que cruzan de cada bloque a otro, enlaces cuya
+            última posición cada bloque envía a otro, dueño de cada enlace
+            que cruza), los dos primeros por par (origen, destino)
+        """
+        dueno = {r: indice for indice, bloque in enumerate(bloques) for r in bloque}
+        traspasos: Dict[tuple, list] = {}
+        ultimos: Dict[tuple, list] = {}
+        destino_enlace = {}
+        for indice, enlace in enumerate(self.red.enlaces):
+            if enlace['origen'] is None:
+                continue
+            origen, destino = dueno[enlace['origen']], dueno[enlace['destino']]
+            if origen != destino:
+                traspasos.setdefault((origen, destino), []).append(indice)
+                ultimos.setdefault((destino, origen), []).append(indice)
+                destino_enlace[indice] = destino
+        return traspasos, ultimos, destino_enlace
+
+    def _ejecutar_en_procesos(self, bloques: List[list], opciones: dict, pasos: int) -> List[dict]:
+        """Un proceso por bloque, con una `ColaFrontera` por par de bloques vecinos"""
+        traspasos, ultimos, destino_enlace = self._fronteras(bloques)
+        contexto = multiprocessing.get_context()
+        barrera = contexto.Barrier(len(bloques))
+        resultados = contexto.Queue()
+        colas = {}
+        procesos = []
+        try:
+            for par in set(traspasos) | set(ultimos):
+                colas[par] = ColaFrontera(
+                    capacidad=TRASPASOS_POR_ENLACE * len(traspasos.get(par, ())),
+                    num_ultimos=len(ultimos.get(par, ())), crear=True)
+            for indice, bloque in enumerate(bloques):
+                salidas = {destino: (cola.descripcion(), ultimos.get((origen, destino), []))
+                           for (origen, destino), cola in colas.items() if origen == indice}
+                entradas = {origen: (cola.descripcion(), ultimos.get((origen, destino), []))
+                            for (origen, destino), cola in colas.items() if destino == indice}
+                proceso = contexto.Process(
+                    target=_ejecutar_fragmento, daemon=True,
+                    args=(indice, self.red, bloque, opciones, pasos, salidas, entradas,
+                          destino_enlace, barrera, resultados))
+                proceso.start()
+                procesos.append(proceso)
+            return self._recoger(procesos, barrera, resultados)
+        finally:
+            for proceso in procesos:
+                proceso.join(timeout=ESPERA_RESULTADOS)
+                if proceso.is_alive():
+                    proceso.terminate()
+            for cola in colas.values():
+                cola.cerrar()
+                cola.eliminar()
+
+    def _recoger(self, procesos: list, barrera, resultados) -> List[dict]:
+        """
+        Espera el resumen de cada proceso
+
+        Raises:
+            RuntimeError: Si algún proceso falló o terminó sin resultados
+        """
+        partes: List[Optional[dict]] = [None] * len(procesos)
+        errores = []
+        pendientes = len(procesos)
+        while pendientes:
+            try:
+                indice, resumen, error = resultados.get(timeout=ESPERA_RESULTADOS)
+            except queue.Empty:
+                caidos = [p.exitcode for p in procesos if p.exitcode not in (None, 0)]
+                if caidos:
+                    barrera.abort()
+                    raise RuntimeError(f'Un proceso de la red terminó sin resultados '
+                                       f'(código {caidos[0]})')
+                continue
+            pendientes -= 1
+            if error is not None:
+                errores.append(error)
+            else:
+                partes[indice] = resumen
+        if errores:
+            # El primer error real: el resto son procesos liberados de la barrera
+            originales = [e for e in errores if 'BrokenBarrierError' not in e] or errores
+            raise RuntimeError(f'Falló un proceso de la red:\n{originales[0]}')
+        return partes
+
+    def _combinar(self, partes: List[dict]) -> dict:
+        """Reúne los resúmenes de los fragmentos en el orden de los redondeles"""
+        num_redondeles = len(self.red.redondeles)
+        por_redondel = {clave: [0] * num_redondeles
+                        for clave in ('ingresos', 'salidas', 'frenadas', 'vehiculos')}
+        muestras = {'tiempo': partes[0]['muestras']['tiempo']}
+        for clave in ('velocidad_media', 'vehiculos', 'frenadas'):
+            muestras[clave] = [[None] * num_redondeles for _ in muestras['tiempo']]
+        for parte in partes:
+            for posicion, redondel in enumerate(parte['redondeles']):
+                for clave, valores in por_redondel.items():
+                    valores[redondel] = parte[clave][posicion]
+                for clave in ('velocidad_media', 'vehiculos', 'frenadas'):
+                    for fila, valores in zip(muestras[clave], parte['muestras'][clave]):
+                        fila[redondel] = valores[posicion]
+
+        def total(clave):
+            return sum(parte[clave] for parte in partes)
+
+        salidos = total('salidos')
+        problema = [p['vehiculo_problema_id'] for p in partes if p['vehiculo_problema_id'] is not None]
+        return {
+            'num_redondeles': num_redondeles,
+            'tiempo_final': partes[0]['tiempo'],
+            'vehiculo_problema_id': problema[0] if problema else None,
+            'vehiculos_generados': total('generados'),
+            'vehiculos_en_espera': total('en_espera'),
+            'vehiculos_salidos': salidos,
+            'vehiculos_en_red': sum(por_redondel['vehiculos']),
+            'tiempo_viaje_medio': total('pasos_viaje') * self.dt / salidos if salidos else None,
+            'vehiculos_colisionados': total('colisionados'),
+            'vehiculos_afectados': total('afectados'),
+            'por_redondel': por_redondel,
+            'muestras': muestras,
+        }
@@ -0,0 +1,352 @@
+"""
+Experimentos Monte Carlo largos repartidos en fragmentos reanudables.
+
+Uso (desde la raíz del proyecto, en uno o varios procesos o máquinas que
+compartan la carpeta del trabajo):
+
+    python -m core.trabajos ejecutar trabajo_ds
+    python -m core.trabajos estado trabajo_ds
+    python -m core.trabajos combinar trabajo_ds --salida resultados.csv
+
+El trabajo se crea desde Python con `TrabajoMonteCarlo.crear`.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+from contextlib import contextmanager
+from typing import Iterable, List, Optional
+
+from core.montecarlo import MonteCarlo, guardar_filas, resumir_corridas
+
+VERSION_MANIFIESTO = 1
+
+# Segundos sin latido tras los cuales un fragmento reclamado se da por abandonado
+CADUCIDAD_RECLAMO = 600.0
+
+
+def _escribir_json(ruta: str, datos):
+    """Escribe `datos` en `ruta` de forma atómica"""
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(datos, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def _leer_json(ruta: str):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _bloquear(archivo):
+    """
+    Bloqueo exclusivo de `archivo`, esperando a que se libere. Lo administra
+    el sistema operativo (`flock`, o `msvcrt.locking` en Windows): se libera
+    al cerrar el archivo o si el proceso muere, así que nunca queda huérfano
+    y no hay que romperlo. En Linux `flock` también bloquea entre máquinas
+    sobre NFS.
+    """
+    if os.name == 'nt':
+        # Importación diferida: cada plataforma tiene su módulo de bloqueos
+        import msvcrt
+        archivo.seek(0)
+        while True:
+            try:
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # `LK_LOCK` se rinde tras unos 10 s de espera
+                continue
+    import fcntl
+    fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+
+
+class _Latido:
+    """
+    Sumidero de `MonteCarlo.run` que, con cada corrida terminada, renueva la
+    fecha del reclamo para que otros procesos no lo den por abandonado
+    """
+
+    def __init__(self, ruta: str, intervalo: float = 5.0):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._ultimo = time.time()
+
+    def agregar(self, fila: dict, particion: Optional[dict] = None):
+        ahora = time.time()
+        if ahora - self._ultimo >= self.intervalo:
+            try:
+                os.utime(self.ruta)
+            except OSError:
+                pass
+            self._ultimo = ahora
+
+
+class TrabajoMonteCarlo:
+    """
+    Experimento Monte Carlo descrito por un manifiesto y dividido en
+    fragmentos (un punto de parámetros y un bloque de semillas).
+
+    La carpeta del trabajo contiene `manifiesto.json`, un reclamo por
+    fragmento en curso (`reclamados/`) y un resultado parcial por fragmento
+    terminado (`parciales/`). Cualquier número de procesos, en una o varias
+    máquinas que compartan la carpeta, toma fragmentos de la cola con
+    `ejecutar`; la cola se protege con un bloqueo del sistema operativo
+    sobre `cola.lock`. Cada parcial se escribe de forma atómica, así que una
+    interrupción pierde como mucho los fragmentos en curso: al reanudar se
+    saltan los terminados y los reclamos sin latido durante
+    `caducidad` segundos vuelven a la cola. `combinar` reúne los parciales
+    en la tabla final.
+    """
+
+    def __init__(self, directorio: str, caducidad: float = CADUCIDAD_RECLAMO):
+        """
+        Args:
+            directorio: carpeta de un trabajo creado con `crear`.
+            caducidad: segundos sin latido tras los cuales un reclamo se
+                considera abandonado.
+        """
+        self.directorio = directorio
+        self.caducidad = float(caducidad)
+        self.manifiesto = _leer_json(os.path.join(directorio, 'manifiesto.json'))
+        if self.manifiesto.get('version') != VERSION_MANIFIESTO:
+            raise ValueError(f"Versión de manifiesto no soportada: {self.manifiesto.get('version')!r}")
+        self.trabajador = f'{socket.gethostname()}:{os.getpid()}'
+        self._montecarlos = {}  # índice de punto -> MonteCarlo (reutiliza prefijo y clases)
+        self._runs = []
+        self._filas = []
+        os.makedirs(os.path.join(directorio, 'reclamados'), exist_ok=True)
+        os.makedirs(os.path.join(directorio, 'parciales'), exist_ok=True)
+
+    @classmethod
+    def crear(cls, directorio: str, puntos: Optional[List[dict]] = None,
+              seeds: Iterable[int] = range(100), tamano_fragmento: int = 100,
+              **opciones) -> 'TrabajoMonteCarlo':
+        """
+        Crea el manifiesto de un trabajo. Si la carpeta ya tiene el mismo
+        manifiesto se reutiliza (reanudación); si tiene otro, es un error.
+
+        Args:
+            directorio: carpeta del trabajo (se crea si no existe).
+            puntos: parámetros de `MonteCarlo` de cada punto, por ejemplo
+                `Barrido(...).puntos()`; por defecto un solo punto.
+            seeds: semillas que se ejecutan en cada punto.
+            tamano_fragmento: semillas por fragmento.
+            **opciones: parámetros de `MonteCarlo` comunes a todos los puntos
+                (`duracion`, `motor`, ...).
+
+        Returns:
+            TrabajoMonteCarlo: el trabajo listo para `ejecutar`.
+        """
+        puntos = [dict(p) for p in (puntos or [{}])]
+        seeds = [int(s) for s in seeds]
+        tamano_fragmento = max(1, int(tamano_fragmento))
+        fragmentos = []
+        for indice in range(len(puntos)):
+            for inicio in range(0, len(seeds), tamano_fragmento):
+                fragmentos.append({'id': f'{len(fragmentos):06d}', 'punto': indice,
+                                   'seeds': seeds[inicio:inicio + tamano_fragmento]})
+        manifiesto = {
+            'version': VERSION_MANIFIESTO,
+            'opciones': opciones,
+            'puntos': puntos,
+            'fragmentos': fragmentos
+        }
+        # Normalizar como quedaría tras leerlo de disco (tuplas -> listas, ...)
+        manifiesto = json.loads(json.dumps(manifiesto))
+
+        os.makedirs(directorio, exist_ok=True)
+        ruta = os.path.join(directorio, 'manifiesto.json')
+        if os.path.exists(ruta):
+            if _leer_json(ruta) != manifiesto:
+                raise ValueError(f'{directorio} ya contiene otro trabajo.')
+        else:
+            _escribir_json(ruta, manifiesto)
+        return cls(directorio)
+
+    def _ruta_reclamo(self, fragmento: dict) -> str:
+        return os.path.join(self.directorio, 'reclamados', fragmento['id'] + '.json')
+
+    def _ruta_parcial(self, fragmento: dict) -> str:
+        return os.path.join(self.directorio, 'parciales', fragmento['id'] + '.json')
+
+    def _reclamo_vigente(self, fragmento: dict) -> bool:
+        try:
+            return time.time() - os.path.getmtime(self._ruta_reclamo(fragmento)) < self.caducidad
+        except OSError:
+            return False
+
+    @contextmanager
+    def _cola(self):
+        """
+        Bloqueo exclusivo de la cola sobre `cola.lock`. El archivo no se borra
+        nunca: borrarlo dejaría que otro bloquee un archivo nuevo mientras
+        alguien todavía tiene el viejo
+        """
+        with open(os.path.join(self.directorio, 'cola.lock'), 'a+b') as archivo:
+            _bloquear(archivo)
+            yield
+
+    def completado(self, fragmento: dict) -> bool:
+        """Indica si el fragmento ya tiene su resultado parcial"""
+        return os.path.exists(self._ruta_parcial(fragmento))
+
+    def reclamar(self) -> Optional[dict]:
+        """
+        Toma el primer fragmento sin terminar y sin un reclamo vigente
+
+        Returns:
+            dict: el fragmento del manifiesto, o None si no queda ninguno.
+        """
+        with self._cola():
+            for fragmento in self.manifiesto['fragmentos']:
+                if self.completado(fragmento) or self._reclamo_vigente(fragmento):
+                    continue
+                _escribir_json(self._ruta_reclamo(fragmento),
+                               {'trabajador': self.trabajador, 'inicio': time.time()})
+                return fragmento
+        return None
+
+    def _montecarlo(self, indice: int) -> MonteCarlo:
+        if indice not in self._montecarlos:
+            parametros = dict(self.manifiesto['opciones'], **self.manifiesto['puntos'][indice])
+            self._montecarlos[indice] = MonteCarlo(num_runs=0, **parametros)
+        return self._montecarlos[indice]
+
+    def ejecutar_fragmento(self, fragmento: dict, workers: Optional[int] = None) -> List[dict]:
+        """
+        Ejecuta un fragmento reclamado y guarda su resultado parcial
+
+        Returns:
+            list: resúmenes de las corridas del fragmento.
+        """
+        ruta_reclamo = self._ruta_reclamo(fragmento)
+        runs = self._montecarlo(fragmento['punto']).run(
+            seeds=fragmento['seeds'], workers=workers, sumidero=_Latido(ruta_reclamo))
+        _escribir_json(self._ruta_parcial(fragmento), runs)
+        # Liberar el reclamo solo si sigue siendo propio (pudo caducar y pasar a otro)
+        try:
+            if _leer_json(ruta_reclamo).get('trabajador') == self.trabajador:
+                os.remove(ruta_reclamo)
+        except (OSError, ValueError):
+            pass
+        return runs
+
+    def ejecutar(self, max_fragmentos: Optional[int] = None,
+                 workers: Optional[int] = None) -> int:
+        """
+        Toma y ejecuta fragmentos hasta vaciar la cola (o hasta
+        `max_fragmentos`). Puede ejecutarse a la vez en varios procesos.
+
+        Args:
+            max_fragmentos: máximo de fragmentos a ejecutar en esta llamada.
+            workers: procesos de `MonteCarlo.run` dentro de cada fragmento.
+
+        Returns:
+            int: fragmentos ejecutados.
+        """
+        ejecutados = 0
+        while max_fragmentos is None or ejecutados < max_fragmentos:
+            fragmento = self.reclamar()
+            if fragmento is None:
+                break
+            self.ejecutar_fragmento(fragmento, workers)
+            ejecutados += 1
+        return ejecutados
+
+    def estado(self) -> dict:
+        """
+        Returns:
+            dict: número de fragmentos `total`, `completados`, `en_curso`
+            (reclamo vigente) y `pendientes`.
+        """
+        fragmentos = self.manifiesto['fragmentos']
+        completados = sum(1 for f in fragmentos if self.completado(f))
+        en_curso = sum(1 for f in fragmentos
+                       if not self.completado(f) and self._reclamo_vigente(f))
+        return {
+            'total': len(fragmentos),
+            'completados': completados,
+            'en_curso': en_curso,
+            'pendientes': len(fragmentos) - completados - en_curso
+        }
+
+    def combinar(self, salida: Optional[str] = None, incompleto: bool = False) -> List[dict]:
+        """
+        Reúne los resultados parciales en la tabla final.
+
+        Args:
+            salida: si se indica, guarda la tabla de corridas con
+                `guardar_filas` (Excel o CSV según la extensión).
+            incompleto: combinar aunque falten fragmentos (si no, es un error).
+
+        Returns:
+            list: una fila por punto con sus parámetros y las estadísticas de
+            `resumir_corridas`; las corridas quedan en `self._runs`.
+        """
+        fragmentos = self.manifiesto['fragmentos']
+        faltantes = [f['id'] for f in fragmentos if not self.completado(f)]
+        if faltantes and not incompleto:
+            raise RuntimeError(f'Faltan {len(faltantes)} fragmentos (por ejemplo {faltantes[0]}).')
+
+        puntos = self.manifiesto['puntos']
+        por_punto = [[] for _ in puntos]
+        for fragmento in fragmentos:
+            if self.completado(fragmento):
+                por_punto[fragmento['punto']].extend(_leer_json(self._ruta_parcial(fragmento)))
+
+        self._runs = []
+        self._filas = []
+        for punto, runs in zip(puntos, por_punto):
+            self._runs.extend(dict(punto, **r) for r in runs)
+            self._filas.append(dict(punto, **resumir_corridas(runs)))
+
+        if salida is not None:
+            if not self._runs:
+                raise RuntimeError('No hay resultados que guardar.')
+            guardar_filas(self._runs, salida)
+        return self._filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trabajos Monte Carlo reanudables')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    correr = subparsers.add_parser('ejecutar', help='Tomar y ejecutar fragmentos de la cola')
+    correr.add_argument('directorio')
+    correr.add_argument('--max-fragmentos', type=int, default=None)
+    correr.add_argument('--workers', type=int, default=None)
+
+    consultar = subparsers.add_parser('estado', help='Mostrar el avance del trabajo')
+    consultar.add_argument('directorio')
+
+    unir = subparsers.add_parser('combinar', help='Reunir los parciales en la tabla final')
+    unir.add_argument('directorio')
+    unir.add_argument('--salida', default=None)
+    unir.add_argument('--incompleto', action='store_true',
+                      help='Combinar aunque falten fragmentos')
+
+    args = parser.parse_args(argv)
+    trabajo = TrabajoMonteCarlo(args.directorio)
+
+    if args.comando == 'ejecutar':
+        ejecutados = trabajo.ejecutar(args.max_fragmentos, args.workers)
+        print(f'Fragmentos ejecutados: {ejecutados}')
+    elif args.comando == 'estado':
+        for clave, valor in trabajo.estado().items():
+            print(f'{clave:<12} {valor}')
+    else:
+        for fila in trabajo.combinar(args.salida, args.incompleto):
+            print(fila)
+        if args.salida:
+            print(f'Resultados guardados en: {args.salida}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
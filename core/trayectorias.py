@@ -0,0 +1,222 @@
+import os
+import json
+from typing import List, Optional
+
+import numpy as np
+
+
+ARCHIVO_METADATOS = 'trayectoria.json'
+
+# Atributos guardados por vehículo y su tipo en disco
+CAMPOS = {
+    'angulo': np.float64,
+    'velocidad': np.float64,
+    'frenando': np.bool_,
+    'tuvo_que_frenar': np.bool_,
+    'colisiono': np.bool_,
+}
+
+
+def _nombre_bloque(campo: str, bloque: int) -> str:
+    return f'{campo}_{bloque:05d}.npy'
+
+
+class EscritorTrayectoria:
+    """
+    Escribe la trayectoria de una simulación en disco por columnas.
+
+    Cada atributo de `CAMPOS` (más `tiempo`) se guarda en bloques `.npy`
+    preasignados de `pasos_por_bloque x num_vehiculos`, escritos a través de
+    `numpy.memmap`, por lo que la memoria usada no depende de la duración
+    de la corrida. Las columnas se ordenan por ID de vehículo. Al cerrar se
+    escribe `trayectoria.json` con lo necesario para `LectorTrayectoria`.
+
+    Se conecta a una simulación con `Simulacion(..., trayectoria=escritor)`.
+    """
+
+    def __init__(self, directorio: str, num_vehiculos: int, pasos_por_bloque: int = 1024,
+                 campos: Optional[List[str]] = None):
+        """
+        Args:
+            directorio: carpeta de salida (se crea si no existe).
+            num_vehiculos: número de vehículos (columnas) por paso.
+            pasos_por_bloque: filas de cada archivo de bloque.
+            campos: subconjunto de `CAMPOS` a guardar (por defecto todos).
+        """
+        self.directorio = directorio
+        self.num_vehiculos = int(num_vehiculos)
+        self.pasos_por_bloque = int(pasos_por_bloque)
+        self.campos = list(campos) if campos is not None else list(CAMPOS)
+        desconocidos = set(self.campos) - set(CAMPOS)
+        if desconocidos:
+            raise ValueError(f'Campos desconocidos: {sorted(desconocidos)}')
+
+        self.pasos = 0
+        self.num_bloques = 0
+        self._bloque = None  # dict campo -> memmap del bloque abierto
+        self._fila = 0
+        self.cerrado = False
+
+        os.makedirs(directorio, exist_ok=True)
+
+    def _abrir_bloque(self):
+        """Preasigna los archivos del siguiente bloque"""
+        self._cerrar_bloque()
+        self._bloque = {
+            'tiempo': np.lib.format.open_memmap(
+                os.path.join(self.directorio, _nombre_bloque('tiempo', self.num_bloques)),
+                mode='w+', dtype=np.float64, shape=(self.pasos_por_bloque,))
+        }
+        for campo in self.campos:
+            self._bloque[campo] = np.lib.format.open_memmap(
+                os.path.join(self.directorio, _nombre_bloque(campo, self.num_bloques)),
+                mode='w+', dtype=CAMPOS[campo],
+                shape=(self.pasos_por_bloque, self.num_vehiculos))
+        self.num_bloques += 1
+        self._fila = 0
+
+    def _cerrar_bloque(self):
+        if self._bloque is not None:
+            for mapa in self._bloque.values():
+                mapa.flush()
+            self._bloque = None
+
+    def agregar(self, tiempo: float, columnas: dict):
+        """
+        Agrega un paso de la simulación.
+
+        Args:
+            tiempo: instante del paso.
+            columnas: valores por vehículo ordenados por ID, como los devuelve
+                `obtener_columnas()` del redondel.
+        """
+        if self.cerrado:
+            raise RuntimeError('El escritor de trayectoria ya fue cerrado.')
+        if self._bloque is None or self._fila == self.pasos_por_bloque:
+            self._abrir_bloque()
+
+        self._bloque['tiempo'][self._fila] = tiempo
+        for campo in self.campos:
+            self._bloque[campo][self._fila] = columnas[campo]
+        self._fila += 1
+        self.pasos += 1
+
+    def cerrar(self):
+        """Vuelca el último bloque y escribe los metadatos"""
+        if self.cerrado:
+            return
+        self._cerrar_bloque()
+        metadatos = {
+            'num_vehiculos': self.num_vehiculos,
+            'pasos': self.pasos,
+            'pasos_por_bloque': self.pasos_por_bloque,
+            'num_bloques': self.num_bloques,
+            'campos': self.campos,
+        }
+        with open(os.path.join(self.directorio, ARCHIVO_METADATOS), 'w', encoding='utf-8') as f:
+            json.dump(metadatos, f, indent=2)
+        self.cerrado = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class LectorTrayectoria:
+    """
+    Lee una trayectoria escrita por `EscritorTrayectoria` sin cargarla en memoria.
+
+    Los bloques se abren con `mmap_mode='r'`; las ventanas de tiempo que caen
+    dentro de un bloque y la selección de un vehículo o de un rango de IDs
+    devuelven vistas de solo lectura sin copiar datos.
+    """
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        with open(os.path.join(directorio, ARCHIVO_METADATOS), encoding='utf-8') as f:
+            metadatos = json.load(f)
+        self.num_vehiculos = metadatos['num_vehiculos']
+        self.pasos = metadatos['pasos']
+        self.pasos_por_bloque = metadatos['pasos_por_bloque']
+        self.num_bloques = metadatos['num_bloques']
+        self.campos = metadatos['campos']
+
+        self._mapas = {}
+        # El vector de tiempos es pequeño (un valor por paso): se carga completo
+        self.tiempo = np.concatenate(
+            [self._mapa('tiempo', b) for b in range(self.num_bloques)]
+        )[:self.pasos] if self.num_bloques else np.empty(0)
+
+    def _mapa(self, campo: str, bloque: int):
+        clave = (campo, bloque)
+        if clave not in self._mapas:
+            self._mapas[clave] = np.load(
+                os.path.join(self.directorio, _nombre_bloque(campo, bloque)), mmap_mode='r')
+        return self._mapas[clave]
+
+    def indices(self, t_inicio: Optional[float] = None, t_fin: Optional[float] = None):
+        """
+        Convierte una ventana de tiempo [t_inicio, t_fin] a índices de paso
+
+        Returns:
+            tuple: (desde, hasta) con `hasta` excluido
+        """
+        desde = 0 if t_inicio is None else int(np.searchsorted(self.tiempo, t_inicio, side='left'))
+        hasta = self.pasos if t_fin is None else int(np.searchsorted(self.tiempo, t_fin, side='right'))
+        return desde, hasta
+
+    def bloques(self, campo: str, desde: int = 0, hasta: Optional[int] = None, vehiculos=None):
+        """
+        Recorre los pasos [desde, hasta) bloque a bloque sin copiar
+
+        Args:
+            campo: atributo a leer (`tiempo` o uno de `campos`).
+            desde, hasta: rango de pasos.
+            vehiculos: ID (int), `slice` de IDs o None para todos.
+
+        Yields:
+            tuple: (paso_inicial, vista) para cada tramo
+        """
+        hasta = self.pasos if hasta is None else min(hasta, self.pasos)
+        paso = desde
+        while paso < hasta:
+            bloque, fila = divmod(paso, self.pasos_por_bloque)
+            filas = min(self.pasos_por_bloque - fila, hasta - paso)
+            vista = self._mapa(campo, bloque)[fila:fila + filas]
+            if vehiculos is not None and campo != 'tiempo':
+                vista = vista[:, vehiculos]
+            yield paso, vista
+            paso += filas
+
+    def ventana(self, campo: str, t_inicio: Optional[float] = None, t_fin: Optional[float] = None,
+                vehiculos=None):
+        """
+        Obtiene `campo` en la ventana de tiempo [t_inicio, t_fin]
+
+        Args:
+            campo: atributo a leer.
+            t_inicio, t_fin: límites de la ventana (None = sin límite).
+            vehiculos: ID (int), `slice` de IDs, lista de IDs o None para todos.
+
+        Returns:
+            np.ndarray: arreglo (pasos, vehículos), o (pasos,) para un único
+            ID. Es una vista sin copia si la ventana cae en un solo bloque y
+            `vehiculos` es un ID o un `slice`.
+        """
+        desde, hasta = self.indices(t_inicio, t_fin)
+        if campo == 'tiempo':
+            return self.tiempo[desde:hasta]
+        tramos = [vista for _, vista in self.bloques(campo, desde, hasta, vehiculos)]
+        if not tramos:
+            forma = (0,) if isinstance(vehiculos, int) else (0, self.num_vehiculos)
+            return np.empty(forma, dtype=CAMPOS[campo])
+        if len(tramos) == 1:
+            return tramos[0]
+        return np.concatenate(tramos)
+
+    def vehiculo(self, campo: str, id_vehiculo: int, t_inicio: Optional[float] = None,
+                 t_fin: Optional[float] = None):
+        """Serie temporal de `campo` para un vehículo"""
+        return self.ventana(campo, t_inicio, t_fin, vehiculos=id_vehiculo)
@@ -1,11 +1,15 @@
-from core.simulacion import Simulacion
-from core.montecarlo import MonteCarlo
+import sys
 from utils.constantes import DISTANCIA_SEGURIDAD, NUMERO_VEHICULOS
 
+# Cada opción importa sus módulos al ejecutarse: con argumentos, `main.py`
+# delega en la interfaz no interactiva (`core/cli.py`) sin cargar el resto
+
 def ejecutar_simulacion_simple():
     """
     Ejecuta una simulación simple y muestra los resultados
     """
+    from core.simulacion import Simulacion
+
     print("="*60)
     print("SIMULACIÓN DE TRÁFICO EN REDONDEL")
     print("Validando la teoría del error humano en nudos de tráfico")
@@ -51,6 +55,8 @@ def ejecutar_pruebas_distancia():
     """
     Ejecuta múltiples simulaciones con diferentes distancias de seguridad
     """
+    from core.barrido import Barrido
+
     print("="*60)
     print("ANÁLISIS DE DISTANCIA DE SEGURIDAD")
     print("="*60)
@@ -61,15 +67,14 @@ def ejecutar_pruebas_distancia():
     print(f"{'Distancia (m)':<15} {'Colisiones':<15} {'Vehículos Afectados':<25}")
     print("-"*55)
     
-    for distancia in distancias:
-        sim = Simulacion(num_vehiculos=NUMERO_VEHICULOS, 
-                        distancia_seguridad=distancia)
-        resultados = sim.ejecutar_completa(duracion=30.0, tiempo_inicio_frenado=5.0, seed=42)
-        
-        colision_str = "SÍ" if resultados['hubo_colisiones'] else "NO"
-        afectados_str = f"{resultados['vehiculos_afectados']}/{resultados['total_vehiculos']}"
+    barrido = Barrido(distancia_seguridad=distancias, num_vehiculos=NUMERO_VEHICULOS,
+                      seeds=[42], duracion=30.0, tiempo_inicio_frenado=5.0)
+    
+    for fila in barrido.run():
+        colision_str = "SÍ" if fila['colisiones_total'] else "NO"
+        afectados_str = f"{fila['vehiculos_afectados_mean']:.0f}/{fila['num_vehiculos']}"
         
-        print(f"{distancia:<15} {colision_str:<15} {afectados_str:<25}")
+        print(f"{fila['distancia_seguridad']:<15} {colision_str:<15} {afectados_str:<25}")
     
     print()
 
@@ -78,6 +83,8 @@ def ejecutar_montecarlo():
     """
     Ejecuta múltiples simulaciones con distintas semillas y guarda resultados.
     """
+    from core.montecarlo import MonteCarlo
+
     print("="*60)
     print("MONTE CARLO - ANÁLISIS ESTADÍSTICO")
     print("="*60)
@@ -93,6 +100,12 @@ def ejecutar_montecarlo():
     except Exception:
         seed_start = 0
 
+    try:
+        workers_input = input("Procesos en paralelo [1]: ").strip()
+        workers = int(workers_input) if workers_input else 1
+    except Exception:
+        workers = 1
+
     archivo_salida = input("Archivo de salida (xlsx/csv) [montecarlo_resultados.xlsx]: ").strip()
     if not archivo_salida:
         archivo_salida = 'montecarlo_resultados.xlsx'
@@ -103,7 +116,7 @@ def ejecutar_montecarlo():
                     duracion=30.0, tiempo_inicio_frenado=5.0,
                     distancia_seguridad=DISTANCIA_SEGURIDAD)
 
-    mc.run(seed_start=seed_start)
+    mc.run(seed_start=seed_start, workers=workers)
 
     try:
         path_guardado = mc.save(archivo_salida)
@@ -122,6 +135,41 @@ def ejecutar_montecarlo():
     print()
 
 
+def ejecutar_busqueda_distancia():
+    """
+    Busca la distancia de seguridad en la que la probabilidad de colisión
+    cruza un objetivo, sin recorrer una grilla fija
+    """
+    from core.busqueda import BusquedaDistanciaCritica
+
+    print("="*60)
+    print("BÚSQUEDA DE DISTANCIA DE SEGURIDAD CRÍTICA")
+    print("="*60)
+    try:
+        objetivo_input = input("Probabilidad de colisión objetivo [0.05]: ").strip()
+        objetivo = float(objetivo_input) if objetivo_input else 0.05
+    except Exception:
+        objetivo = 0.05
+
+    busqueda = BusquedaDistanciaCritica(objetivo=objetivo, num_vehiculos=NUMERO_VEHICULOS,
+                                        duracion=30.0, tiempo_inicio_frenado=5.0)
+    resultado = busqueda.buscar()
+
+    print()
+    print(f"{'Distancia (m)':<15} {'P(colisión)':<15} {'Corridas':<10}")
+    print("-"*40)
+    for sonda in resultado['sondas']:
+        print(f"{sonda['distancia']:<15.3f} {sonda['colisiones_frac']:<15.3f} {sonda['num_corridas']:<10}")
+    print()
+    if resultado['encontrada']:
+        desde, hasta = resultado['intervalo']
+        print(f"Distancia crítica: {resultado['distancia_critica']:.2f} m "
+              f"(entre {desde:.2f} y {hasta:.2f} m, {resultado['corridas']} corridas)")
+    else:
+        print("La probabilidad de colisión no cruza el objetivo en el intervalo buscado.")
+    print()
+
+
 def menu_principal():
     """
     Menú principal para ejecutar diferentes tipos de simulaciones
@@ -135,9 +183,10 @@ def menu_principal():
         print("2. Análisis de distancia de seguridad")
         print("3. Salir")
         print("4. Ejecutar Monte Carlo (análisis estadístico y exportación)")
+        print("5. Buscar distancia de seguridad crítica")
         print()
         
-        opcion = input("Seleccione una opción (1-4): ").strip()
+        opcion = input("Seleccione una opción (1-5): ").strip()
         
         if opcion == "1":
             print()
@@ -151,12 +200,19 @@ def menu_principal():
             print()
             ejecutar_montecarlo()
             input("\nPresione Enter para continuar...")
+        elif opcion == "5":
+            print()
+            ejecutar_busqueda_distancia()
+            input("\nPresione Enter para continuar...")
         elif opcion == "3":
             print("\n¡Hasta luego!")
             break
         else:
-            print("\nOpción no válida. Por favor, seleccione 1, 2, 3 o 4.")
+            print("\nOpción no válida. Por favor, seleccione 1, 2, 3, 4 o 5.")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from core.cli import main
+        sys.exit(main())
     menu_principal()
\ No newline at end of file
@@ -0,0 +1,214 @@
+import math
+from utils.constantes import (
+    TIEMPO_REACCION, ACELERACION_FRENADO, ACELERACION_NORMAL, VELOCIDAD_NORMAL
+)
+
+# Parámetros de cada conductor, en el orden en que se muestrean
+PARAMETROS_CONDUCTOR = ('tiempo_reaccion', 'aceleracion_frenado',
+                        'aceleracion_normal', 'velocidad_normal')
+
+# Valor de cada parámetro en una población homogénea
+VALORES_POR_DEFECTO = {
+    'tiempo_reaccion': TIEMPO_REACCION,
+    'aceleracion_frenado': ACELERACION_FRENADO,
+    'aceleracion_normal': ACELERACION_NORMAL,
+    'velocidad_normal': VELOCIDAD_NORMAL
+}
+
+# Valores con sentido físico de cada parámetro: (mínimo, máximo, extremos
+# incluidos); los extremos infinitos nunca se alcanzan
+RANGOS_CONDUCTOR = {
+    'tiempo_reaccion': (0.0, math.inf, True),
+    'aceleracion_frenado': (-math.inf, 0.0, False),
+    'aceleracion_normal': (0.0, math.inf, True),
+    'velocidad_normal': (0.0, math.inf, False)
+}
+
+DISTRIBUCION_NORMAL = 'normal'
+DISTRIBUCION_UNIFORME = 'uniforme'
+DISTRIBUCION_LOGNORMAL = 'lognormal'
+DISTRIBUCIONES = (DISTRIBUCION_NORMAL, DISTRIBUCION_UNIFORME, DISTRIBUCION_LOGNORMAL)
+
+
+def _comprobar_rango(nombre, valor, descripcion='valor'):
+    """Lanza ValueError si `valor` no está en `RANGOS_CONDUCTOR[nombre]`"""
+    minimo, maximo, incluidos = RANGOS_CONDUCTOR[nombre]
+    if incluidos:
+        valido = minimo <= valor <= maximo
+    else:
+        valido = minimo < valor < maximo
+    if not valido:
+        izquierda, derecha = ('[', ']') if incluidos else ('(', ')')
+        raise ValueError(f"El {descripcion} de {nombre} debe estar en "
+                         f"{izquierda}{minimo:g}, {maximo:g}{derecha}: {valor!r}")
+
+
+def _normalizar_distribucion(nombre, especificacion):
+    """
+    Valida la distribución de un parámetro
+
+    Args:
+        nombre (str): Parámetro del conductor
+        especificacion (float | dict): Un número (todos los conductores
+            iguales) o un diccionario con `distribucion` y sus argumentos:
+            `normal` (`media`, `desviacion`), `uniforme` (`minimo`, `maximo`)
+            o `lognormal` (`media`, `desviacion` de la variable, no de su
+            logaritmo). `normal` y `lognormal` aceptan además `minimo` y
+            `maximo` para recortar los valores extremos. Los valores
+            posibles deben quedar en `RANGOS_CONDUCTOR`: una `normal` de un
+            parámetro positivo requiere `minimo` (y la de
+            `aceleracion_frenado`, `maximo`), y `lognormal` solo sirve para
+            parámetros positivos.
+
+    Returns:
+        float | dict: Especificación normalizada
+
+    Raises:
+        ValueError: Si la distribución puede dar valores sin sentido físico
+    """
+    if not isinstance(especificacion, dict):
+        valor = float(especificacion)
+        _comprobar_rango(nombre, valor)
+        return valor
+    especificacion = dict(especificacion)
+    distribucion = especificacion.get('distribucion')
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución desconocida para {nombre}: {distribucion!r}")
+    if distribucion == DISTRIBUCION_UNIFORME:
+        requeridos = ('minimo', 'maximo')
+    else:
+        requeridos = ('media', 'desviacion')
+    faltantes = [clave for clave in requeridos if clave not in especificacion]
+    if faltantes:
+        raise ValueError(f"Faltan {', '.join(faltantes)} en la distribución de {nombre}")
+    for clave in ('media', 'desviacion', 'minimo', 'maximo'):
+        if especificacion.get(clave) is not None:
+            especificacion[clave] = float(especificacion[clave])
+
+    minimo, maximo = especificacion.get('minimo'), especificacion.get('maximo')
+    if minimo is not None and maximo is not None and minimo > maximo:
+        raise ValueError(f"En la distribución de {nombre} el mínimo supera al máximo: "
+                         f"{minimo!r} > {maximo!r}")
+    if distribucion != DISTRIBUCION_UNIFORME:
+        if especificacion['desviacion'] < 0:
+            raise ValueError(f"La desviación de {nombre} no puede ser negativa: "
+                             f"{especificacion['desviacion']!r}")
+        inferior, superior, _ = RANGOS_CONDUCTOR[nombre]
+        if distribucion == DISTRIBUCION_LOGNORMAL:
+            # Solo da valores positivos
+            if superior != math.inf:
+                raise ValueError(f"La distribución lognormal solo da valores positivos: "
+                                 f"no sirve para {nombre}")
+            if especificacion['media'] <= 0:
+                raise ValueError(f"La media lognormal de {nombre} debe ser positiva: "
+                                 f"{especificacion['media']!r}")
+        else:
+            # Una normal sin recortar puede tomar cualquier signo
+            if inferior != -math.inf and minimo is None:
+                raise ValueError(f"La distribución normal de {nombre} requiere `minimo` "
+                                 f"(puede dar valores menores que {inferior:g})")
+            if superior != math.inf and maximo is None:
+                raise ValueError(f"La distribución normal de {nombre} requiere `maximo` "
+                                 f"(puede dar valores mayores que {superior:g})")
+            _comprobar_rango(nombre, especificacion['media'], 'valor medio')
+    for clave, descripcion in (('minimo', 'mínimo'), ('maximo', 'máximo')):
+        if especificacion.get(clave) is not None:
+            _comprobar_rango(nombre, especificacion[clave], descripcion)
+    return especificacion
+
+
+class PoblacionConductores:
+    """
+    Distribución de los parámetros de los conductores de una corrida.
+
+    Cada parámetro de `PARAMETROS_CONDUCTOR` es un número (todos los
+    conductores iguales, por defecto la constante de `utils/constantes.py`)
+    o una distribución. `muestrear` sortea una vez por corrida, con un
+    generador NumPy sembrado, un arreglo por parámetro con un valor por
+    vehículo; los motores guardan esos arreglos junto al estado de los
+    vehículos y no vuelven a sortear durante la simulación.
+    """
+
+    def __init__(self, **parametros):
+        """
+        Args:
+            **parametros: Distribución de cada parámetro (ver
+                `_normalizar_distribucion`); los omitidos quedan constantes
+        """
+        desconocidos = set(parametros) - set(PARAMETROS_CONDUCTOR)
+        if desconocidos:
+            raise ValueError(f"Parámetros de conductor desconocidos: {', '.join(sorted(desconocidos))}")
+        self.distribuciones = {
+            nombre: _normalizar_distribucion(nombre, parametros.get(nombre, VALORES_POR_DEFECTO[nombre]))
+            for nombre in PARAMETROS_CONDUCTOR
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """
+        Crea la población a partir de `describir()` (o la devuelve si ya lo es)
+
+        Args:
+            datos (dict | PoblacionConductores | None): Descripción
+
+        Returns:
+            PoblacionConductores | None: Población, o None si `datos` es None
+        """
+        if datos is None or isinstance(datos, cls):
+            return datos
+        return cls(**datos)
+
+    def describir(self):
+        """
+        Returns:
+            dict: Distribución de cada parámetro, serializable como JSON
+        """
+        return {nombre: (dict(d) if isinstance(d, dict) else d)
+                for nombre, d in self.distribuciones.items()}
+
+    @property
+    def homogenea(self):
+        """True si todos los conductores son iguales (ningún parámetro es aleatorio)"""
+        return not any(isinstance(d, dict) for d in self.distribuciones.values())
+
+    @property
+    def velocidad_homogenea(self):
+        """True si todos los conductores tienen la misma velocidad normal"""
+        return not isinstance(self.distribuciones['velocidad_normal'], dict)
+
+    def muestrear(self, num_vehiculos, seed=None):
+        """
+        Sortea los parámetros de `num_vehiculos` conductores
+
+        Args:
+            num_vehiculos (int): Número de vehículos
+            seed (int, optional): Semilla; la misma semilla da la misma población
+
+        Returns:
+            dict: Un arreglo NumPy de `float64` por parámetro, indexado por ID
+        """
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        valores = {}
+        for nombre in PARAMETROS_CONDUCTOR:
+            distribucion = self.distribuciones[nombre]
+            if not isinstance(distribucion, dict):
+                valores[nombre] = np.full(num_vehiculos, distribucion, dtype=np.float64)
+                continue
+            tipo = distribucion['distribucion']
+            if tipo == DISTRIBUCION_UNIFORME:
+                muestra = rng.uniform(distribucion['minimo'], distribucion['maximo'], num_vehiculos)
+            elif tipo == DISTRIBUCION_NORMAL:
+                muestra = rng.normal(distribucion['media'], distribucion['desviacion'], num_vehiculos)
+            else:
+                # Parámetros del logaritmo a partir de la media y desviación de la variable
+                media, desviacion = distribucion['media'], distribucion['desviacion']
+                sigma2 = math.log(1 + (desviacion / media) ** 2)
+                muestra = rng.lognormal(math.log(media) - sigma2 / 2, math.sqrt(sigma2),
+                                        num_vehiculos)
+            if tipo != DISTRIBUCION_UNIFORME and (distribucion.get('minimo') is not None
+                                                  or distribucion.get('maximo') is not None):
+                np.clip(muestra, distribucion.get('minimo'), distribucion.get('maximo'), out=muestra)
+            valores[nombre] = muestra
+        return valores
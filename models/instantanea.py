@@ -0,0 +1,184 @@
+from functools import cached_property
+
+import numpy as np
+
+# Atributos de cada vehículo en una instantánea, en el orden de `Vehiculo.obtener_estado`
+CAMPOS_INSTANTANEA = ('id', 'angulo', 'velocidad', 'frenando', 'es_problema',
+                      'tuvo_que_frenar', 'colisiono')
+
+# Registro de un vehículo: con él se arma la instantánea de un motor sin arreglos
+TIPO_REGISTRO = np.dtype([('id', np.int64), ('angulo', np.float64), ('velocidad', np.float64),
+                          ('frenando', np.bool_), ('es_problema', np.bool_),
+                          ('tuvo_que_frenar', np.bool_), ('colisiono', np.bool_)])
+
+
+def _solo_lectura(arreglo):
+    """Vista de `arreglo` que no admite escritura (no copia los datos)"""
+    if not arreglo.flags.writeable:
+        return arreglo
+    vista = arreglo.view()
+    vista.flags.writeable = False
+    return vista
+
+
+def _columna(campo):
+    """Propiedad de solo lectura para un campo de `CAMPOS_INSTANTANEA`"""
+    def leer(self):
+        self._comprobar()
+        return self._columnas[campo]
+    return property(leer, doc=f"Arreglo `{campo}` de los vehículos")
+
+
+class Instantanea:
+    """
+    Estado de los vehículos de un redondel como arreglos NumPy de solo lectura.
+
+    Con el motor vectorizado los arreglos son vistas sobre el estado del
+    redondel, sin copias, y solo valen hasta el siguiente paso: el motor
+    reemplaza algunos arreglos y modifica otros en el lugar, así que después
+    la instantánea mezclaría estados. Leerla entonces lanza `RuntimeError`;
+    `copiar` devuelve una instantánea independiente que sí se conserva. Los
+    vehículos están en el orden de almacenamiento del motor; `orden` da
+    los índices en orden de ángulo y `por_id` reordena por ID. Las
+    coordenadas cartesianas (`x`, `y`) se calculan vectorizadas y solo la
+    primera vez que se piden, y `estados` arma los diccionarios de
+    `obtener_estados` únicamente para quien los necesite.
+    """
+
+    id = _columna('id')
+    angulo = _columna('angulo')
+    velocidad = _columna('velocidad')
+    frenando = _columna('frenando')
+    es_problema = _columna('es_problema')
+    tuvo_que_frenar = _columna('tuvo_que_frenar')
+    colisiono = _columna('colisiono')
+
+    def __init__(self, radio, columnas, inicio=0, posicion=None, vigente=None):
+        """
+        Args:
+            radio (float): Radio del redondel en metros
+            columnas (dict): Un arreglo por campo de `CAMPOS_INSTANTANEA`
+            inicio (int): Índice del vehículo con menor ángulo; los siguientes
+                (circularmente) están en orden de ángulo creciente
+            posicion (np.ndarray, optional): Índice de cada ID, si el motor
+                ya lo mantiene
+            vigente (callable, optional): Indica si `columnas` todavía
+                describen el estado del motor (None: arreglos propios)
+        """
+        self.radio = radio
+        self._columnas = {campo: _solo_lectura(columnas[campo]) for campo in CAMPOS_INSTANTANEA}
+        self.inicio = int(inicio)
+        self._posicion = _solo_lectura(posicion) if posicion is not None else None
+        self._vigente = vigente
+
+    def _comprobar(self):
+        if self._vigente is not None and not self._vigente():
+            raise RuntimeError('La instantánea dejó de ser válida: el redondel avanzó. '
+                               'Use `copiar()` para conservarla.')
+
+    @classmethod
+    def desde_registros(cls, radio, registros):
+        """
+        Crea la instantánea a partir de una tupla por vehículo, en orden de
+        ángulo, con los campos de `CAMPOS_INSTANTANEA`: se copian una sola
+        vez a un arreglo estructurado y cada campo es una vista sobre él
+
+        Args:
+            radio (float): Radio del redondel en metros
+            registros (list): Tuplas (id, angulo, velocidad, frenando,
+                es_problema, tuvo_que_frenar, colisiono)
+
+        Returns:
+            Instantanea: Instantánea con arreglos propios
+        """
+        arreglo = np.array(registros, dtype=TIPO_REGISTRO)
+        arreglo.flags.writeable = False
+        return cls(radio, {campo: arreglo[campo] for campo in CAMPOS_INSTANTANEA})
+
+    def __len__(self):
+        return len(self.id)
+
+    @property
+    def x(self):
+        """Coordenada x de cada vehículo (m)"""
+        self._comprobar()
+        return self._x
+
+    @property
+    def y(self):
+        """Coordenada y de cada vehículo (m)"""
+        self._comprobar()
+        return self._y
+
+    @property
+    def orden(self):
+        """Índices de los vehículos en orden de ángulo creciente"""
+        self._comprobar()
+        return self._orden
+
+    @property
+    def posicion(self):
+        """
+        Índices de los vehículos en orden de ID: con IDs 0..n-1 es el índice
+        de cada ID. Los IDs no tienen por qué ser consecutivos (en una red
+        los vehículos entran y salen de cada redondel)
+        """
+        self._comprobar()
+        return self._orden_por_id
+
+    @cached_property
+    def _x(self):
+        return _solo_lectura(self.radio * np.cos(self.angulo))
+
+    @cached_property
+    def _y(self):
+        return _solo_lectura(self.radio * np.sin(self.angulo))
+
+    @cached_property
+    def _orden(self):
+        return np.roll(np.arange(len(self.id)), -self.inicio)
+
+    @cached_property
+    def _orden_por_id(self):
+        if self._posicion is not None:
+            return self._posicion
+        return _solo_lectura(np.argsort(self.id, kind='stable'))
+
+    def por_id(self, campo):
+        """
+        Args:
+            campo (str): Campo de `CAMPOS_INSTANTANEA`, `x` o `y`
+
+        Returns:
+            np.ndarray: Valores del campo ordenados por ID (copia)
+        """
+        return getattr(self, campo)[self.posicion]
+
+    def copiar(self):
+        """
+        Returns:
+            Instantanea: Instantánea con arreglos propios, que no cambia al
+            avanzar la simulación
+        """
+        return Instantanea(self.radio, {campo: getattr(self, campo).copy()
+                                        for campo in CAMPOS_INSTANTANEA}, self.inicio)
+
+    def estados(self):
+        """
+        Diccionarios por vehículo, en orden de ángulo (formato de
+        `Redondel.obtener_estados`)
+
+        Returns:
+            list: Un diccionario por vehículo
+        """
+        orden = self.orden
+        columnas = [getattr(self, campo)[orden].tolist()
+                    for campo in ('id', 'angulo', 'velocidad', 'x', 'y', 'frenando',
+                                  'es_problema', 'tuvo_que_frenar', 'colisiono')]
+        return [
+            {'id': i, 'angulo': angulo, 'velocidad': velocidad, 'x': x, 'y': y,
+             'frenando': frenando, 'es_problema': es_problema,
+             'tuvo_que_frenar': tuvo_que_frenar, 'colisiono': colisiono}
+            for i, angulo, velocidad, x, y, frenando, es_problema, tuvo_que_frenar, colisiono
+            in zip(*columnas)
+        ]
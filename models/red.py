@@ -0,0 +1,777 @@
+import math
+import random
+from models.vehiculo import Vehiculo
+from models.redondel import Redondel
+from models.conductores import PARAMETROS_CONDUCTOR
+from utils.constantes import (
+    RADIO_REDONDEL, NUMERO_VEHICULOS, LONGITUD_VEHICULO, LONGITUD_ENLACE, FLUJO_ENTRADA,
+    VELOCIDAD_NORMAL, ACELERACION_FRENADO
+)
+
+# Campos de un vehículo que pasa de un proceso a otro (nombre, tipo NumPy), en
+# el orden de `VehiculoRed.a_registro`
+CAMPOS_TRASPASO = (
+    ('salida', 'i8'), ('id', 'i8'), ('posicion', 'f8'), ('velocidad', 'f8'),
+    ('frenando', '?'), ('tiempo_frenado', 'f8'), ('es_vehiculo_problema', '?'),
+    ('tiempo_reaccion_restante', 'f8'), ('tuvo_que_frenar', '?'), ('colisiono', '?'),
+    ('paso_ingreso', 'i8'),
+) + tuple((nombre, 'f8') for nombre in PARAMETROS_CONDUCTOR)
+
+_MASCARA = (1 << 64) - 1
+_DOS_PI = 2 * math.pi
+# Distancia de frenado de un vehículo recién llegado por una fuente
+_FRENADO_FUENTE = VELOCIDAD_NORMAL ** 2 / (-2 * ACELERACION_FRENADO)
+
+
+def _mezclar(*claves):
+    """
+    Entero de 64 bits determinado solo por `claves` (splitmix64), para
+    sortear sin un generador con estado: todos los procesos obtienen el
+    mismo valor, sea cual sea la partición de la red
+    """
+    x = 0
+    for clave in claves:
+        x = (x + (clave & _MASCARA) + 0x9E3779B97F4A7C15) & _MASCARA
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASCARA
+        x ^= x >> 31
+    return x
+
+
+def _sorteo(*claves):
+    """Número uniforme en [0, 1) determinado por `claves` (ver `_mezclar`)"""
+    return (_mezclar(*claves) >> 11) * (1.0 / (1 << 53))
+
+
+def _distancia_frenado(vehiculo):
+    """Metros que recorre `vehiculo` hasta detenerse frenando sin pausa"""
+    return vehiculo.velocidad ** 2 / (-2 * vehiculo.aceleracion_frenado)
+
+
+def _frenar_aproximacion(vehiculo, dt, distancia, velocidad_adelante, distancia_seguridad):
+    """
+    Frenado del que se acerca por un enlace a la cola o a la línea de ceda
+    el paso: frena en este paso (o sigue detenido) si, con el de adelante
+    frenando igual, ya no se detendría a la distancia de seguridad. Las
+    reglas de reacción frenan un solo paso por tiempo de reacción y no
+    alcanzan para detenerse detrás de una cola.
+
+    Returns:
+        bool: Si frenó (en ese caso no se aplican las reglas de reacción)
+    """
+    if vehiculo.es_vehiculo_problema and vehiculo.frenando:
+        return False
+    velocidad = vehiculo.velocidad
+    margen = max(velocidad ** 2 - velocidad_adelante ** 2, 0.0) / (-2 * vehiculo.aceleracion_frenado)
+    if distancia - velocidad * dt >= distancia_seguridad + margen:
+        return False
+    vehiculo.velocidad = max(0.0, velocidad + vehiculo.aceleracion_frenado * dt)
+    vehiculo.tuvo_que_frenar = True
+    return True
+
+
+def id_vehiculo(num_redondeles, redondel, orden):
+    """
+    ID del vehículo número `orden` nacido en `redondel` (los iniciales
+    primero, luego los que llegan por sus fuentes): único en la red sin
+    coordinar procesos
+    """
+    return orden * num_redondeles + redondel
+
+
+class VehiculoRed(Vehiculo):
+    """
+    Vehículo que recorre una red: además del estado de `Vehiculo` recuerda
+    por dónde sale del redondel en que está y cuánto le falta para llegar,
+    y su posición cuando circula por un enlace
+    """
+
+    def __init__(self, id_vehiculo, angulo_inicial=0.0, radio_redondel=RADIO_REDONDEL,
+                 paso_ingreso=0):
+        """
+        Args:
+            id_vehiculo (int): Identificador único en toda la red
+            angulo_inicial (float): Ángulo inicial en radianes
+            radio_redondel (float): Radio del redondel en metros
+            paso_ingreso (int): Paso en que entró a la red
+        """
+        super().__init__(id_vehiculo, angulo_inicial, radio_redondel)
+        self.paso_ingreso = paso_ingreso
+        self.salida = -1  # enlace por el que sale del redondel (-1: sumidero)
+        self.restante = math.inf  # ángulo que falta recorrer hasta la salida
+        self.posicion = 0.0  # metros recorridos en el enlace actual
+
+    def a_registro(self):
+        """
+        Returns:
+            tuple: Valores de `CAMPOS_TRASPASO`
+        """
+        return tuple(getattr(self, campo) for campo, _ in CAMPOS_TRASPASO)
+
+    @classmethod
+    def desde_registro(cls, registro):
+        """
+        Reconstruye un vehículo traspasado desde otro proceso
+
+        Args:
+            registro (tuple): Valores de `CAMPOS_TRASPASO`
+
+        Returns:
+            VehiculoRed: Vehículo en el enlace `salida`
+        """
+        vehiculo = cls(registro[1])
+        for (campo, _), valor in zip(CAMPOS_TRASPASO, registro):
+            setattr(vehiculo, campo, valor)
+        return vehiculo
+
+
+class Enlace:
+    """
+    Tramo recto de un solo sentido que lleva del redondel `origen` (o de
+    una fuente, si es None) al redondel `destino`. Los vehículos siguen al
+    de adelante con las mismas reglas que en el redondel, pero sin
+    atravesarlo; el primero ve la línea de ceda el paso como un vehículo
+    detenido mientras no hay hueco para entrar al redondel.
+    """
+
+    def __init__(self, indice, origen, destino, longitud, angulo_salida, angulo_entrada):
+        """
+        Args:
+            indice (int): Índice del enlace en la red
+            origen (int | None): Redondel de origen (None para una fuente)
+            destino (int): Redondel de destino
+            longitud (float): Longitud en metros
+            angulo_salida (float): Ángulo por el que se sale del origen
+            angulo_entrada (float): Ángulo por el que se entra al destino
+        """
+        self.indice = indice
+        self.origen = origen
+        self.destino = destino
+        self.longitud = longitud
+        self.angulo_salida = angulo_salida
+        self.angulo_entrada = angulo_entrada
+        self.vehiculos = []  # del primero (más cerca del destino) al último
+
+    def ultima_posicion(self):
+        """
+        Returns:
+            float: Posición del último vehículo (infinito si está vacío)
+        """
+        return self.vehiculos[-1].posicion if self.vehiculos else math.inf
+
+    def actualizar(self, dt, distancia_seguridad, bloqueado):
+        """
+        Avanza un paso los vehículos del enlace, del último al primero: cada
+        uno ve a su líder todavía sin actualizar, como en `Redondel.actualizar`.
+
+        En el tramo recto el conductor ve de lejos la cola o la línea de ceda
+        el paso: si no puede detenerse a la distancia de seguridad frenando
+        desde ya, frena de a pasos seguidos (`_frenar_aproximacion`); si no,
+        aplica las reglas de reacción de siempre. Quien igualmente alcanza al
+        de adelante queda marcado con `colisiono`, como en el redondel.
+
+        Args:
+            dt (float): Intervalo de tiempo
+            distancia_seguridad (float): Distancia de seguridad entre vehículos
+            bloqueado (bool): Si el primero debe detenerse en la línea de ceda el paso
+
+        Returns:
+            int: Vehículos que frenaron por reacción en este paso
+        """
+        vehiculos = self.vehiculos
+        frenadas = 0
+        for i in range(len(vehiculos) - 1, -1, -1):
+            vehiculo = vehiculos[i]
+            if i:
+                adelante = vehiculos[i - 1]
+                limite = adelante.posicion - LONGITUD_VEHICULO
+                velocidad_limite = adelante.velocidad
+            elif bloqueado:
+                limite, velocidad_limite = self.longitud, 0.0
+            else:
+                limite = math.inf
+            if limite == math.inf:
+                vehiculo.actualizar_velocidad(dt)
+            elif not _frenar_aproximacion(vehiculo, dt, limite - vehiculo.posicion,
+                                          velocidad_limite, distancia_seguridad):
+                vehiculo.actualizar_velocidad(dt, limite - vehiculo.posicion, velocidad_limite,
+                                              distancia_seguridad)
+                if vehiculo.tiempo_reaccion_restante == vehiculo.tiempo_reaccion:
+                    frenadas += 1
+            posicion = vehiculo.posicion + vehiculo.velocidad * dt
+            if posicion > limite:
+                # Nadie atraviesa al de adelante: queda pegado a él, a su
+                # velocidad, y así se forman las colas. Alcanzarlo es una
+                # colisión; detenerse en la línea de ceda el paso no
+                if i:
+                    vehiculo.colisiono = True
+                posicion = max(vehiculo.posicion, limite)
+                vehiculo.velocidad = min(vehiculo.velocidad, velocidad_limite)
+            vehiculo.posicion = posicion
+        return frenadas
+
+
+class Red:
+    """
+    Topología de una red de redondeles unidos por enlaces.
+
+    Cada redondel tiene salidas hacia sus enlaces y, opcionalmente, un
+    sumidero por el que los vehículos abandonan la red; al entrar a un
+    redondel cada vehículo sortea su salida según los pesos. Las fuentes
+    son enlaces sin origen a los que llegan `flujo` vehículos por segundo.
+    Solo guarda la descripción (se envía a cada proceso, que crea su parte
+    con `FragmentoRed`).
+    """
+
+    def __init__(self):
+        self.redondeles = []
+        self.enlaces = []
+
+    def agregar_redondel(self, radio=RADIO_REDONDEL, num_vehiculos=NUMERO_VEHICULOS,
+                         angulo_sumidero=None, peso_sumidero=1.0):
+        """
+        Args:
+            radio (float): Radio en metros
+            num_vehiculos (int): Vehículos que circulan al comenzar
+            angulo_sumidero (float, optional): Ángulo de la salida fuera de
+                la red (sin él, los vehículos solo salen por enlaces)
+            peso_sumidero (float): Peso del sumidero en el sorteo de la salida
+
+        Returns:
+            int: Índice del redondel
+        """
+        if radio <= 0:
+            raise ValueError(f"Radio inválido: {radio!r}")
+        self.redondeles.append({
+            'radio': float(radio),
+            'num_vehiculos': int(num_vehiculos),
+            'angulo_sumidero': angulo_sumidero,
+            'peso_sumidero': float(peso_sumidero) if angulo_sumidero is not None else 0.0,
+        })
+        return len(self.redondeles) - 1
+
+    def _validar_redondel(self, indice):
+        if not 0 <= indice < len(self.redondeles):
+            raise ValueError(f"Redondel desconocido: {indice!r}")
+
+    def conectar(self, origen, destino, longitud=LONGITUD_ENLACE, angulo_salida=0.0,
+                 angulo_entrada=math.pi, peso=1.0):
+        """
+        Une dos redondeles con un enlace de `origen` a `destino`
+
+        Args:
+            origen (int): Redondel de origen
+            destino (int): Redondel de destino
+            longitud (float): Longitud del enlace en metros
+            angulo_salida (float): Ángulo de la salida en el origen
+            angulo_entrada (float): Ángulo de la entrada en el destino
+            peso (float): Peso del enlace en el sorteo de la salida del origen
+
+        Returns:
+            int: Índice del enlace
+        """
+        self._validar_redondel(origen)
+        return self._agregar_enlace(origen, destino, longitud, angulo_salida, angulo_entrada,
+                                    peso=float(peso))
+
+    def agregar_fuente(self, destino, flujo=FLUJO_ENTRADA, longitud=LONGITUD_ENLACE,
+                       angulo_entrada=math.pi):
+        """
+        Agrega un acceso por el que entran vehículos a la red
+
+        Args:
+            destino (int): Redondel al que lleva
+            flujo (float): Vehículos por segundo que llegan (proceso de Bernoulli por paso)
+            longitud (float): Longitud del acceso en metros
+            angulo_entrada (float): Ángulo de la entrada en el destino
+
+        Returns:
+            int: Índice del enlace
+        """
+        if flujo < 0:
+            raise ValueError(f"Flujo inválido: {flujo!r}")
+        return self._agregar_enlace(None, destino, longitud, None, angulo_entrada,
+                                    flujo=float(flujo))
+
+    def _agregar_enlace(self, origen, destino, longitud, angulo_salida, angulo_entrada, **datos):
+        self._validar_redondel(destino)
+        if longitud < LONGITUD_VEHICULO:
+            raise ValueError(f"Enlace más corto que un vehículo: {longitud!r}")
+        self.enlaces.append({
+            'origen': origen, 'destino': destino, 'longitud': float(longitud),
+            'angulo_salida': angulo_salida, 'angulo_entrada': angulo_entrada, **datos
+        })
+        return len(self.enlaces) - 1
+
+    def salidas(self, redondel):
+        """
+        Args:
+            redondel (int): Índice del redondel
+
+        Returns:
+            list: Tuplas (enlace, ángulo, peso) de cada salida con peso
+            positivo; el sumidero tiene enlace -1
+        """
+        datos = self.redondeles[redondel]
+        salidas = [(indice, enlace['angulo_salida'], enlace['peso'])
+                   for indice, enlace in enumerate(self.enlaces)
+                   if enlace['origen'] == redondel and enlace['peso'] > 0]
+        if datos['peso_sumidero'] > 0:
+            salidas.append((-1, datos['angulo_sumidero'], datos['peso_sumidero']))
+        return salidas
+
+    def particionar(self, partes):
+        """
+        Reparte los redondeles en `partes` bloques de índices consecutivos
+        con una cantidad de vehículos inicial parecida. Con la numeración de
+        `corredor` (o cualquiera que siga la forma de la red) los bloques
+        solo comparten los enlaces de sus bordes.
+
+        Args:
+            partes (int): Número de bloques (como mucho, uno por redondel)
+
+        Returns:
+            list: Una lista de índices de redondel por bloque
+        """
+        total = len(self.redondeles)
+        partes = max(1, min(int(partes), total))
+        pesos = [datos['num_vehiculos'] + 1 for datos in self.redondeles]
+        objetivo = sum(pesos) / partes
+        bloques, actual, acumulado = [], [], 0.0
+        for indice, peso in enumerate(pesos):
+            actual.append(indice)
+            acumulado += peso
+            restantes = total - indice - 1
+            faltan = partes - len(bloques) - 1
+            if faltan and (acumulado >= objetivo * (len(bloques) + 1) or restantes == faltan):
+                bloques.append(actual)
+                actual = []
+        bloques.append(actual)
+        return bloques
+
+    @classmethod
+    def corredor(cls, num_redondeles, longitud_enlace=LONGITUD_ENLACE, flujo=FLUJO_ENTRADA,
+                 radio=RADIO_REDONDEL, num_vehiculos=NUMERO_VEHICULOS, flujo_transversal=0.0,
+                 fraccion_salida=0.0):
+        """
+        Corredor de redondeles en línea: cada uno entra por el oeste (π) y
+        sigue hacia el este (0) al siguiente. El primero recibe el flujo
+        principal y el último lo deja salir de la red.
+
+        Args:
+            num_redondeles (int): Número de redondeles
+            longitud_enlace (float): Longitud de cada enlace y acceso en metros
+            flujo (float): Vehículos por segundo que entran al corredor
+            radio (float): Radio de cada redondel
+            num_vehiculos (int): Vehículos iniciales en cada redondel
+            flujo_transversal (float): Vehículos por segundo que entran a cada
+                redondel por el sur (π/2)
+            fraccion_salida (float): Fracción de vehículos que en cada
+                redondel sale de la red por el norte (3π/2) en lugar de seguir
+
+        Returns:
+            Red: Red con los redondeles numerados de oeste a este
+        """
+        if num_redondeles < 1:
+            raise ValueError(f"Número de redondeles inválido: {num_redondeles!r}")
+        red = cls()
+        for indice in range(num_redondeles):
+            if indice == num_redondeles - 1:
+                red.agregar_redondel(radio, num_vehiculos, angulo_sumidero=0.0)
+            else:
+                red.agregar_redondel(radio, num_vehiculos, angulo_sumidero=1.5 * math.pi,
+                                     peso_sumidero=fraccion_salida)
+        if flujo > 0:
+            red.agregar_fuente(0, flujo, longitud_enlace)
+        for indice in range(num_redondeles - 1):
+            red.conectar(indice, indice + 1, longitud_enlace, peso=1.0 - fraccion_salida)
+        if flujo_transversal > 0:
+            for indice in range(num_redondeles):
+                red.agregar_fuente(indice, flujo_transversal, longitud_enlace,
+                                   angulo_entrada=0.5 * math.pi)
+        return red
+
+
+class FragmentoRed:
+    """
+    Parte de una `Red` que avanza un proceso: sus redondeles (un `Redondel`
+    cada uno) y los enlaces que llegan a ellos.
+
+    En cada paso de `avanzar`, los redondeles y enlaces se actualizan con
+    las reglas de `Vehiculo`; luego los vehículos que pasaron su salida la
+    toman si hay lugar al comienzo del enlace (si no, dan otra vuelta), y
+    los que llegaron al final de un enlace entran al redondel si hay hueco.
+    Todas las decisiones usan datos del propio fragmento o del comienzo del
+    paso (la posición del último vehículo de cada enlace de salida), y los
+    sorteos dependen solo de la semilla, el vehículo y el paso: una red
+    partida en varios fragmentos evoluciona exactamente igual que entera.
+    Los vehículos que salen hacia un enlace de otro fragmento se devuelven
+    como traspasos; su dueño los recibe con `recibir`.
+    """
+
+    def __init__(self, red, redondeles, distancia_seguridad, dt, semilla=0,
+                 redondel_problema=None, tiempo_inicio_frenado=None, intervalo_muestreo=10):
+        """
+        Args:
+            red (Red): Topología completa
+            redondeles (list): Índices de los redondeles de este fragmento
+            distancia_seguridad (float): Distancia de seguridad entre vehículos
+            dt (float): Intervalo de tiempo de cada paso
+            semilla (int): Semilla de los sorteos (llegadas y salidas)
+            redondel_problema (int, optional): Redondel en el que, al llegar
+                `tiempo_inicio_frenado`, se sortea el vehículo que frena
+            tiempo_inicio_frenado (float, optional): Instante del frenado
+            intervalo_muestreo (int): Pasos entre muestras de velocidad por redondel
+        """
+        self.red = red
+        self.indices = sorted(redondeles)
+        self.distancia_seguridad = distancia_seguridad
+        self.dt = dt
+        self.semilla = semilla
+        self.redondel_problema = redondel_problema
+        self.tiempo_inicio_frenado = tiempo_inicio_frenado
+        self.intervalo_muestreo = max(1, int(intervalo_muestreo))
+        self.tiempo = 0.0
+        self.pasos = 0
+        self.frenado_iniciado = False
+        self.vehiculo_problema = None
+
+        propios = set(self.indices)
+        self.redondeles = {r: Redondel(red.redondeles[r]['radio'], 0) for r in self.indices}
+        self._salidas = {r: red.salidas(r) for r in self.indices}
+        self.enlaces = {}  # enlaces que llegan a este fragmento
+        self._entrantes = {r: [] for r in self.indices}
+        self._ultimos = {}  # posición del último vehículo de cada enlace de salida
+        self.enlaces_remotos = []  # enlaces de salida hacia otros fragmentos
+        self.fuentes = []
+        for indice, datos in enumerate(red.enlaces):
+            if datos['destino'] in propios:
+                enlace = Enlace(indice, datos['origen'], datos['destino'], datos['longitud'],
+                                datos['angulo_salida'], datos['angulo_entrada'])
+                self.enlaces[indice] = enlace
+                self._entrantes[enlace.destino].append(enlace)
+                if datos['origen'] is None:
+                    self.fuentes.append([enlace, datos['flujo'],
+                                         random.Random(_mezclar(semilla, indice)), 0])
+            if datos['origen'] in propios:
+                self._ultimos[indice] = math.inf
+                if datos['destino'] not in propios:
+                    self.enlaces_remotos.append(indice)
+        self._traspasos = []
+        self._traspasados = set()
+
+        # Estadísticas por redondel (incluyen los enlaces que llegan a él)
+        self.ingresos = dict.fromkeys(self.indices, 0)
+        self.salidas = dict.fromkeys(self.indices, 0)
+        self.frenadas = dict.fromkeys(self.indices, 0)
+        self._frenadas_intervalo = dict.fromkeys(self.indices, 0)
+        self.generados = 0
+        self.salidos = 0
+        self.colisionados_salidos = 0
+        self.pasos_viaje = 0  # pasos en la red de los que salieron (suma exacta)
+        self.muestras = {'tiempo': [], 'velocidad_media': [], 'vehiculos': [], 'frenadas': []}
+
+        # Vehículos iniciales, repartidos como en `Redondel`
+        self._siguiente_id = dict.fromkeys(self.indices, 0)
+        for r in self.indices:
+            datos = red.redondeles[r]
+            redondel = self.redondeles[r]
+            for k in range(datos['num_vehiculos']):
+                angulo = k * (2 * math.pi / datos['num_vehiculos'])
+                vehiculo = VehiculoRed(self._nuevo_id(r), angulo, redondel.radio)
+                self._asignar_salida(vehiculo, r, angulo)
+                redondel.agregar_vehiculo(vehiculo)
+
+    def _nuevo_id(self, redondel):
+        orden = self._siguiente_id[redondel]
+        self._siguiente_id[redondel] = orden + 1
+        return id_vehiculo(len(self.red.redondeles), redondel, orden)
+
+    def _asignar_salida(self, vehiculo, redondel, angulo):
+        """Sortea la salida del vehículo que está en `angulo` del redondel"""
+        salidas = self._salidas[redondel]
+        if not salidas:
+            vehiculo.salida, vehiculo.restante = -1, math.inf
+            return
+        objetivo = _sorteo(self.semilla, vehiculo.id, redondel, self.pasos) * sum(
+            peso for _, _, peso in salidas)
+        for enlace, angulo_salida, peso in salidas:
+            objetivo -= peso
+            if objetivo < 0:
+                break
+        restante = (angulo_salida - angulo) % _DOS_PI
+        vehiculo.salida = enlace
+        vehiculo.restante = restante if restante > 0 else _DOS_PI
+
+    def _entrada_libre(self, redondel, angulo, entrante):
+        """
+        Hay hueco para que `entrante` entre en `angulo`: ningún vehículo del
+        redondel queda a menos de la distancia de seguridad por delante, y el
+        que viene detrás no lo alcanza con su propia regla de reacción. Ese
+        solo empieza a frenar a menos de la distancia de seguridad, tras su
+        tiempo de reacción, y frena un paso por reacción (ver
+        `Vehiculo.actualizar_velocidad`), así que además de su distancia de
+        frenado el hueco cubre lo que se acerca mientras `entrante` acelera
+        hasta su velocidad
+        """
+        radio = redondel.radio
+        hueco = LONGITUD_VEHICULO + self.distancia_seguridad
+        velocidad_entrante = entrante.velocidad
+        aceleracion_entrante = 2 * entrante.aceleracion_normal
+        for vehiculo in redondel.vehiculos:
+            adelante = ((vehiculo.angulo - angulo) % _DOS_PI) * radio
+            if adelante < hueco:
+                return False
+            velocidad = vehiculo.velocidad
+            acercamiento = max(velocidad - velocidad_entrante, 0.0) ** 2 / aceleracion_entrante
+            frenado = _distancia_frenado(vehiculo)
+            if (_DOS_PI * radio - adelante
+                    < hueco + velocidad * vehiculo.tiempo_reaccion + max(frenado, acercamiento)):
+                return False
+        return True
+
+    def _hay_lugar(self, indice, vehiculo, posicion):
+        """
+        Hay lugar para dejar `vehiculo` en `posicion` del enlace `indice`: se
+        detiene a la distancia de seguridad aunque el último esté detenido
+        """
+        return (self._ultimos[indice] - LONGITUD_VEHICULO - posicion
+                >= self.distancia_seguridad + _distancia_frenado(vehiculo))
+
+    def vehiculos(self):
+        """Todos los vehículos del fragmento, en redondeles y enlaces"""
+        for redondel in self.redondeles.values():
+            yield from redondel.vehiculos
+        for enlace in self.enlaces.values():
+            yield from enlace.vehiculos
+
+    def iniciar_frenado(self):
+        """
+        Sortea, como `Simulacion.seleccionar_vehiculo_aleatorio`, el vehículo
+        que frena entre los que circulan por `redondel_problema` (por ID) e
+        inicia su frenado; solo el fragmento dueño del redondel lo hace
+        """
+        self.frenado_iniciado = True
+        redondel = self.redondeles.get(self.redondel_problema)
+        if redondel is None or not redondel.vehiculos:
+            return
+        candidatos = sorted(redondel.vehiculos, key=lambda v: v.id)
+        vehiculo = candidatos[random.Random(self.semilla).randint(0, len(candidatos) - 1)]
+        vehiculo.marcar_como_problema()
+        vehiculo.iniciar_frenado()
+        self.vehiculo_problema = vehiculo.id
+
+    def avanzar(self):
+        """
+        Avanza un paso de `dt`
+
+        Returns:
+            list: Vehículos que tomaron un enlace de otro fragmento
+        """
+        dt = self.dt
+        distancia_seguridad = self.distancia_seguridad
+        if (self.tiempo_inicio_frenado is not None and not self.frenado_iniciado
+                and self.tiempo >= self.tiempo_inicio_frenado):
+            self.iniciar_frenado()
+
+        # Decisiones con el estado al comienzo del paso: quién espera en la
+        # línea de ceda el paso y dónde está el último de cada enlace propio
+        bloqueados = {}
+        for indice, enlace in self.enlaces.items():
+            vehiculos = enlace.vehiculos
+            bloqueados[indice] = bool(vehiculos) and (
+                enlace.longitud - vehiculos[0].posicion
+                < distancia_seguridad + _distancia_frenado(vehiculos[0])
+                and not self._entrada_libre(self.redondeles[enlace.destino],
+                                            enlace.angulo_entrada, vehiculos[0]))
+            if indice in self._ultimos:
+                self._ultimos[indice] = enlace.ultima_posicion()
+
+        # Todos avanzan antes de que alguien cambie de redondel o enlace
+        salientes = {}
+        frenadas = {}
+        for r, redondel in self.redondeles.items():
+            redondel.actualizar(dt, distancia_seguridad)
+            cantidad = 0
+            salientes[r] = []
+            for vehiculo in redondel.vehiculos:
+                vehiculo.restante -= (vehiculo.velocidad / redondel.radio) * dt
+                if vehiculo.tiempo_reaccion_restante == vehiculo.tiempo_reaccion:
+                    cantidad += 1
+                if vehiculo.restante <= 0:
+                    salientes[r].append(vehiculo)
+            for enlace in self._entrantes[r]:
+                cantidad += enlace.actualizar(dt, distancia_seguridad, bloqueados[enlace.indice])
+            frenadas[r] = cantidad
+        self.tiempo += dt
+        self.pasos += 1
+
+        for r, redondel in self.redondeles.items():
+            self.frenadas[r] += frenadas[r]
+            self._frenadas_intervalo[r] += frenadas[r]
+            if salientes[r]:
+                self.salidas[r] += self._salir(redondel, salientes[r])
+        self._generar()
+        for r, redondel in self.redondeles.items():
+            for enlace in self._entrantes[r]:
+                if enlace.vehiculos:
+                    self._entrar(enlace, redondel)
+
+        traspasos, self._traspasos = self._traspasos, []
+        return traspasos
+
+    def _salir(self, redondel, salientes):
+        """
+        Saca del redondel a los vehículos que pasaron su salida, del que más
+        se pasó al que menos; quien no tiene lugar en su enlace da otra vuelta
+
+        Returns:
+            int: Vehículos que salieron
+        """
+        salieron = 0
+        for vehiculo in sorted(salientes, key=lambda v: v.restante):
+            indice = vehiculo.salida
+            if indice < 0:
+                redondel.retirar_vehiculo(vehiculo)
+                self.salidos += 1
+                self.colisionados_salidos += vehiculo.colisiono
+                self.pasos_viaje += self.pasos - vehiculo.paso_ingreso
+                salieron += 1
+                continue
+            posicion = -vehiculo.restante * redondel.radio
+            if not self._hay_lugar(indice, vehiculo, posicion):
+                vehiculo.restante += _DOS_PI
+                continue
+            redondel.retirar_vehiculo(vehiculo)
+            vehiculo.posicion = posicion
+            self._ultimos[indice] = posicion
+            salieron += 1
+            enlace = self.enlaces.get(indice)
+            if enlace is not None:
+                enlace.vehiculos.append(vehiculo)
+            else:
+                self._traspasos.append(vehiculo)
+                self._traspasados.add(indice)
+        return salieron
+
+    def _generar(self):
+        """Llegadas de las fuentes: un sorteo por paso; esperan si el acceso está lleno"""
+        dt = self.dt
+        for fuente in self.fuentes:
+            enlace, flujo, rng, pendientes = fuente
+            if rng.random() < flujo * dt:
+                pendientes += 1
+            if pendientes and (enlace.ultima_posicion() - LONGITUD_VEHICULO
+                               >= self.distancia_seguridad + _FRENADO_FUENTE):
+                vehiculo = VehiculoRed(self._nuevo_id(enlace.destino), paso_ingreso=self.pasos)
+                enlace.vehiculos.append(vehiculo)
+                self.generados += 1
+                pendientes -= 1
+            fuente[3] = pendientes
+
+    def _entrar(self, enlace, redondel):
+        """
+        Pasa al redondel los vehículos que llegaron al final del enlace si hay
+        hueco; si no, el primero queda detenido en la línea de ceda el paso
+        """
+        vehiculos = enlace.vehiculos
+        while vehiculos and vehiculos[0].posicion >= enlace.longitud:
+            vehiculo = vehiculos[0]
+            if not self._entrada_libre(redondel, enlace.angulo_entrada, vehiculo):
+                vehiculo.posicion = enlace.longitud
+                vehiculo.velocidad = 0.0
+                return
+            del vehiculos[0]
+            angulo = (enlace.angulo_entrada
+                      + (vehiculo.posicion - enlace.longitud) / redondel.radio) % _DOS_PI
+            vehiculo.angulo = angulo
+            vehiculo.radio = redondel.radio
+            self._asignar_salida(vehiculo, enlace.destino, angulo)
+            redondel.agregar_vehiculo(vehiculo)
+            self.ingresos[enlace.destino] += 1
+
+    def recibir(self, registros):
+        """
+        Incorpora los vehículos traspasados desde otros fragmentos al final de
+        sus enlaces
+
+        Args:
+            registros (list): Tuplas de `VehiculoRed.a_registro`
+        """
+        for registro in registros:
+            vehiculo = VehiculoRed.desde_registro(registro)
+            self.enlaces[vehiculo.salida].vehiculos.append(vehiculo)
+
+    def ultimos(self, indices):
+        """
+        Args:
+            indices (list): Enlaces propios
+
+        Returns:
+            list: Posición del último vehículo de cada enlace
+        """
+        return [self.enlaces[indice].ultima_posicion() for indice in indices]
+
+    def actualizar_ultimos(self, ultimos):
+        """
+        Recibe la posición del último vehículo de los enlaces de salida de
+        otros fragmentos al terminar el paso. Si este fragmento les traspasó
+        un vehículo en el paso, ese es el último y se conserva su posición.
+
+        Args:
+            ultimos (dict): Posición por índice de enlace
+        """
+        for indice, posicion in ultimos.items():
+            if indice not in self._traspasados:
+                self._ultimos[indice] = posicion
+        self._traspasados.clear()
+
+    def terminar_paso(self):
+        """
+        Cierra el paso una vez recibidos los traspasos: cada
+        `intervalo_muestreo` pasos registra la velocidad media, los vehículos
+        y las frenadas desde la muestra anterior de cada redondel con sus
+        enlaces de llegada
+        """
+        if self.pasos % self.intervalo_muestreo:
+            return
+        velocidades, cantidades = [], []
+        for r, redondel in self.redondeles.items():
+            total = sum(v.velocidad for v in redondel.vehiculos)
+            cantidad = len(redondel.vehiculos)
+            for enlace in self._entrantes[r]:
+                total += sum(v.velocidad for v in enlace.vehiculos)
+                cantidad += len(enlace.vehiculos)
+            velocidades.append(total / cantidad if cantidad else None)
+            cantidades.append(cantidad)
+        self.muestras['tiempo'].append(self.tiempo)
+        self.muestras['velocidad_media'].append(velocidades)
+        self.muestras['vehiculos'].append(cantidades)
+        self.muestras['frenadas'].append([self._frenadas_intervalo[r] for r in self.indices])
+        self._frenadas_intervalo = dict.fromkeys(self.indices, 0)
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Estadísticas del fragmento; las listas por redondel siguen
+            el orden de `indices`
+        """
+        en_red = list(self.vehiculos())
+        return {
+            'redondeles': self.indices,
+            'tiempo': self.tiempo,
+            'ingresos': [self.ingresos[r] for r in self.indices],
+            'salidas': [self.salidas[r] for r in self.indices],
+            'frenadas': [self.frenadas[r] for r in self.indices],
+            'vehiculos': [len(self.redondeles[r].vehiculos)
+                          + sum(len(e.vehiculos) for e in self._entrantes[r])
+                          for r in self.indices],
+            'generados': self.generados,
+            'en_espera': sum(fuente[3] for fuente in self.fuentes),
+            'salidos': self.salidos,
+            'pasos_viaje': self.pasos_viaje,
+            'colisionados': self.colisionados_salidos + sum(v.colisiono for v in en_red),
+            'afectados': sum(v.tuvo_que_frenar for v in en_red),
+            'vehiculo_problema_id': self.vehiculo_problema,
+            'muestras': self.muestras,
+        }
@@ -1,6 +1,8 @@
 import math
+from time import perf_counter
 from models.vehiculo import Vehiculo
-from utils.constantes import RADIO_REDONDEL
+from models.conductores import PARAMETROS_CONDUCTOR, VALORES_POR_DEFECTO
+from utils.constantes import RADIO_REDONDEL, LONGITUD_VEHICULO
 
 
 class Redondel:
@@ -19,10 +21,17 @@ class Redondel:
         self.radio = radio
         self.num_vehiculos = num_vehiculos
         self.vehiculos = []
+        self._por_id = {}  # ID -> vehículo
+        self._posiciones = {}  # ID -> índice en `self.vehiculos`
+        self.instrumentacion = None  # Instrumentacion opcional (ver core/instrumentacion.py)
+        # Con velocidades normales distintas nunca se alcanza un régimen estable
+        self._velocidad_uniforme = True
         self._inicializar_vehiculos()
         
     def _inicializar_vehiculos(self):
         """Crea y distribuye los vehículos uniformemente en el redondel"""
+        if not self.num_vehiculos:
+            return
         angulo_entre_vehiculos = (2 * math.pi) / self.num_vehiculos
         
         for i in range(self.num_vehiculos):
@@ -32,6 +41,57 @@ class Redondel:
             
         # Ordenar vehículos por ángulo
         self.vehiculos.sort(key=lambda v: v.angulo)
+        self._por_id = {vehiculo.id: vehiculo for vehiculo in self.vehiculos}
+        self._indexar_posiciones()
+        
+    def _indexar_posiciones(self):
+        """Reconstruye el índice ID -> posición tras cambiar el orden de la lista"""
+        self._posiciones = {vehiculo.id: i for i, vehiculo in enumerate(self.vehiculos)}
+        
+    def agregar_vehiculo(self, vehiculo):
+        """
+        Incorpora un vehículo que entra al redondel (ver `models/red.py`),
+        en su lugar según el ángulo
+        
+        Args:
+            vehiculo (Vehiculo): Vehículo con `angulo` y `radio` de este redondel
+        """
+        vehiculos = self.vehiculos
+        indice = len(vehiculos)
+        while indice and vehiculos[indice - 1].angulo > vehiculo.angulo:
+            indice -= 1
+        vehiculos.insert(indice, vehiculo)
+        self._por_id[vehiculo.id] = vehiculo
+        self.num_vehiculos = len(vehiculos)
+        if vehiculo.velocidad_normal != vehiculos[indice - 1].velocidad_normal:
+            self._velocidad_uniforme = False
+        self._indexar_posiciones()
+        
+    def retirar_vehiculo(self, vehiculo):
+        """
+        Quita un vehículo que sale del redondel
+        
+        Args:
+            vehiculo (Vehiculo): Vehículo del redondel
+        """
+        del self.vehiculos[self._posiciones[vehiculo.id]]
+        del self._por_id[vehiculo.id]
+        self.num_vehiculos = len(self.vehiculos)
+        self._indexar_posiciones()
+        
+    def asignar_conductores(self, parametros):
+        """
+        Asigna a cada vehículo los parámetros de su conductor
+        
+        Args:
+            parametros (dict): Un arreglo por parámetro de `PARAMETROS_CONDUCTOR`,
+                indexado por ID (ver `PoblacionConductores.muestrear`)
+        """
+        columnas = [parametros[nombre].tolist() for nombre in PARAMETROS_CONDUCTOR]
+        for id_vehiculo, valores in enumerate(zip(*columnas)):
+            self._por_id[id_vehiculo].asignar_conductor(*valores)
+        velocidades = columnas[PARAMETROS_CONDUCTOR.index('velocidad_normal')]
+        self._velocidad_uniforme = min(velocidades) == max(velocidades)
         
     def obtener_vehiculo_adelante(self, vehiculo):
         """
@@ -44,7 +104,7 @@ class Redondel:
             Vehiculo: Vehículo que está adelante
         """
         # Encontrar índice del vehículo actual
-        indice = self.vehiculos.index(vehiculo)
+        indice = self._posiciones[vehiculo.id]
         
         # El vehículo adelante es el siguiente en la lista (circular)
         indice_adelante = (indice + 1) % len(self.vehiculos)
@@ -59,17 +119,81 @@ class Redondel:
             dt (float): Intervalo de tiempo
             distancia_seguridad (float): Distancia de seguridad entre vehículos
         """
+        vehiculos = self.vehiculos
+        instrumentacion = self.instrumentacion
+        if instrumentacion is not None:
+            inicio = perf_counter()
+        
         # Actualizar cada vehículo considerando el vehículo adelante
-        for vehiculo in self.vehiculos:
-            vehiculo_adelante = self.obtener_vehiculo_adelante(vehiculo)
+        # (el siguiente en la lista; el último tiene adelante al primero)
+        for vehiculo, vehiculo_adelante in zip(vehiculos, vehiculos[1:] + vehiculos[:1]):
             vehiculo.actualizar(dt, vehiculo_adelante, distancia_seguridad)
             
+        if instrumentacion is not None:
+            instrumentacion.registrar('fisica', inicio, perf_counter())
+            # Quien frenó en este paso acaba de reiniciar su tiempo de reacción
+            instrumentacion.contar('reacciones', sum(
+                1 for v in vehiculos if v.tiempo_reaccion_restante == v.tiempo_reaccion))
+            instrumentacion.contar('pasos_frenado_problema', sum(
+                1 for v in vehiculos if v.es_vehiculo_problema and v.frenando))
+            inicio = perf_counter()
+            
         # Reordenar vehículos por ángulo después de la actualización
-        self.vehiculos.sort(key=lambda v: v.angulo)
+        self._reordenar()
+        
+        if instrumentacion is not None:
+            instrumentacion.registrar('orden', inicio, perf_counter())
+        
+    def _reordenar(self):
+        """
+        Restablece el orden por ángulo en O(n).
+        
+        Como no hay adelantamientos, el orden circular no cambia: los vehículos
+        que cruzaron 2π quedan al final de la lista con ángulos pequeños y basta
+        con rotarla. Solo si aparece otro desorden (un adelantamiento, o un
+        empate en el que el `sort` estable intercalaría vehículos) se recurre
+        al ordenamiento completo.
+        """
+        vehiculos = self.vehiculos
+        descensos = [i for i in range(len(vehiculos) - 1)
+                     if vehiculos[i].angulo > vehiculos[i + 1].angulo]
+        
+        if not descensos:
+            return
+        
+        if len(descensos) == 1 and vehiculos[-1].angulo < vehiculos[0].angulo:
+            corte = descensos[0] + 1
+            self.vehiculos = vehiculos[corte:] + vehiculos[:corte]
+            if self.instrumentacion is not None:
+                self.instrumentacion.contar('rotaciones')
+        else:
+            vehiculos.sort(key=lambda v: v.angulo)
+            if self.instrumentacion is not None:
+                self.instrumentacion.contar('ordenamientos')
+        self._indexar_posiciones()
+        
+    def instantanea(self):
+        """
+        Obtiene el estado de todos los vehículos como arreglos NumPy de solo
+        lectura, en orden de ángulo (ver `Instantanea`). Se arman en una
+        pasada por los vehículos, sin diccionarios ni trigonometría.
+        
+        Returns:
+            Instantanea: Estado actual (independiente de los pasos siguientes)
+        """
+        # Importación diferida: NumPy no es necesario para avanzar este motor
+        from models.instantanea import Instantanea
+        
+        return Instantanea.desde_registros(self.radio, [
+            (v.id, v.angulo, v.velocidad, v.frenando, v.es_vehiculo_problema,
+             v.tuvo_que_frenar, v.colisiono)
+            for v in self.vehiculos
+        ])
         
     def obtener_estados(self):
         """
-        Obtiene el estado de todos los vehículos
+        Obtiene el estado de todos los vehículos (compatibilidad: para
+        análisis conviene `instantanea`, que no crea un diccionario por vehículo)
         
         Returns:
             list: Lista de diccionarios con el estado de cada vehículo
@@ -86,10 +210,7 @@ class Redondel:
         Returns:
             Vehiculo: Vehículo con el ID especificado
         """
-        for vehiculo in self.vehiculos:
-            if vehiculo.id == id_vehiculo:
-                return vehiculo
-        return None
+        return self._por_id.get(id_vehiculo)
         
     def hay_colisiones(self):
         """
@@ -107,4 +228,251 @@ class Redondel:
         Returns:
             int: Número de vehículos que frenaron
         """
-        return sum(1 for vehiculo in self.vehiculos if vehiculo.tuvo_que_frenar)
\ No newline at end of file
+        return sum(1 for vehiculo in self.vehiculos if vehiculo.tuvo_que_frenar)
+        
+    def hay_perturbacion(self):
+        """
+        Indica si el frenado sigue afectando al redondel
+        
+        Returns:
+            bool: True si algún vehículo está frenando o circula por debajo
+            de su velocidad normal
+        """
+        return any(vehiculo.frenando or vehiculo.velocidad < vehiculo.velocidad_normal
+                   for vehiculo in self.vehiculos)
+        
+    def en_equilibrio(self, tolerancia=0.0):
+        """
+        Indica si el redondel volvió a régimen estable: nadie frena, nadie
+        espera su tiempo de reacción y todos circulan a velocidad normal.
+        Sin diferencias de velocidad ningún vehículo vuelve a frenar; si los
+        conductores tienen velocidades normales distintas, los más rápidos
+        alcanzan a los lentos y nunca hay equilibrio.
+        
+        Args:
+            tolerancia (float): Diferencia admitida respecto a la velocidad
+                normal (con 0 el criterio es exacto)
+            
+        Returns:
+            bool: True si ningún vehículo puede volver a frenar
+        """
+        return self._velocidad_uniforme and all(
+            not vehiculo.frenando
+            and vehiculo.tiempo_reaccion_restante <= 0
+            and vehiculo.velocidad_normal - vehiculo.velocidad <= tolerancia
+            for vehiculo in self.vehiculos)
+        
+    def avanzar_en_reposo(self, dt, pasos):
+        """
+        Avanza `pasos` pasos de un redondel en equilibrio (ver `en_equilibrio`)
+        sin aplicar las reglas: en reposo ninguna regla se activa y solo
+        cambian los ángulos. Se repiten las mismas sumas de punto flotante que
+        `Vehiculo.actualizar`, por lo que el estado final es idéntico al de
+        `pasos` llamadas a `actualizar`.
+        
+        Args:
+            dt (float): Intervalo de tiempo de cada paso
+            pasos (int): Número de pasos a avanzar
+        """
+        dos_pi = 2 * math.pi
+        for vehiculo in self.vehiculos:
+            delta = (vehiculo.velocidad / vehiculo.radio) * dt
+            angulo = vehiculo.angulo
+            for _ in range(pasos):
+                angulo += delta
+                if angulo >= dos_pi:
+                    angulo -= dos_pi
+            vehiculo.angulo = angulo
+            
+        # Sin adelantamientos el orden circular se conserva: basta una rotación
+        self._reordenar()
+
+    def paso_libre(self, distancia_seguridad):
+        """
+        Tiempo durante el cual ninguna regla de reacción puede activarse, de
+        modo que `avanzar_libre` equivale a aplicar las reglas. Es 0 si algún
+        vehículo frena o espera su tiempo de reacción. Si no, se acota por
+        cada par seguidor-líder: sin frenados las velocidades no bajan, así
+        que la separación se reduce a lo sumo a razón de la velocidad máxima
+        del seguidor menos la actual del líder, y el seguidor solo reacciona
+        cuando esa separación baja de `distancia_seguridad`.
+
+        Args:
+            distancia_seguridad (float): Distancia de seguridad entre vehículos
+
+        Returns:
+            float: Duración máxima del paso libre (infinito si nadie se acerca)
+        """
+        vehiculos = self.vehiculos
+        if any(v.frenando or v.tiempo_reaccion_restante > 0 for v in vehiculos):
+            return 0.0
+        if len(vehiculos) < 2:
+            return math.inf
+
+        paso = math.inf
+        for vehiculo, vehiculo_adelante in zip(vehiculos, vehiculos[1:] + vehiculos[:1]):
+            acercamiento = (max(vehiculo.velocidad, vehiculo.velocidad_normal)
+                            - vehiculo_adelante.velocidad)
+            if acercamiento <= 0:
+                continue
+            diff_angular = vehiculo_adelante.angulo - vehiculo.angulo
+            if diff_angular < 0:
+                diff_angular += 2 * math.pi
+            margen = (diff_angular * self.radio - LONGITUD_VEHICULO) - distancia_seguridad
+            if margen <= 0:
+                return 0.0
+            paso = min(paso, margen / acercamiento)
+        return paso
+
+    def avanzar_libre(self, dt):
+        """
+        Avanza `dt` segundos integrando exactamente el movimiento sin reglas
+        de reacción (ver `Vehiculo.avanzar_libre` y `paso_libre`)
+
+        Args:
+            dt (float): Intervalo de tiempo, como mucho `paso_libre`
+        """
+        for vehiculo in self.vehiculos:
+            vehiculo.avanzar_libre(dt)
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar('pasos_libres')
+        self._reordenar()
+
+    def brechas(self):
+        """
+        Separación de cada vehículo con su líder antes de un paso, para
+        `contactos`
+
+        Returns:
+            list: Tuplas (vehículo, vehículo de adelante, separación en metros
+            descontando la longitud del vehículo)
+        """
+        vehiculos = self.vehiculos
+        if len(vehiculos) < 2:
+            return []
+        brechas = []
+        for vehiculo, vehiculo_adelante in zip(vehiculos, vehiculos[1:] + vehiculos[:1]):
+            diff_angular = vehiculo_adelante.angulo - vehiculo.angulo
+            if diff_angular < 0:
+                diff_angular += 2 * math.pi
+            brechas.append((vehiculo, vehiculo_adelante,
+                            diff_angular * self.radio - LONGITUD_VEHICULO))
+        return brechas
+
+    def contactos(self, brechas, dt):
+        """
+        Detección continua de colisiones en el paso recién dado. Durante el
+        paso cada vehículo avanza a su nueva velocidad, así que la separación
+        con el líder varía linealmente desde la de `brechas`; si llega a 0
+        antes del final del paso hubo contacto, aunque en los extremos del
+        paso no se vea (o el seguidor haya atravesado al líder). Los
+        vehículos que chocan quedan marcados con `colisiono`.
+
+        Args:
+            brechas (list): Resultado de `brechas` antes del paso
+            dt (float): Duración del paso
+
+        Returns:
+            list: Tuplas (instante del contacto desde el inicio del paso, ID
+            del vehículo, ID del vehículo de adelante)
+        """
+        contactos = []
+        for vehiculo, vehiculo_adelante, brecha in brechas:
+            acercamiento = vehiculo.velocidad - vehiculo_adelante.velocidad
+            if brecha >= 0 and acercamiento > 0 and brecha < acercamiento * dt:
+                vehiculo.colisiono = True
+                contactos.append((brecha / acercamiento, vehiculo.id, vehiculo_adelante.id))
+        if contactos and self.instrumentacion is not None:
+            self.instrumentacion.contar('contactos', len(contactos))
+        return contactos
+
+    def guardar_estado(self):
+        """
+        Obtiene una copia compacta del estado de todos los vehículos
+        
+        Returns:
+            dict: `radio` y una lista por atributo con los valores de los
+            vehículos en orden de ángulo (mismo formato en ambos motores)
+        """
+        vehiculos = self.vehiculos
+        return {
+            'radio': self.radio,
+            'id': [v.id for v in vehiculos],
+            'angulo': [v.angulo for v in vehiculos],
+            'velocidad': [v.velocidad for v in vehiculos],
+            'frenando': [v.frenando for v in vehiculos],
+            'tiempo_frenado': [v.tiempo_frenado for v in vehiculos],
+            'es_problema': [v.es_vehiculo_problema for v in vehiculos],
+            'tiempo_reaccion_restante': [v.tiempo_reaccion_restante for v in vehiculos],
+            'tuvo_que_frenar': [v.tuvo_que_frenar for v in vehiculos],
+            'colisiono': [v.colisiono for v in vehiculos],
+            **{nombre: [getattr(v, nombre) for v in vehiculos] for nombre in PARAMETROS_CONDUCTOR}
+        }
+        
+    def restaurar_estado(self, estado):
+        """
+        Reemplaza los vehículos por los de un estado guardado con `guardar_estado`
+        
+        Args:
+            estado (dict): Estado guardado
+        """
+        self.radio = estado['radio']
+        self.num_vehiculos = len(estado['id'])
+        self.vehiculos = []
+        for (id_vehiculo, angulo, velocidad, frenando, tiempo_frenado, es_problema,
+             tiempo_reaccion_restante, tuvo_que_frenar, colisiono) in zip(
+                estado['id'], estado['angulo'], estado['velocidad'], estado['frenando'],
+                estado['tiempo_frenado'], estado['es_problema'],
+                estado['tiempo_reaccion_restante'], estado['tuvo_que_frenar'],
+                estado['colisiono']):
+            vehiculo = Vehiculo(id_vehiculo, angulo, self.radio)
+            vehiculo.velocidad = velocidad
+            vehiculo.frenando = frenando
+            vehiculo.tiempo_frenado = tiempo_frenado
+            vehiculo.es_vehiculo_problema = es_problema
+            vehiculo.tiempo_reaccion_restante = tiempo_reaccion_restante
+            vehiculo.tuvo_que_frenar = tuvo_que_frenar
+            vehiculo.colisiono = colisiono
+            self.vehiculos.append(vehiculo)
+        # Los estados anteriores a las poblaciones de conductores no los incluyen
+        for nombre in PARAMETROS_CONDUCTOR:
+            valores = estado.get(nombre, [VALORES_POR_DEFECTO[nombre]] * self.num_vehiculos)
+            for vehiculo, valor in zip(self.vehiculos, valores):
+                setattr(vehiculo, nombre, valor)
+        velocidades = [vehiculo.velocidad_normal for vehiculo in self.vehiculos]
+        self._velocidad_uniforme = min(velocidades) == max(velocidades)
+        self._por_id = {vehiculo.id: vehiculo for vehiculo in self.vehiculos}
+        self._indexar_posiciones()
+        
+    def obtener_resumen(self):
+        """
+        Obtiene métricas agregadas del estado actual
+        
+        Returns:
+            dict: Colisiones, vehículos afectados, frenando y velocidades media/mínima
+        """
+        velocidades = [vehiculo.velocidad for vehiculo in self.vehiculos]
+        return {
+            'hay_colisiones': self.hay_colisiones(),
+            'vehiculos_afectados': self.contar_vehiculos_afectados(),
+            'vehiculos_frenando': sum(1 for vehiculo in self.vehiculos if vehiculo.frenando),
+            'velocidad_media': sum(velocidades) / len(velocidades),
+            'velocidad_minima': min(velocidades)
+        }
+        
+    def obtener_columnas(self):
+        """
+        Obtiene el estado de todos los vehículos por columnas, ordenado por ID
+        
+        Returns:
+            dict: Una lista por atributo (`angulo`, `velocidad`, `frenando`,
+            `tuvo_que_frenar`, `colisiono`) con un valor por vehículo
+        """
+        vehiculos = [self._por_id[i] for i in sorted(self._por_id)]
+        return {
+            'angulo': [v.angulo for v in vehiculos],
+            'velocidad': [v.velocidad for v in vehiculos],
+            'frenando': [v.frenando for v in vehiculos],
+            'tuvo_que_frenar': [v.tuvo_que_frenar for v in vehiculos],
+            'colisiono': [v.colisiono for v in vehiculos]
+        }
\ No newline at end of file
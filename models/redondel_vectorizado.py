@@ -0,0 +1,786 @@
+import math
+from time import perf_counter
+import numpy as np
+from models.conductores import PARAMETROS_CONDUCTOR, VALORES_POR_DEFECTO
+from utils.constantes import RADIO_REDONDEL, LONGITUD_VEHICULO, DURACION_FRENADO
+
+# Arreglos por vehículo que se reordenan junto con los vehículos
+_ESTADO_VEHICULO = ('angulo', 'velocidad', 'frenando', 'tiempo_frenado', 'es_problema',
+                    'tiempo_reaccion_restante', 'tuvo_que_frenar', 'colisiono') + PARAMETROS_CONDUCTOR
+
+
+def _aplicar_reglas(angulo, velocidad, frenando, tiempo_frenado, trr, es_problema,
+                    tiempo_reaccion, aceleracion_frenado, aceleracion_normal, velocidad_normal,
+                    angulo_adelante, velocidad_adelante, radio, dt, distancia_seguridad):
+    """
+    Aplica un paso de `Vehiculo.actualizar` a arreglos de vehículos
+
+    Args:
+        angulo, velocidad, frenando, tiempo_frenado, trr, es_problema (np.ndarray):
+            Estado actual de los vehículos (trr = tiempo de reacción restante)
+        tiempo_reaccion, aceleracion_frenado, aceleracion_normal, velocidad_normal
+            (np.ndarray): Parámetros del conductor de cada vehículo
+        angulo_adelante (np.ndarray): Ángulo del vehículo de adelante de cada uno
+        velocidad_adelante (np.ndarray): Velocidad del vehículo de adelante
+        radio (float): Radio del redondel en metros
+        dt (float): Intervalo de tiempo en segundos
+        distancia_seguridad (float): Distancia de seguridad en metros
+
+    Returns:
+        tuple: (angulo, velocidad, frenando, tiempo_frenado, trr, frena, choca)
+        con el nuevo estado y las máscaras de vehículos que frenaron por
+        reacción y que colisionaron en este paso
+    """
+    # Actualizar tiempo de reacción
+    trr = trr - dt * (trr > 0)
+
+    # Vehículo problema frenando
+    problema = es_problema & frenando
+    if problema.any():
+        tiempo_frenado = tiempo_frenado + dt * problema
+        frenando = frenando & ~(problema & (tiempo_frenado >= DURACION_FRENADO))
+
+    # Resto de vehículos: reaccionar al vehículo de adelante
+    diff_angular = angulo_adelante - angulo
+    diff_angular += (2 * math.pi) * (diff_angular < 0)
+    distancia = diff_angular * radio
+    distancia -= LONGITUD_VEHICULO
+    frena = distancia < distancia_seguridad
+    frena &= velocidad_adelante < velocidad
+    frena &= trr <= 0
+    frena &= ~problema
+    choca = frena & (distancia < 0)
+
+    # Acelerar hasta velocidad normal, salvo quienes frenan
+    nueva_velocidad = velocidad + aceleracion_normal * dt
+    np.minimum(nueva_velocidad, velocidad_normal, out=nueva_velocidad)
+    np.copyto(nueva_velocidad, velocidad, where=velocidad >= velocidad_normal)
+    frenado = problema | frena
+    if frenado.any():
+        np.copyto(nueva_velocidad, np.maximum(0.0, velocidad + aceleracion_frenado * dt),
+                  where=frenado)
+        trr = np.where(frena, tiempo_reaccion, trr)
+    velocidad = nueva_velocidad
+
+    # Actualizar posición angular y normalizar al rango [0, 2π]
+    angulo = angulo + (velocidad / radio) * dt
+    angulo -= (2 * math.pi) * (angulo >= 2 * math.pi)
+
+    return angulo, velocidad, frenando, tiempo_frenado, trr, frena, choca
+
+
+class LoteRedondeles:
+    """
+    Una o varias corridas independientes del mismo redondel avanzadas a la vez.
+
+    El estado se guarda en matrices `num_corridas x num_vehiculos` (una fila
+    por corrida) en disposición de anillo: la columna siguiente (circular) es
+    siempre el vehículo de adelante, y `inicio[fila]` indica la columna del
+    vehículo con menor ángulo. Así se reproduce exactamente el recorrido de
+    `Redondel.actualizar` (lista ordenada por ángulo, donde cada vehículo ve a
+    su líder sin actualizar salvo el último, que ve al primero ya avanzado)
+    sin reordenar en cada paso: solo se ajusta `inicio` cuando un vehículo
+    cruza 2π, y solo si hubo adelantamientos se reordena la fila completa.
+    """
+
+    def __init__(self, radio=RADIO_REDONDEL, num_vehiculos=10, num_corridas=1):
+        """
+        Args:
+            radio (float): Radio del redondel en metros
+            num_vehiculos (int): Número de vehículos en cada redondel
+            num_corridas (int): Número de corridas (filas) del lote
+        """
+        self.radio = radio
+        self.num_vehiculos = num_vehiculos
+        self.num_corridas = num_corridas
+        self.instrumentacion = None  # Instrumentacion opcional (ver core/instrumentacion.py)
+        # Pasos aplicados: una instantánea solo vale mientras no cambie
+        self._pasos = 0
+        self._inicializar_vehiculos()
+
+    def _inicializar_vehiculos(self):
+        """Replica la distribución inicial uniforme en cada corrida"""
+        n, r = self.num_vehiculos, self.num_corridas
+        angulo_entre_vehiculos = (2 * math.pi) / n
+        forma = (r, n)
+
+        self.angulo = np.tile(np.arange(n, dtype=np.float64) * angulo_entre_vehiculos, (r, 1))
+        self.velocidad = np.full(forma, VALORES_POR_DEFECTO['velocidad_normal'], dtype=np.float64)
+        self.frenando = np.zeros(forma, dtype=bool)
+        self.tiempo_frenado = np.zeros(forma, dtype=np.float64)
+        self.es_problema = np.zeros(forma, dtype=bool)
+        self.tiempo_reaccion_restante = np.zeros(forma, dtype=np.float64)
+        self.tuvo_que_frenar = np.zeros(forma, dtype=bool)
+        self.colisiono = np.zeros(forma, dtype=bool)
+
+        # Parámetros del conductor de cada vehículo (ver models/conductores.py)
+        for nombre in PARAMETROS_CONDUCTOR:
+            setattr(self, nombre, np.full(forma, VALORES_POR_DEFECTO[nombre], dtype=np.float64))
+        # Con velocidades normales distintas una fila nunca alcanza un régimen estable
+        self._velocidad_uniforme = np.ones(r, dtype=bool)
+
+        # ID del vehículo en cada columna y columna de cada ID
+        self.ids = np.tile(np.arange(n, dtype=np.int64), (r, 1))
+        self.posicion = self.ids.copy()
+        self.inicio = np.zeros(r, dtype=np.int64)
+        self._filas = np.arange(r)
+
+    def asignar_conductores(self, parametros):
+        """
+        Asigna a cada vehículo los parámetros de su conductor
+
+        Args:
+            parametros (dict): Un arreglo por parámetro de `PARAMETROS_CONDUCTOR`,
+                indexado por ID: de forma (num_vehiculos,) para todas las filas
+                o (num_corridas, num_vehiculos) con una población por fila
+        """
+        filas = self._filas[:, None]
+        for nombre in PARAMETROS_CONDUCTOR:
+            valores = np.broadcast_to(np.asarray(parametros[nombre], dtype=np.float64),
+                                      self.angulo.shape)
+            getattr(self, nombre)[filas, self.posicion] = valores
+        self.velocidad[...] = self.velocidad_normal
+        self._velocidad_uniforme = (self.velocidad_normal == self.velocidad_normal[:, :1]).all(axis=1)
+
+    def _conductor(self, filas=None, columnas=None):
+        """Parámetros del conductor, completos o de las celdas (filas, columnas)"""
+        if filas is None:
+            return tuple(getattr(self, nombre) for nombre in PARAMETROS_CONDUCTOR)
+        return tuple(getattr(self, nombre)[filas, columnas] for nombre in PARAMETROS_CONDUCTOR)
+
+    def marcar_problemas(self, ids_problema):
+        """
+        Marca el vehículo problema de cada corrida
+
+        Args:
+            ids_problema (array-like): ID del vehículo problema de cada fila
+        """
+        ids_problema = np.asarray(ids_problema, dtype=np.int64)
+        self.es_problema[self._filas, self.posicion[self._filas, ids_problema]] = True
+
+    def iniciar_frenado(self):
+        """Inicia el frenado del vehículo problema en todas las corridas"""
+        self.frenando[self.es_problema] = True
+        self.tiempo_frenado[self.es_problema] = 0.0
+
+    def actualizar(self, dt, distancia_seguridad):
+        """
+        Avanza un paso todas las corridas del lote
+
+        Args:
+            dt (float): Intervalo de tiempo
+            distancia_seguridad (float): Distancia de seguridad entre vehículos
+        """
+        filas = self._filas
+        ultimo = (self.inicio - 1) % self.num_vehiculos
+        instrumentacion = self.instrumentacion
+        self._pasos += 1
+        if instrumentacion is not None:
+            inicio = perf_counter()
+
+        # Estado previo del último vehículo de cada fila (se actualiza aparte)
+        previo = (self.angulo[filas, ultimo], self.velocidad[filas, ultimo],
+                  self.frenando[filas, ultimo], self.tiempo_frenado[filas, ultimo],
+                  self.tiempo_reaccion_restante[filas, ultimo], self.es_problema[filas, ultimo])
+        conductor_ultimo = self._conductor(filas, ultimo)
+        tuvo_previo = self.tuvo_que_frenar[filas, ultimo]
+        colisiono_previo = self.colisiono[filas, ultimo]
+
+        # Todos ven a su líder (columna siguiente) aún sin actualizar
+        (self.angulo, self.velocidad, self.frenando, self.tiempo_frenado,
+         self.tiempo_reaccion_restante, frena, choca) = _aplicar_reglas(
+            self.angulo, self.velocidad, self.frenando, self.tiempo_frenado,
+            self.tiempo_reaccion_restante, self.es_problema, *self._conductor(),
+            np.roll(self.angulo, -1, axis=1), np.roll(self.velocidad, -1, axis=1),
+            self.radio, dt, distancia_seguridad
+        )
+        self.tuvo_que_frenar |= frena
+        self.colisiono |= choca
+        if instrumentacion is not None:
+            # El último se recalcula abajo: descontar su resultado provisional
+            reacciones = int(frena.sum() - frena[filas, ultimo].sum())
+
+        # El último de cada fila ve al primero, que ya avanzó en este paso
+        if self.num_vehiculos > 1:
+            adelante = (self.angulo[filas, self.inicio], self.velocidad[filas, self.inicio])
+        else:
+            adelante = previo[:2]
+        angulo, velocidad, frenando, tiempo_frenado, trr, frena, choca = _aplicar_reglas(
+            *previo, *conductor_ultimo, *adelante, self.radio, dt, distancia_seguridad
+        )
+        self.angulo[filas, ultimo] = angulo
+        self.velocidad[filas, ultimo] = velocidad
+        self.frenando[filas, ultimo] = frenando
+        self.tiempo_frenado[filas, ultimo] = tiempo_frenado
+        self.tiempo_reaccion_restante[filas, ultimo] = trr
+        self.tuvo_que_frenar[filas, ultimo] = tuvo_previo | frena
+        self.colisiono[filas, ultimo] = colisiono_previo | choca
+
+        if instrumentacion is not None:
+            instrumentacion.registrar('fisica', inicio, perf_counter())
+            instrumentacion.contar('reacciones', reacciones + int(frena.sum()))
+            instrumentacion.contar('pasos_frenado_problema',
+                                   int((self.frenando & self.es_problema).sum()))
+            inicio = perf_counter()
+
+        self._reordenar(ultimo)
+
+        if instrumentacion is not None:
+            instrumentacion.registrar('orden', inicio, perf_counter())
+
+    def _reordenar(self, ultimo):
+        """
+        Restablece el orden por ángulo de cada fila (equivale al `sort` estable
+        de `Redondel.actualizar`)
+
+        Args:
+            ultimo (np.ndarray): Columna del último vehículo de cada fila antes del paso
+        """
+        filas = self._filas
+        descenso = self.angulo > np.roll(self.angulo, -1, axis=1)
+        descenso[filas, ultimo] = False
+        num_descensos = descenso.sum(axis=1)
+
+        # Un único descenso: algunos vehículos cruzaron 2π y basta rotar `inicio`,
+        # siempre que no haya empate con el primero (el sort estable los intercalaría)
+        rotar = (num_descensos == 1) & (
+            self.angulo[filas, ultimo] < self.angulo[filas, self.inicio])
+        if rotar.any():
+            columna = np.argmax(descenso[rotar], axis=1)
+            self.inicio[rotar] = (columna + 1) % self.num_vehiculos
+
+        # Hubo adelantamientos: reordenar físicamente la fila
+        desordenadas = np.flatnonzero((num_descensos > 0) & ~rotar)
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar('rotaciones', int(rotar.sum()))
+            self.instrumentacion.contar('ordenamientos', len(desordenadas))
+        for fila in desordenadas:
+            columnas = (self.inicio[fila] + np.arange(self.num_vehiculos)) % self.num_vehiculos
+            columnas = columnas[np.argsort(self.angulo[fila, columnas], kind='stable')]
+            for nombre in _ESTADO_VEHICULO + ('ids',):
+                arreglo = getattr(self, nombre)
+                arreglo[fila] = arreglo[fila, columnas]
+            self.posicion[fila, self.ids[fila]] = np.arange(self.num_vehiculos)
+            self.inicio[fila] = 0
+
+    def filas_en_equilibrio(self, tolerancia=0.0):
+        """
+        Corridas cuyo resultado ya no puede cambiar: nadie frena, nadie espera
+        su tiempo de reacción y todos circulan a su velocidad normal. Sin
+        diferencias de velocidad ningún vehículo vuelve a frenar; las filas
+        con velocidades normales distintas nunca están en equilibrio. Solo
+        tiene sentido una vez iniciado el frenado del vehículo problema.
+
+        Args:
+            tolerancia (float): Diferencia admitida respecto a la velocidad
+                normal (con 0 el criterio es exacto)
+
+        Returns:
+            np.ndarray: Booleano por corrida
+        """
+        return (self._velocidad_uniforme
+                & (self.velocidad_normal - self.velocidad <= tolerancia).all(axis=1)
+                & ~self.frenando.any(axis=1)
+                & (self.tiempo_reaccion_restante <= 0).all(axis=1))
+
+    def avanzar_en_reposo(self, dt, pasos):
+        """
+        Avanza `pasos` pasos de corridas en equilibrio (ver
+        `filas_en_equilibrio`) sin aplicar las reglas: solo cambian los
+        ángulos, con las mismas operaciones de punto flotante que
+        `_aplicar_reglas`, por lo que el estado final es idéntico al de
+        `pasos` llamadas a `actualizar`. Todas las filas deben estar en
+        equilibrio.
+
+        Args:
+            dt (float): Intervalo de tiempo de cada paso
+            pasos (int): Número de pasos a avanzar
+        """
+        ultimo = (self.inicio - 1) % self.num_vehiculos
+        self._pasos += 1
+        delta = (self.velocidad / self.radio) * dt
+        for _ in range(pasos):
+            self.angulo += delta
+            self.angulo -= (2 * math.pi) * (self.angulo >= 2 * math.pi)
+
+        # Sin adelantamientos el orden circular se conserva: basta rotar `inicio`
+        self._reordenar(ultimo)
+
+    def _separacion(self):
+        """Separación de cada vehículo con su líder (columna siguiente) sin la longitud del vehículo"""
+        diff_angular = np.roll(self.angulo, -1, axis=1) - self.angulo
+        diff_angular += (2 * math.pi) * (diff_angular < 0)
+        return diff_angular * self.radio - LONGITUD_VEHICULO
+
+    def paso_libre_por_fila(self, distancia_seguridad):
+        """
+        Tiempo durante el cual ninguna regla de reacción puede activarse en
+        cada corrida (ver `Redondel.paso_libre`)
+
+        Args:
+            distancia_seguridad (float): Distancia de seguridad entre vehículos
+
+        Returns:
+            np.ndarray: Duración máxima del paso libre de cada corrida
+        """
+        activas = self.frenando.any(axis=1) | (self.tiempo_reaccion_restante > 0).any(axis=1)
+        if self.num_vehiculos < 2:
+            return np.where(activas, 0.0, np.inf)
+
+        acercamiento = (np.maximum(self.velocidad, self.velocidad_normal)
+                        - np.roll(self.velocidad, -1, axis=1))
+        margen = self._separacion() - distancia_seguridad
+        cota = np.full(self.angulo.shape, np.inf)
+        np.divide(margen, acercamiento, out=cota, where=acercamiento > 0)
+        paso = np.maximum(cota.min(axis=1), 0.0)
+        paso[activas] = 0.0
+        return paso
+
+    def avanzar_libre(self, dt):
+        """
+        Avanza `dt` segundos todas las corridas integrando exactamente el
+        movimiento sin reglas de reacción (ver `Vehiculo.avanzar_libre`)
+
+        Args:
+            dt (float): Intervalo de tiempo, como mucho `paso_libre_por_fila`
+        """
+        ultimo = (self.inicio - 1) % self.num_vehiculos
+        self._pasos += 1
+        velocidad = self.velocidad
+        velocidad_normal = self.velocidad_normal
+        aceleracion = self.aceleracion_normal
+
+        acelera = (velocidad < velocidad_normal) & (aceleracion > 0)
+        tiempo_aceleracion = np.zeros(velocidad.shape)
+        np.divide(velocidad_normal - velocidad, aceleracion, out=tiempo_aceleracion, where=acelera)
+        alcanza = acelera & (dt >= tiempo_aceleracion)
+        parcial = acelera & ~alcanza
+
+        recorrido = velocidad * dt
+        np.copyto(recorrido, (velocidad + 0.5 * aceleracion * dt) * dt, where=parcial)
+        np.copyto(recorrido, (velocidad + velocidad_normal) / 2 * tiempo_aceleracion
+                  + velocidad_normal * (dt - tiempo_aceleracion), where=alcanza)
+        nueva_velocidad = velocidad.copy()
+        np.copyto(nueva_velocidad, velocidad + aceleracion * dt, where=parcial)
+        np.copyto(nueva_velocidad, velocidad_normal, where=alcanza)
+        self.velocidad = nueva_velocidad
+
+        angulo = self.angulo + recorrido / self.radio
+        self.angulo = np.where(angulo >= 2 * math.pi, np.mod(angulo, 2 * math.pi), angulo)
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar('pasos_libres')
+        self._reordenar(ultimo)
+
+    def brechas(self):
+        """
+        Separación de cada vehículo con su líder antes de un paso, para
+        `contactos_por_fila`
+
+        Returns:
+            tuple: (IDs, IDs de los vehículos de adelante, separación en
+            metros), arreglos `num_corridas x num_vehiculos`
+        """
+        return self.ids.copy(), np.roll(self.ids, -1, axis=1), self._separacion()
+
+    def contactos_por_fila(self, brechas, dt):
+        """
+        Detección continua de colisiones en el paso recién dado (ver
+        `Redondel.contactos`). Los vehículos que chocan quedan marcados con
+        `colisiono`.
+
+        Args:
+            brechas (tuple): Resultado de `brechas` antes del paso
+            dt (float): Duración del paso
+
+        Returns:
+            tuple: (fila, instante del contacto desde el inicio del paso, ID
+            del vehículo, ID del vehículo de adelante), un arreglo por campo
+        """
+        ids, ids_adelante, brecha = brechas
+        if self.num_vehiculos < 2:
+            vacio = np.zeros(0, dtype=np.int64)
+            return vacio, np.zeros(0), vacio, vacio
+        filas = self._filas[:, None]
+        acercamiento = (self.velocidad[filas, self.posicion[filas, ids]]
+                        - self.velocidad[filas, self.posicion[filas, ids_adelante]])
+        contacto = (brecha >= 0) & (acercamiento > 0) & (brecha < acercamiento * dt)
+        fila, columna = np.nonzero(contacto)
+        seguidores = ids[fila, columna]
+        self.colisiono[fila, self.posicion[fila, seguidores]] = True
+        if len(fila) and self.instrumentacion is not None:
+            self.instrumentacion.contar('contactos', len(fila))
+        return (fila, brecha[fila, columna] / acercamiento[fila, columna],
+                seguidores, ids_adelante[fila, columna])
+
+    def conservar_filas(self, mascara):
+        """
+        Descarta del lote las corridas que no están en `mascara`
+
+        Args:
+            mascara (np.ndarray): Booleano por corrida, True para conservarla
+        """
+        self._pasos += 1
+        for nombre in _ESTADO_VEHICULO + ('ids', 'posicion', 'inicio', '_velocidad_uniforme'):
+            setattr(self, nombre, getattr(self, nombre)[mascara])
+        self.num_corridas = len(self.inicio)
+        self._filas = np.arange(self.num_corridas)
+
+    def columnas_ordenadas(self, fila=0):
+        """
+        Args:
+            fila (int): Corrida
+
+        Returns:
+            np.ndarray: Columnas de la fila en orden de ángulo creciente
+        """
+        return np.roll(np.arange(self.num_vehiculos), -int(self.inicio[fila]))
+
+    def colisiones_por_corrida(self):
+        """
+        Returns:
+            np.ndarray: Booleano por corrida, True si hubo alguna colisión
+        """
+        return self.colisiono.any(axis=1)
+
+    def afectados_por_corrida(self):
+        """
+        Returns:
+            np.ndarray: Número de vehículos que tuvieron que frenar en cada corrida
+        """
+        return self.tuvo_que_frenar.sum(axis=1)
+
+
+class VehiculoVista:
+    """
+    Vista de un vehículo almacenado en un RedondelVectorizado.
+
+    Ofrece la misma interfaz que `Vehiculo` para que `Simulacion` pueda
+    marcar el vehículo problema e iniciar su frenado sin conocer el motor.
+    """
+
+    def __init__(self, redondel, id_vehiculo):
+        """
+        Args:
+            redondel (RedondelVectorizado): Redondel que contiene el estado
+            id_vehiculo (int): ID del vehículo
+        """
+        self._redondel = redondel
+        self._id = id_vehiculo
+
+    def _leer(self, arreglo):
+        return arreglo[0, self._redondel.posicion[0, self._id]]
+
+    def _escribir(self, arreglo, valor):
+        arreglo[0, self._redondel.posicion[0, self._id]] = valor
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def angulo(self):
+        return float(self._leer(self._redondel.angulo))
+
+    @property
+    def velocidad(self):
+        return float(self._leer(self._redondel.velocidad))
+
+    @property
+    def radio(self):
+        return self._redondel.radio
+
+    @property
+    def frenando(self):
+        return bool(self._leer(self._redondel.frenando))
+
+    @property
+    def tiempo_frenado(self):
+        return float(self._leer(self._redondel.tiempo_frenado))
+
+    @property
+    def es_vehiculo_problema(self):
+        return bool(self._leer(self._redondel.es_problema))
+
+    @property
+    def tiempo_reaccion_restante(self):
+        return float(self._leer(self._redondel.tiempo_reaccion_restante))
+
+    @property
+    def tuvo_que_frenar(self):
+        return bool(self._leer(self._redondel.tuvo_que_frenar))
+
+    @property
+    def tiempo_reaccion(self):
+        return float(self._leer(self._redondel.tiempo_reaccion))
+
+    @property
+    def aceleracion_frenado(self):
+        return float(self._leer(self._redondel.aceleracion_frenado))
+
+    @property
+    def aceleracion_normal(self):
+        return float(self._leer(self._redondel.aceleracion_normal))
+
+    @property
+    def velocidad_normal(self):
+        return float(self._leer(self._redondel.velocidad_normal))
+
+    @property
+    def colisiono(self):
+        return bool(self._leer(self._redondel.colisiono))
+
+    def marcar_como_problema(self):
+        """Marca este vehículo como el que causará el frenado intencional"""
+        self._escribir(self._redondel.es_problema, True)
+
+    def iniciar_frenado(self):
+        """Inicia el frenado del vehículo problema"""
+        if self.es_vehiculo_problema:
+            self._escribir(self._redondel.frenando, True)
+            self._escribir(self._redondel.tiempo_frenado, 0.0)
+
+    def obtener_posicion_cartesiana(self):
+        """
+        Convierte la posición angular a coordenadas cartesianas
+
+        Returns:
+            tuple: (x, y) posición en el plano
+        """
+        angulo = self.angulo
+        return self.radio * math.cos(angulo), self.radio * math.sin(angulo)
+
+    def obtener_estado(self):
+        """
+        Obtiene el estado actual del vehículo
+
+        Returns:
+            dict: Diccionario con información del estado
+        """
+        x, y = self.obtener_posicion_cartesiana()
+        return {
+            'id': self.id,
+            'angulo': self.angulo,
+            'velocidad': self.velocidad,
+            'x': x,
+            'y': y,
+            'frenando': self.frenando,
+            'es_problema': self.es_vehiculo_problema,
+            'tuvo_que_frenar': self.tuvo_que_frenar,
+            'colisiono': self.colisiono
+        }
+
+
+class RedondelVectorizado(LoteRedondeles):
+    """
+    Redondel cuyo estado vive en arreglos NumPy (un `LoteRedondeles` de una fila).
+
+    Aplica las mismas reglas que `Vehiculo.actualizar` en el mismo orden que
+    `Redondel.actualizar`, por lo que los resultados coinciden con el motor de
+    objetos, y expone la misma interfaz que `Redondel`.
+    """
+
+    def __init__(self, radio=RADIO_REDONDEL, num_vehiculos=10):
+        """
+        Inicializa el redondel con vehículos distribuidos uniformemente
+
+        Args:
+            radio (float): Radio del redondel en metros
+            num_vehiculos (int): Número de vehículos en el redondel
+        """
+        super().__init__(radio, num_vehiculos, num_corridas=1)
+
+    @property
+    def vehiculos(self):
+        """Vistas de los vehículos en orden de ángulo (compatibilidad con `Redondel`)"""
+        return [VehiculoVista(self, i) for i in self.ids[0, self.columnas_ordenadas()].tolist()]
+
+    def instantanea(self):
+        """
+        Obtiene el estado de todos los vehículos como vistas de solo lectura
+        sobre los arreglos del redondel, sin copias (ver `Instantanea`).
+        Solo vale hasta el próximo paso, después leerla lanza `RuntimeError`:
+        para conservar el estado, usar `Instantanea.copiar`.
+
+        Returns:
+            Instantanea: Estado actual en orden de almacenamiento
+        """
+        from models.instantanea import Instantanea
+
+        pasos = self._pasos
+        return Instantanea(self.radio, {
+            'id': self.ids[0],
+            'angulo': self.angulo[0],
+            'velocidad': self.velocidad[0],
+            'frenando': self.frenando[0],
+            'es_problema': self.es_problema[0],
+            'tuvo_que_frenar': self.tuvo_que_frenar[0],
+            'colisiono': self.colisiono[0]
+        }, inicio=self.inicio[0], posicion=self.posicion[0],
+            vigente=lambda: self._pasos == pasos)
+
+    def obtener_estados(self):
+        """
+        Obtiene el estado de todos los vehículos (compatibilidad: para
+        análisis conviene `instantanea`)
+
+        Returns:
+            list: Lista de diccionarios con el estado de cada vehículo
+        """
+        return self.instantanea().estados()
+
+    def obtener_vehiculo_por_id(self, id_vehiculo):
+        """
+        Obtiene un vehículo por su ID
+
+        Args:
+            id_vehiculo (int): ID del vehículo
+
+        Returns:
+            VehiculoVista: Vista del vehículo con el ID especificado
+        """
+        if 0 <= id_vehiculo < self.num_vehiculos:
+            return VehiculoVista(self, id_vehiculo)
+        return None
+
+    def hay_colisiones(self):
+        """
+        Verifica si hubo alguna colisión
+
+        Returns:
+            bool: True si hubo colisión, False en caso contrario
+        """
+        return bool(self.colisiono.any())
+
+    def contar_vehiculos_afectados(self):
+        """
+        Cuenta cuántos vehículos tuvieron que frenar
+
+        Returns:
+            int: Número de vehículos que frenaron
+        """
+        return int(self.tuvo_que_frenar.sum())
+
+    def hay_perturbacion(self):
+        """
+        Indica si el frenado sigue afectando al redondel
+
+        Returns:
+            bool: True si algún vehículo está frenando o circula por debajo
+            de su velocidad normal
+        """
+        return bool(self.frenando.any() or (self.velocidad < self.velocidad_normal).any())
+
+    def en_equilibrio(self, tolerancia=0.0):
+        """
+        Indica si el redondel volvió a régimen estable (ver `filas_en_equilibrio`)
+
+        Args:
+            tolerancia (float): Diferencia admitida respecto a la velocidad normal
+
+        Returns:
+            bool: True si ningún vehículo puede volver a frenar
+        """
+        return bool(self.filas_en_equilibrio(tolerancia)[0])
+
+    def paso_libre(self, distancia_seguridad):
+        """
+        Tiempo durante el cual ninguna regla de reacción puede activarse (ver
+        `Redondel.paso_libre`)
+
+        Args:
+            distancia_seguridad (float): Distancia de seguridad entre vehículos
+
+        Returns:
+            float: Duración máxima del paso libre
+        """
+        return float(self.paso_libre_por_fila(distancia_seguridad)[0])
+
+    def contactos(self, brechas, dt):
+        """
+        Detección continua de colisiones en el paso recién dado (ver
+        `Redondel.contactos`)
+
+        Returns:
+            list: Tuplas (instante del contacto desde el inicio del paso, ID
+            del vehículo, ID del vehículo de adelante)
+        """
+        _, instantes, seguidores, lideres = self.contactos_por_fila(brechas, dt)
+        return list(zip(instantes.tolist(), seguidores.tolist(), lideres.tolist()))
+
+    def guardar_estado(self):
+        """
+        Obtiene una copia compacta del estado de todos los vehículos
+
+        Returns:
+            dict: `radio` y una lista por atributo con los valores de los
+            vehículos en orden de ángulo (mismo formato que `Redondel`)
+        """
+        columnas = self.columnas_ordenadas()
+        estado = {'radio': self.radio, 'id': self.ids[0, columnas].tolist()}
+        for campo in _ESTADO_VEHICULO:
+            estado[campo] = getattr(self, campo)[0, columnas].tolist()
+        return estado
+
+    def restaurar_estado(self, estado):
+        """
+        Reemplaza el estado por uno guardado con `guardar_estado` (de
+        cualquiera de los dos motores)
+
+        Args:
+            estado (dict): Estado guardado
+        """
+        self._pasos += 1
+        self.radio = estado['radio']
+        self.num_vehiculos = len(estado['id'])
+        self.num_corridas = 1
+        self.angulo = np.array([estado['angulo']], dtype=np.float64)
+        self.velocidad = np.array([estado['velocidad']], dtype=np.float64)
+        self.frenando = np.array([estado['frenando']], dtype=bool)
+        self.tiempo_frenado = np.array([estado['tiempo_frenado']], dtype=np.float64)
+        self.es_problema = np.array([estado['es_problema']], dtype=bool)
+        self.tiempo_reaccion_restante = np.array([estado['tiempo_reaccion_restante']],
+                                                 dtype=np.float64)
+        self.tuvo_que_frenar = np.array([estado['tuvo_que_frenar']], dtype=bool)
+        self.colisiono = np.array([estado['colisiono']], dtype=bool)
+        # Los estados anteriores a las poblaciones de conductores no los incluyen
+        for nombre in PARAMETROS_CONDUCTOR:
+            valores = estado.get(nombre, [VALORES_POR_DEFECTO[nombre]] * self.num_vehiculos)
+            setattr(self, nombre, np.array([valores], dtype=np.float64))
+        self._velocidad_uniforme = (self.velocidad_normal == self.velocidad_normal[:, :1]).all(axis=1)
+        self.ids = np.array([estado['id']], dtype=np.int64)
+        self.posicion = np.empty_like(self.ids)
+        self.posicion[0, self.ids[0]] = np.arange(self.num_vehiculos)
+        self.inicio = np.zeros(1, dtype=np.int64)
+        self._filas = np.arange(1)
+
+    def obtener_resumen(self):
+        """
+        Obtiene métricas agregadas del estado actual
+
+        Returns:
+            dict: Colisiones, vehículos afectados, frenando y velocidades media/mínima
+        """
+        return {
+            'hay_colisiones': self.hay_colisiones(),
+            'vehiculos_afectados': self.contar_vehiculos_afectados(),
+            'vehiculos_frenando': int(self.frenando.sum()),
+            'velocidad_media': float(self.velocidad.mean()),
+            'velocidad_minima': float(self.velocidad.min())
+        }
+
+    def obtener_columnas(self):
+        """
+        Obtiene el estado de todos los vehículos por columnas, ordenado por ID
+
+        Returns:
+            dict: Un arreglo (copia) por atributo (`angulo`, `velocidad`,
+            `frenando`, `tuvo_que_frenar`, `colisiono`) con un valor por vehículo
+        """
+        columnas = self.posicion[0]
+        return {
+            'angulo': self.angulo[0, columnas],
+            'velocidad': self.velocidad[0, columnas],
+            'frenando': self.frenando[0, columnas],
+            'tuvo_que_frenar': self.tuvo_que_frenar[0, columnas],
+            'colisiono': self.colisiono[0, columnas]
+        }
@@ -28,10 +28,34 @@ class Vehiculo:
         self.es_vehiculo_problema = False
         self.tiempo_reaccion_restante = 0.0
         
+        # Parámetros del conductor (ver models/conductores.py)
+        self.tiempo_reaccion = TIEMPO_REACCION
+        self.aceleracion_frenado = ACELERACION_FRENADO
+        self.aceleracion_normal = ACELERACION_NORMAL
+        self.velocidad_normal = VELOCIDAD_NORMAL
+        
         # Estadísticas
         self.tuvo_que_frenar = False
         self.colisiono = False
         
+    def asignar_conductor(self, tiempo_reaccion, aceleracion_frenado, aceleracion_normal,
+                          velocidad_normal):
+        """
+        Asigna los parámetros del conductor; el vehículo pasa a circular a su
+        velocidad normal
+        
+        Args:
+            tiempo_reaccion (float): Tiempo de reacción en segundos
+            aceleracion_frenado (float): Desaceleración al frenar (m/s², negativa)
+            aceleracion_normal (float): Aceleración al retomar velocidad (m/s²)
+            velocidad_normal (float): Velocidad de circulación en m/s
+        """
+        self.tiempo_reaccion = tiempo_reaccion
+        self.aceleracion_frenado = aceleracion_frenado
+        self.aceleracion_normal = aceleracion_normal
+        self.velocidad_normal = velocidad_normal
+        self.velocidad = velocidad_normal
+        
     def marcar_como_problema(self):
         """Marca este vehículo como el que causará el frenado intencional"""
         self.es_vehiculo_problema = True
@@ -80,6 +104,38 @@ class Vehiculo:
             vehiculo_adelante (Vehiculo): Vehículo que está adelante (si existe)
             distancia_seguridad (float): Distancia de seguridad en metros
         """
+        if vehiculo_adelante is None:
+            self.actualizar_velocidad(dt)
+        else:
+            # Distancia al vehículo de adelante (ver `detectar_vehiculo_adelante`)
+            diff_angular = vehiculo_adelante.angulo - self.angulo
+            if diff_angular < 0:
+                diff_angular += 2 * math.pi
+            self.actualizar_velocidad(dt, diff_angular * self.radio - LONGITUD_VEHICULO,
+                                      vehiculo_adelante.velocidad, distancia_seguridad)
+        
+        # Actualizar posición angular
+        velocidad_angular = self.velocidad / self.radio
+        self.angulo += velocidad_angular * dt
+        
+        # Normalizar ángulo al rango [0, 2π]
+        if self.angulo >= 2 * math.pi:
+            self.angulo -= 2 * math.pi
+
+    def actualizar_velocidad(self, dt, distancia=None, velocidad_adelante=0.0,
+                             distancia_seguridad=5.0):
+        """
+        Aplica las reglas de reacción y actualiza la velocidad, sin mover el
+        vehículo: `actualizar` lo usa en el redondel y los enlaces de una red
+        (ver `models/red.py`) sobre un tramo recto
+        
+        Args:
+            dt (float): Intervalo de tiempo en segundos
+            distancia (float, optional): Separación con el vehículo de
+                adelante descontando su longitud (None si no hay ninguno)
+            velocidad_adelante (float): Velocidad del vehículo de adelante
+            distancia_seguridad (float): Distancia de seguridad en metros
+        """
         # Actualizar tiempo de reacción
         if self.tiempo_reaccion_restante > 0:
             self.tiempo_reaccion_restante -= dt
@@ -87,46 +143,65 @@ class Vehiculo:
         # Si es el vehículo problema y está frenando
         if self.es_vehiculo_problema and self.frenando:
             self.tiempo_frenado += dt
-            self.velocidad = max(0, self.velocidad + ACELERACION_FRENADO * dt)
+            self.velocidad = max(0, self.velocidad + self.aceleracion_frenado * dt)
             
             # Después de 2 segundos, retomar velocidad
             if self.tiempo_frenado >= 2.0:
                 self.frenando = False
                 
         # Si no es el vehículo problema, reaccionar a vehículos adelante
-        elif vehiculo_adelante is not None and self.tiempo_reaccion_restante <= 0:
-            necesita_frenar, distancia = self.detectar_vehiculo_adelante(
-                vehiculo_adelante, distancia_seguridad
-            )
-            
-            if necesita_frenar:
+        elif distancia is not None and self.tiempo_reaccion_restante <= 0:
+            if distancia < distancia_seguridad and velocidad_adelante < self.velocidad:
                 # Frenar para evitar colisión
-                self.velocidad = max(0, self.velocidad + ACELERACION_FRENADO * dt)
+                self.velocidad = max(0, self.velocidad + self.aceleracion_frenado * dt)
                 self.tuvo_que_frenar = True
-                self.tiempo_reaccion_restante = TIEMPO_REACCION
+                self.tiempo_reaccion_restante = self.tiempo_reaccion
                 
                 # Verificar colisión
                 if distancia < 0:
                     self.colisiono = True
             else:
                 # Acelerar hasta velocidad normal
-                if self.velocidad < VELOCIDAD_NORMAL:
-                    self.velocidad = min(VELOCIDAD_NORMAL, 
-                                       self.velocidad + ACELERACION_NORMAL * dt)
+                if self.velocidad < self.velocidad_normal:
+                    self.velocidad = min(self.velocidad_normal, 
+                                       self.velocidad + self.aceleracion_normal * dt)
         else:
             # Acelerar hasta velocidad normal si no hay problema adelante
-            if self.velocidad < VELOCIDAD_NORMAL:
-                self.velocidad = min(VELOCIDAD_NORMAL, 
-                                   self.velocidad + ACELERACION_NORMAL * dt)
-        
-        # Actualizar posición angular
-        velocidad_angular = self.velocidad / self.radio
-        self.angulo += velocidad_angular * dt
-        
-        # Normalizar ángulo al rango [0, 2π]
+            if self.velocidad < self.velocidad_normal:
+                self.velocidad = min(self.velocidad_normal, 
+                                   self.velocidad + self.aceleracion_normal * dt)
+
+    def avanzar_libre(self, dt):
+        """
+        Avanza `dt` segundos sin reaccionar a nadie: acelera hasta la velocidad
+        normal y luego la mantiene. A diferencia de `actualizar`, integra el
+        movimiento de forma exacta (aceleración constante), por lo que `dt`
+        puede ser largo. Solo es válido si en ese intervalo ninguna regla de
+        reacción se activaría (ver `Redondel.paso_libre`).
+
+        Args:
+            dt (float): Intervalo de tiempo en segundos
+        """
+        velocidad = self.velocidad
+        velocidad_normal = self.velocidad_normal
+        aceleracion = self.aceleracion_normal
+        if velocidad < velocidad_normal and aceleracion > 0:
+            tiempo_aceleracion = (velocidad_normal - velocidad) / aceleracion
+            if dt < tiempo_aceleracion:
+                recorrido = (velocidad + 0.5 * aceleracion * dt) * dt
+                velocidad = velocidad + aceleracion * dt
+            else:
+                recorrido = ((velocidad + velocidad_normal) / 2 * tiempo_aceleracion
+                             + velocidad_normal * (dt - tiempo_aceleracion))
+                velocidad = velocidad_normal
+        else:
+            recorrido = velocidad * dt
+        self.velocidad = velocidad
+
+        self.angulo += recorrido / self.radio
         if self.angulo >= 2 * math.pi:
-            self.angulo -= 2 * math.pi
-            
+            self.angulo %= 2 * math.pi
+
     def obtener_posicion_cartesiana(self):
         """
         Convierte la posición angular a coordenadas cartesianas
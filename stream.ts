@@ -0,0 +1,120 @@
+import { StreamConfig, StreamFrame } from './types';
+import {
+  STREAM_FRAME_VERSION,
+  STREAM_HEADER_BYTES,
+  STREAM_KEYFRAME,
+  STREAM_DELTA,
+  STREAM_RECONNECT_MS,
+} from './constants';
+
+// Rebuild a frame from a binary message. Keyframes carry every array; delta
+// frames carry all angles plus only the cars whose speed or flags changed.
+export const decodeFrame = (buffer: ArrayBuffer, previous: StreamFrame | null): StreamFrame => {
+  const header = new DataView(buffer, 0, STREAM_HEADER_BYTES);
+  const type = header.getUint8(0);
+  const version = header.getUint8(1);
+  if (version !== STREAM_FRAME_VERSION) {
+    throw new Error(`Unsupported frame version ${version}`);
+  }
+  const count = header.getUint32(4, true);
+  const step = header.getUint32(8, true);
+  const changes = header.getUint32(12, true);
+  const time = header.getFloat64(16, true);
+
+  let offset = STREAM_HEADER_BYTES;
+  const angles = new Float32Array(buffer, offset, count);
+  offset += 4 * count;
+
+  if (type === STREAM_KEYFRAME) {
+    // Copies: later deltas patch these arrays in place
+    const speeds = new Float32Array(buffer.slice(offset, offset + 4 * count));
+    const flags = new Uint8Array(buffer.slice(offset + 4 * count, offset + 5 * count));
+    return { step, time, angles, speeds, flags };
+  }
+  if (type !== STREAM_DELTA) {
+    throw new Error(`Unknown frame type ${type}`);
+  }
+  if (!previous || previous.speeds.length !== count) {
+    throw new Error('Delta frame without a base frame');
+  }
+  const indices = new Uint32Array(buffer, offset, changes);
+  offset += 4 * changes;
+  const speeds = new Float32Array(buffer, offset, changes);
+  const flags = new Uint8Array(buffer, offset + 4 * changes, changes);
+  for (let i = 0; i < changes; i++) {
+    previous.speeds[indices[i]] = speeds[i];
+    previous.flags[indices[i]] = flags[i];
+  }
+  return { step, time, angles, speeds: previous.speeds, flags: previous.flags };
+};
+
+interface StreamHandlers {
+  onOpen?: () => void;
+  onConfig?: (config: StreamConfig) => void;
+  onFrame?: (frame: StreamFrame) => void;
+  onEnd?: (summary: Record<string, unknown>) => void;
+}
+
+// WebSocket connection to `python -m core.servidor`. Every decoded frame is
+// acknowledged so the server never has more than a couple in flight: a busy
+// tab receives fewer frames instead of an ever-growing backlog.
+export class SimulationStream {
+  frame: StreamFrame | null = null;
+  config: StreamConfig | null = null;
+  connected = false;
+  private socket: WebSocket | null = null;
+  private closed = false;
+  private reconnectTimer = 0;
+
+  constructor(private url: string, private handlers: StreamHandlers = {}) {
+    this.connect();
+  }
+
+  send(action: string, parameters?: Record<string, unknown>) {
+    if (this.socket?.readyState !== WebSocket.OPEN) return;
+    this.socket.send(JSON.stringify(parameters ? { accion: action, parametros: parameters } : { accion: action }));
+  }
+
+  close() {
+    this.closed = true;
+    window.clearTimeout(this.reconnectTimer);
+    this.socket?.close();
+  }
+
+  private connect() {
+    const socket = new WebSocket(this.url);
+    socket.binaryType = 'arraybuffer';
+    socket.onopen = () => {
+      this.connected = true;
+      this.handlers.onOpen?.();
+    };
+    socket.onmessage = (event: MessageEvent) => {
+      if (typeof event.data === 'string') {
+        this.handleEvent(JSON.parse(event.data));
+        return;
+      }
+      this.frame = decodeFrame(event.data as ArrayBuffer, this.frame);
+      this.send('recibido');
+      this.handlers.onFrame?.(this.frame);
+    };
+    socket.onclose = () => {
+      this.connected = false;
+      this.frame = null;
+      if (!this.closed) {
+        this.reconnectTimer = window.setTimeout(() => this.connect(), STREAM_RECONNECT_MS);
+      }
+    };
+    this.socket = socket;
+  }
+
+  private handleEvent(message: { evento: string; [key: string]: unknown }) {
+    if (message.evento === 'configuracion') {
+      this.config = message as unknown as StreamConfig;
+      this.handlers.onConfig?.(this.config);
+    } else if (message.evento === 'fin') {
+      this.handlers.onEnd?.(message);
+    } else if (message.evento === 'error') {
+      console.warn('Simulation server:', message.mensaje);
+    }
+  }
+}
@@ -0,0 +1,9 @@
+import pytest
+
+from core.barrido import Barrido
+
+
+def test_barrido_rechaza_semillas_repetidas():
+    with pytest.raises(ValueError, match='3'):
+        Barrido(seeds=[1, 3, 2, 3])
+    assert Barrido(seeds=range(4)).seeds == [0, 1, 2, 3]
@@ -0,0 +1,11 @@
+from core.cache import CacheResultados
+
+
+def test_reescribir_una_entrada_no_cuenta_sus_bytes_dos_veces(tmp_path):
+    cache = CacheResultados(str(tmp_path))
+    parametros = {'distancia_seguridad': 5.0}
+    for _ in range(5):
+        cache.guardar(parametros, 0, {'seed': 0, 'hubo_colisiones': False})
+    cache.guardar(parametros, 1, {'seed': 1, 'hubo_colisiones': True})
+    assert cache._bytes == CacheResultados(str(tmp_path))._bytes
+    assert cache.obtener(parametros, 0) == {'seed': 0, 'hubo_colisiones': False}
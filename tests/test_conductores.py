@@ -0,0 +1,38 @@
+import pytest
+
+from models.conductores import PARAMETROS_CONDUCTOR, PoblacionConductores
+
+
+@pytest.mark.parametrize('parametros', [
+    {'tiempo_reaccion': {'distribucion': 'normal', 'media': 0.5, 'desviacion': 0.3}},
+    {'velocidad_normal': {'distribucion': 'normal', 'media': 10, 'desviacion': 4}},
+    {'aceleracion_frenado': {'distribucion': 'normal', 'media': -5, 'desviacion': 2}},
+    {'aceleracion_frenado': {'distribucion': 'normal', 'media': -5, 'desviacion': 2,
+                             'maximo': 1}},
+    {'aceleracion_frenado': {'distribucion': 'lognormal', 'media': 5, 'desviacion': 1}},
+    {'aceleracion_frenado': 5.0},
+    {'tiempo_reaccion': -0.1},
+    {'tiempo_reaccion': {'distribucion': 'uniforme', 'minimo': 0.9, 'maximo': 0.3}},
+    {'tiempo_reaccion': {'distribucion': 'uniforme', 'minimo': -0.2, 'maximo': 0.3}},
+    {'velocidad_normal': {'distribucion': 'lognormal', 'media': 10, 'desviacion': -1}},
+    {'velocidad_normal': {'distribucion': 'normal', 'media': 10, 'desviacion': 1,
+                          'minimo': 12, 'maximo': 8}},
+])
+def test_rechaza_distribuciones_sin_sentido_fisico(parametros):
+    with pytest.raises(ValueError):
+        PoblacionConductores(**parametros)
+
+
+def test_distribuciones_validas_dan_valores_en_rango():
+    poblacion = PoblacionConductores(
+        tiempo_reaccion={'distribucion': 'normal', 'media': 0.5, 'desviacion': 0.32, 'minimo': 0.1},
+        aceleracion_frenado={'distribucion': 'normal', 'media': -5, 'desviacion': 3, 'maximo': -1},
+        aceleracion_normal={'distribucion': 'lognormal', 'media': 2, 'desviacion': 0.5},
+        velocidad_normal={'distribucion': 'uniforme', 'minimo': 8, 'maximo': 12})
+    valores = poblacion.muestrear(1000, seed=0)
+    assert set(valores) == set(PARAMETROS_CONDUCTOR)
+    assert valores['tiempo_reaccion'].min() >= 0.1
+    assert valores['aceleracion_frenado'].max() <= -1
+    assert valores['aceleracion_normal'].min() > 0
+    assert 8 <= valores['velocidad_normal'].min() <= valores['velocidad_normal'].max() <= 12
+    assert PoblacionConductores.desde_dict(poblacion.describir()).describir() == poblacion.describir()
@@ -0,0 +1,142 @@
+"""
+Equivalencias exactas entre caminos de cálculo que deben dar el mismo
+resultado: motores, lotes, cortes y saltos de la corrida, puntos de control
+y deduplicación por simetría.
+"""
+import numpy as np
+import pytest
+
+from core.montecarlo import MonteCarlo
+from core.simetria import SIMETRIA_NINGUNA
+from core.simulacion import Simulacion
+from models.redondel import Redondel
+from models.vehiculo import Vehiculo
+from utils.constantes import (
+    DT, MOTOR_OBJETOS, MOTOR_VECTORIZADO, REGISTRO_COLUMNAR, REGISTRO_NINGUNO
+)
+
+# (distancia_seguridad, num_vehiculos, seed): con y sin colisiones
+CASOS = [(2.0, 10, 0), (5.0, 10, 3), (3.0, 20, 7), (5.0, 30, 11)]
+MOTORES = [MOTOR_OBJETOS, MOTOR_VECTORIZADO]
+
+
+def _estado_final(simulacion):
+    """Estado de la simulación sin historial ni parámetros (el motor puede cambiar)"""
+    estado = simulacion.guardar_estado(incluir_historial=False)
+    del estado['parametros']
+    return estado
+
+
+def _sin_historial(resultados):
+    return {clave: valor for clave, valor in resultados.items() if clave != 'historial'}
+
+
+@pytest.mark.parametrize('distancia_seguridad, num_vehiculos, seed', CASOS)
+def test_motor_vectorizado_reproduce_al_de_objetos(distancia_seguridad, num_vehiculos, seed):
+    historiales = []
+    resultados = []
+    for motor in MOTORES:
+        simulacion = Simulacion(num_vehiculos=num_vehiculos, distancia_seguridad=distancia_seguridad,
+                                motor=motor, registro=REGISTRO_COLUMNAR)
+        resultado = simulacion.ejecutar_completa(seed=seed)
+        historiales.append(resultado['historial'])
+        resultados.append(_sin_historial(resultado))
+    assert resultados[0] == resultados[1]
+    for campo in historiales[0]:
+        assert np.array_equal(historiales[0][campo], historiales[1][campo]), campo
+
+
+def test_orden_sin_ordenar_coincide_con_el_ordenamiento_completo():
+    # Implementación original: líder buscado en la lista y orden completo en cada paso
+    redondel = Redondel(num_vehiculos=20)
+    referencia = [Vehiculo(v.id, v.angulo, v.radio) for v in redondel.vehiculos]
+    for vehiculos in (redondel.vehiculos, referencia):
+        problema = next(v for v in vehiculos if v.id == 3)
+        problema.marcar_como_problema()
+        problema.iniciar_frenado()
+    for _ in range(400):
+        redondel.actualizar(DT, 3.0)
+        for vehiculo in referencia:
+            adelante = referencia[(referencia.index(vehiculo) + 1) % len(referencia)]
+            vehiculo.actualizar(DT, adelante, 3.0)
+        referencia.sort(key=lambda v: v.angulo)
+        assert [v.obtener_estado() for v in redondel.vehiculos] == [
+            v.obtener_estado() for v in referencia]
+        for vehiculo, siguiente in zip(referencia, referencia[1:] + referencia[:1]):
+            assert redondel.obtener_vehiculo_adelante(
+                redondel.obtener_vehiculo_por_id(vehiculo.id)).id == siguiente.id
+
+
+@pytest.mark.parametrize('distancia_seguridad, num_vehiculos', [(2.0, 10), (5.0, 10), (3.0, 20)])
+def test_lotes_coinciden_con_corridas_individuales(distancia_seguridad, num_vehiculos):
+    opciones = dict(num_runs=30, num_vehiculos=num_vehiculos,
+                    distancia_seguridad=distancia_seguridad, simetria=SIMETRIA_NINGUNA)
+    individuales = MonteCarlo(**opciones).run()
+    lotes = MonteCarlo(**opciones).run_batched(batch_size=7)
+    assert lotes['seed'].tolist() == [r['seed'] for r in individuales]
+    assert lotes['vehiculo_problema_id'].tolist() == [r['vehiculo_problema_id'] for r in individuales]
+    assert lotes['hubo_colisiones'].tolist() == [r['hubo_colisiones'] for r in individuales]
+    assert lotes['vehiculos_afectados'].tolist() == [r['vehiculos_afectados'] for r in individuales]
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+@pytest.mark.parametrize('distancia_seguridad, num_vehiculos, seed', CASOS)
+def test_detencion_en_equilibrio_no_cambia_el_resultado(motor, distancia_seguridad,
+                                                       num_vehiculos, seed):
+    resultados = []
+    for detener in (False, True):
+        simulacion = Simulacion(num_vehiculos=num_vehiculos, distancia_seguridad=distancia_seguridad,
+                                motor=motor, registro=REGISTRO_NINGUNO)
+        resultado = simulacion.ejecutar_completa(seed=seed, detener_en_equilibrio=detener)
+        resultados.append({clave: resultado[clave] for clave in (
+            'vehiculo_problema_id', 'hubo_colisiones', 'vehiculos_afectados', 'contactos')})
+    assert resultados[0] == resultados[1]
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+@pytest.mark.parametrize('distancia_seguridad, num_vehiculos, seed', CASOS)
+def test_saltar_reposo_es_identico_a_paso_a_paso(motor, distancia_seguridad, num_vehiculos, seed):
+    estados = []
+    for saltar in (False, True):
+        simulacion = Simulacion(num_vehiculos=num_vehiculos, distancia_seguridad=distancia_seguridad,
+                                motor=motor, registro=REGISTRO_NINGUNO)
+        simulacion.ejecutar_completa(seed=seed, saltar_reposo=saltar)
+        estados.append(_estado_final(simulacion))
+    assert estados[0] == estados[1]
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+def test_corrida_restaurada_coincide_con_la_ininterrumpida(motor):
+    def preparar():
+        simulacion = Simulacion(num_vehiculos=20, distancia_seguridad=3.0, motor=motor,
+                                registro=REGISTRO_NINGUNO)
+        simulacion.asignar_conductores(5)
+        simulacion.seleccionar_vehiculo_aleatorio(5)
+        simulacion.iniciar_frenado(5.0)
+        simulacion.avanzar_hasta(6.0)
+        return simulacion
+
+    continua = preparar()
+    esperado = continua.continuar(30.0)
+    for destino in MOTORES:
+        restaurada = Simulacion.desde_estado(preparar().guardar_estado(), motor=destino)
+        assert restaurada.continuar(30.0) == esperado
+        assert _estado_final(restaurada) == _estado_final(continua)
+
+
+@pytest.mark.parametrize('motor', MOTORES)
+def test_prefijo_compartido_coincide_con_la_corrida_completa(motor):
+    opciones = dict(num_runs=20, num_vehiculos=20, distancia_seguridad=3.0, motor=motor,
+                    simetria=SIMETRIA_NINGUNA)
+    completas = MonteCarlo(compartir_prefijo=False, saltar_reposo=False,
+                           detener_en_equilibrio=False, **opciones).run()
+    bifurcadas = MonteCarlo(compartir_prefijo=True, **opciones).run()
+    assert bifurcadas == completas
+
+
+@pytest.mark.parametrize('poblacion', [None, {'tiempo_reaccion': {'distribucion': 'uniforme',
+                                                                   'minimo': 0.3, 'maximo': 0.9}}])
+def test_simetria_exacta_coincide_con_fuerza_bruta(poblacion):
+    verificacion = MonteCarlo(num_runs=40, distancia_seguridad=3.0,
+                              poblacion=poblacion).verificar_simetria()
+    assert verificacion['exacta'], verificacion['diferencias']
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from core.simulacion import Simulacion
+from utils.constantes import MOTOR_OBJETOS, MOTOR_VECTORIZADO, REGISTRO_NINGUNO
+
+
+def _simulacion(motor):
+    simulacion = Simulacion(num_vehiculos=10, distancia_seguridad=3.0, motor=motor,
+                            registro=REGISTRO_NINGUNO)
+    simulacion.asignar_conductores(0)
+    simulacion.seleccionar_vehiculo_aleatorio(0)
+    simulacion.iniciar_frenado(0.0)
+    return simulacion
+
+
+def test_instantanea_vectorizada_no_se_lee_despues_de_un_paso():
+    simulacion = _simulacion(MOTOR_VECTORIZADO)
+    simulacion.avanzar_hasta(1.0)
+    foto = simulacion.instantanea()
+    copia = foto.copiar()
+    x = foto.x
+    simulacion.avanzar_hasta(7.0)
+    for campo in ('id', 'angulo', 'velocidad', 'colisiono', 'x', 'orden', 'posicion'):
+        with pytest.raises(RuntimeError):
+            getattr(foto, campo)
+    with pytest.raises(RuntimeError):
+        foto.copiar()
+    # La copia conserva el estado del instante en que se tomó
+    assert np.array_equal(copia.x, x)
+    assert not np.array_equal(copia.por_id('angulo'), simulacion.instantanea().por_id('angulo'))
+
+
+@pytest.mark.parametrize('motor', [MOTOR_OBJETOS, MOTOR_VECTORIZADO])
+def test_instantanea_coincide_con_obtener_estados(motor):
+    simulacion = _simulacion(motor)
+    simulacion.avanzar_hasta(4.0)
+    foto = simulacion.instantanea()
+    assert foto.estados() == simulacion.redondel.obtener_estados()
+    assert foto.por_id('id').tolist() == list(range(10))
@@ -0,0 +1,17 @@
+import pytest
+
+from core.simulacion import Simulacion
+from utils.constantes import MOTOR_OBJETOS, MOTOR_VECTORIZADO
+
+
+@pytest.mark.parametrize('motor', [MOTOR_OBJETOS, MOTOR_VECTORIZADO])
+@pytest.mark.parametrize('dt', [0.1, 0.2, 0.5])
+def test_adaptativo_coincide_con_paso_fino(motor, dt):
+    for distancia_seguridad, num_vehiculos, seed in [(2.0, 10, 0), (2.0, 10, 1), (2.0, 10, 2),
+                                                     (5.0, 10, 3), (3.0, 20, 4), (5.0, 30, 5)]:
+        simulacion = Simulacion(num_vehiculos=num_vehiculos, distancia_seguridad=distancia_seguridad,
+                                dt=0.1, registro='ninguno', motor=motor)
+        referencia = simulacion.ejecutar_completa(seed=seed)['hubo_colisiones']
+        simulacion = Simulacion(num_vehiculos=num_vehiculos, distancia_seguridad=distancia_seguridad,
+                                dt=dt, registro='ninguno', motor=motor, integrador='adaptativo')
+        assert simulacion.ejecutar_completa(seed=seed)['hubo_colisiones'] == referencia
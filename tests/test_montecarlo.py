@@ -0,0 +1,59 @@
+import pytest
+
+from core.montecarlo import MonteCarlo, resumir_corridas
+
+
+class _Sumidero:
+    def __init__(self):
+        self.filas = []
+
+    def agregar(self, fila, particion=None):
+        self.filas.append(fila)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_el_sumidero_recibe_peso_y_grupo_del_diseno(workers):
+    sumidero = _Sumidero()
+    runs = MonteCarlo(num_runs=10, muestreo='importancia', propuesta=[3] + [1] * 9).run(
+        workers=workers, sumidero=sumidero)
+    por_seed = {fila['seed']: fila for fila in sumidero.filas}
+    assert len(por_seed) == len(runs)
+    for resumen in runs:
+        assert (por_seed[resumen['seed']]['peso'], por_seed[resumen['seed']]['grupo']) == (
+            resumen['peso'], resumen['grupo'])
+
+
+@pytest.mark.parametrize('muestreo', ['estratificado', 'antitetico', 'importancia'])
+def test_lotes_aplican_el_diseno_de_muestreo(muestreo):
+    opciones = dict(num_runs=20, num_vehiculos=10, muestreo=muestreo, propuesta=[3] + [1] * 9)
+    individual = MonteCarlo(**opciones)
+    runs = individual.run()
+    lotes = MonteCarlo(**opciones)
+    columnas = lotes.run_batched(batch_size=7)
+    assert columnas['seed'].tolist() == [r['seed'] for r in runs]
+    assert columnas['peso'].tolist() == [r['peso'] for r in runs]
+    assert columnas['grupo'].tolist() == [r['grupo'] for r in runs]
+    assert lotes.summary_statistics() == individual.summary_statistics()
+
+
+@pytest.mark.parametrize('muestreo', ['estratificado', 'antitetico', 'importancia'])
+def test_adaptativo_rechaza_muestreo_con_diseno(muestreo):
+    with pytest.raises(ValueError):
+        MonteCarlo(num_runs=20, muestreo=muestreo, propuesta=[1] * 10).run_adaptive(
+            guardar_corridas=True)
+
+
+def test_resumen_sin_columnas_de_diseno_usa_el_resumen_simple():
+    runs = MonteCarlo(num_runs=10).run()
+    mc = MonteCarlo(num_runs=10, muestreo='estratificado')
+    mc._runs = runs
+    assert mc.summary_statistics() == resumir_corridas(runs)
+
+
+def test_adaptativo_no_depende_de_workers():
+    opciones = dict(tolerancia=0.15, min_runs=10, max_runs=200, guardar_corridas=True)
+    serie = MonteCarlo(distancia_seguridad=3.0)
+    resultado = serie.run_adaptive(**opciones)
+    paralelo = MonteCarlo(distancia_seguridad=3.0)
+    assert paralelo.run_adaptive(workers=2, **opciones) == resultado
+    assert paralelo._runs == serie._runs
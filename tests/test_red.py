@@ -0,0 +1,32 @@
+from models.red import Red, FragmentoRed
+from core.simulacion_red import SimulacionRed
+
+
+def test_corredor_sin_perturbacion_no_tiene_colisiones():
+    for flujo_transversal in (0.0, 0.2):
+        red = Red.corredor(4, flujo=0.3, fraccion_salida=0.3, flujo_transversal=flujo_transversal)
+        resultados = SimulacionRed(red, procesos=1).ejecutar(
+            duracion=60, seed=7, tiempo_inicio_frenado=None)
+        assert resultados['vehiculos_colisionados'] == 0
+        assert resultados['vehiculos_salidos'] > 0
+
+
+def test_instantanea_de_un_redondel_de_la_red():
+    fragmento = FragmentoRed(Red.corredor(3, flujo=0.0), [0, 1, 2], 5.0, 0.1)
+    redondel = fragmento.redondeles[1]
+    instantanea = redondel.instantanea()
+    ids = sorted(v.id for v in redondel.vehiculos)
+    assert instantanea.por_id('id').tolist() == ids
+    velocidades = {v.id: v.velocidad for v in redondel.vehiculos}
+    assert instantanea.por_id('velocidad').tolist() == [velocidades[i] for i in ids]
+
+
+def test_resultados_iguales_con_cualquier_numero_de_procesos():
+    red = Red.corredor(6, flujo=0.4, fraccion_salida=0.2, flujo_transversal=0.1)
+    resultados = []
+    for procesos in (1, 2, 3):
+        resultado = SimulacionRed(red, procesos=procesos).ejecutar(
+            duracion=40, redondel_problema=2, tiempo_inicio_frenado=10, seed=5)
+        assert resultado.pop('procesos') == procesos
+        resultados.append(resultado)
+    assert resultados[0] == resultados[1] == resultados[2]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from core.servidor import (
+    CUADRO_CLAVE, CUADRO_DELTA, ENCABEZADO, MAXIMO_VEHICULOS_CLIENTE, Codificador, Cuadro,
+    ServidorSimulacion, capturar, decodificar
+)
+
+
+def _servidor():
+    return ServidorSimulacion({'num_vehiculos': 10}, seed=0, tiempo_inicio_frenado=0.5)
+
+
+def test_decodificar_reconstruye_cuadros_clave_y_delta():
+    servidor = _servidor()
+    codificador = Codificador()
+    anterior = None
+    tipos = set()
+    for _ in range(40):
+        servidor.avanzar()
+        cuadro = servidor.cuadro
+        datos = codificador.codificar(cuadro)
+        tipos.add(ENCABEZADO.unpack_from(datos)[0])
+        anterior = decodificar(datos, anterior)
+        assert (anterior.paso, anterior.tiempo) == (cuadro.paso, cuadro.tiempo)
+        for campo in ('angulo', 'velocidad', 'estado'):
+            assert np.array_equal(getattr(anterior, campo), getattr(cuadro, campo)), campo
+    assert tipos == {CUADRO_CLAVE, CUADRO_DELTA}
+
+
+def test_decodificar_rechaza_delta_sin_base_y_version_desconocida():
+    cuadro = capturar(_servidor().simulacion)
+    codificador = Codificador()
+    codificador.codificar(cuadro)
+    delta = codificador.codificar(cuadro)
+    with pytest.raises(ValueError):
+        decodificar(delta)
+    clave = bytearray(Codificador().codificar(cuadro))
+    clave[1] = 99
+    with pytest.raises(ValueError):
+        decodificar(bytes(clave))
+    assert len(decodificar(delta, Cuadro(0, 0.0, cuadro.angulo, cuadro.velocidad,
+                                         cuadro.estado))) == len(cuadro)
+
+
+@pytest.mark.parametrize('parametros', [
+    {'duracion': 0},
+    {'tiempo_inicio_frenado': 'x'},
+    {'tiempo_inicio_frenado': -1},
+    {'seed': 1.5},
+    {'num_vehiculos': 0},
+    {'num_vehiculos': MAXIMO_VEHICULOS_CLIENTE + 1},
+    {'num_vehiculos': True},
+    {'radio': float('nan')},
+    {'distancia_seguridad': None},
+    {'velocidad': 3},
+    ['duracion'],
+])
+def test_reiniciar_rechaza_parametros_invalidos(parametros):
+    servidor = _servidor()
+    simulacion = servidor.simulacion
+    estado = (dict(servidor.parametros), servidor.seed, servidor.tiempo_inicio_frenado,
+              servidor.duracion)
+    error = servidor.ejecutar_comando({'accion': 'reiniciar', 'parametros': parametros})
+    assert error['evento'] == 'error'
+    assert servidor.simulacion is simulacion
+    assert (dict(servidor.parametros), servidor.seed, servidor.tiempo_inicio_frenado,
+            servidor.duracion) == estado
+    servidor.avanzar()
+
+
+def test_reiniciar_convierte_parametros_numericos():
+    servidor = _servidor()
+    assert servidor.ejecutar_comando({'accion': 'reiniciar', 'parametros': {
+        'num_vehiculos': 12.0, 'seed': 3, 'duracion': '1', 'tiempo_inicio_frenado': None}}) is None
+    assert servidor.simulacion.redondel.num_vehiculos == 12
+    assert (servidor.seed, servidor.duracion, servidor.tiempo_inicio_frenado) == (3, 1.0, None)
+    while not servidor.terminado:
+        servidor.avanzar()
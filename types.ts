@@ -16,3 +16,26 @@ export interface SimulationConfig {
   brakingPower: number;
   safeDistance: number; // In radians
 }
+
+// Frame streamed by the Python server (core/servidor.py), arrays indexed by vehicle ID
+export interface StreamFrame {
+  step: number;
+  time: number;          // Simulated seconds
+  angles: Float32Array;  // Radians
+  speeds: Float32Array;  // m/s
+  flags: Uint8Array;     // FLAG_* bits
+}
+
+// `configuracion` event sent by the server on connect and after each restart
+export interface StreamConfig {
+  num_vehiculos: number;
+  radio: number;
+  distancia_seguridad: number;
+  dt: number;
+  integrador: string;
+  velocidad_normal: number;
+  longitud_vehiculo: number;
+  fps: number;
+  escala_tiempo: number;
+  duracion: number | null;
+}
@@ -14,6 +14,31 @@ ACELERACION_NORMAL = 2.0  # m/s² (aceleración al retomar velocidad)
 # Constantes de tiempo
 DT = 0.1  # segundos (intervalo de actualización de la simulación)
 TIEMPO_REACCION = 0.5  # segundos (tiempo de reacción del conductor)
+PASO_MAXIMO = 1.0  # segundos (paso más largo del integrador adaptativo)
+PASO_REGLAS = 0.1  # segundos (paso más largo del integrador adaptativo con las reglas de reacción)
 
 # Dimensiones del vehículo
-LONGITUD_VEHICULO = 4.5  # metros
\ No newline at end of file
+LONGITUD_VEHICULO = 4.5  # metros
+
+# Red de redondeles (models/red.py)
+LONGITUD_ENLACE = 100.0  # metros (tramo recto entre dos redondeles)
+FLUJO_ENTRADA = 0.3  # vehículos/s que llegan por cada fuente
+
+# Motores de simulación disponibles
+MOTOR_OBJETOS = "objetos"  # un objeto Vehiculo por vehículo (referencia)
+MOTOR_VECTORIZADO = "vectorizado"  # estado en arreglos NumPy
+
+# Integradores de `Simulacion`
+INTEGRADOR_FIJO = "fijo"  # pasos de DT con las reglas de reacción (referencia)
+INTEGRADOR_ADAPTATIVO = "adaptativo"  # pasos largos en tramos sin eventos, DT cerca de ellos
+
+# Modos de registro del historial en `Simulacion`
+REGISTRO_COMPLETO = "completo"  # estado de todos los vehículos en cada paso
+REGISTRO_NINGUNO = "ninguno"  # sin historial
+REGISTRO_RESUMEN = "resumen"  # solo métricas agregadas por paso
+REGISTRO_INTERVALO = "intervalo"  # estado completo cada `intervalo_registro` pasos
+REGISTRO_FRENADO = "frenado"  # estado completo solo mientras dura la perturbación
+REGISTRO_COLUMNAR = "columnar"  # arreglos tiempo x vehículo por atributo
+
+# Versión del modelo: incrementarla invalida los resultados guardados en caché
+VERSION_MODELO = 1